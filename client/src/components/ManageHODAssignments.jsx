@@ -1,5 +1,5 @@
 import { useEffect, useState } from "react";
-import api from "../services/api";
+import api, { getAllPages } from "../services/api";
 
 export default function ManageHODAssignments({ onClose }) {
   const [college, setCollege] = useState("");
@@ -13,8 +13,7 @@ export default function ManageHODAssignments({ onClose }) {
   const fetchFaculty = async (selectedCollege) => {
     try {
       setLoading(true);
-      const res = await api.get(`/faculty/college/${selectedCollege}`);
-      setFaculty(res.data?.data || []);
+      setFaculty(await getAllPages(`/faculty/college/${selectedCollege}`));
     } catch (e) {
       alert("Failed to load faculty");
     } finally {
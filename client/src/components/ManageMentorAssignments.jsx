@@ -1,5 +1,5 @@
 import { useEffect, useState } from "react";
-import api from "../services/api";
+import api, { getAllPages } from "../services/api";
 
 export default function ManageMentorAssignments({ onClose }) {
 
@@ -61,8 +61,7 @@ export default function ManageMentorAssignments({ onClose }) {
 
       /* -------- FETCH FACULTY -------- */
 
-      const facultyRes = await api.get(`/faculty/college/${hod.college}`);
-      const facultyList = facultyRes.data?.data || [];
+      const facultyList = await getAllPages(`/faculty/college/${hod.college}`);
 
       setMentors(facultyList);
 
@@ -35,4 +35,21 @@ api.interceptors.response.use(
   }
 );
 
+/**
+ * GET every page of a list endpoint, following X-Next-Cursor
+ */
+export const getAllPages = async (url, config = {}) => {
+  const rows = [];
+  let after;
+  do {
+    const res = await api.get(url, {
+      ...config,
+      params: { ...config.params, after },
+    });
+    rows.push(...(res.data?.data || []));
+    after = res.headers["x-next-cursor"];
+  } while (after);
+  return rows;
+};
+
 export default api;
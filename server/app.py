@@ -19,6 +19,9 @@ from extensions.cors import init_cors
 from services.bootstrap_service import init_bootstrap
 from core.global_response import error
 from core.global_exception_handler import init_exception_handlers
+from core.profiling import ProfilingMiddleware, install_threadpool_profiling
+from core.query_budget import QueryBudgetMiddleware
+from config import Config
 
 # Routers
 from routes.auth_routes import router as auth_router
@@ -30,6 +33,9 @@ from routes.guard_routes import router as guard_router
 from routes.request_routes import router as request_router
 from routes.mentor_mapping_routes import router as mentor_mapping_router
 from routes.faculty_routes import router as faculty_router
+from routes.health_routes import router as health_router
+from routes.profile_routes import router as profile_router
+from routes.job_routes import router as job_router
 
 app = FastAPI(title="FaceAuth System", version="2.0")
 instrumentator = Instrumentator().instrument(app)
@@ -84,6 +90,11 @@ class HTTPSRedirectMiddleware(BaseHTTPMiddleware):
 if os.environ.get("ENV", "development") == "production":
     app.add_middleware(HTTPSRedirectMiddleware)
 app.add_middleware(SecurityHeadersMiddleware)
+if Config.QUERY_BUDGET_MODE != "off":
+    app.add_middleware(QueryBudgetMiddleware)
+# Inside RequestIDMiddleware so profiles record the X-Request-ID
+app.add_middleware(ProfilingMiddleware)
+install_threadpool_profiling()
 app.add_middleware(RequestIDMiddleware)
 
 
@@ -109,6 +120,9 @@ app.include_router(guard_router)
 app.include_router(request_router)
 app.include_router(mentor_mapping_router)
 app.include_router(faculty_router)
+app.include_router(health_router)
+app.include_router(profile_router)
+app.include_router(job_router)
 app.include_router(admin_router, prefix="/super_admin") # Handles /super_admin/...
 
 
@@ -120,6 +134,27 @@ app.include_router(admin_router, prefix="/super_admin") # Handles /super_admin/.
 async def on_start():
     init_bootstrap()
 
+    from data.scope_map_repo import ensure_scope_map
+    try:
+        ensure_scope_map()
+    except Exception as e:
+        # Built lazily on the first student write instead
+        print(f"[SCOPE MAP] initial build failed: {e}")
+
+    # Load the face model off the event loop; the API is serving meanwhile
+    from config import Config
+    from services.face_model import model_manager
+    if Config.FACE_MODEL_WARMUP_ON_STARTUP:
+        model_manager.start_warmup()
+
+    from services.notification_service import notification_workers
+    notification_workers.start()
+
+    # Pick up background jobs left unfinished by a previous run, and keep
+    # sweeping for ones abandoned by a worker that dies later
+    from services.background_jobs import job_runner
+    job_runner.start()
+
     # Detect machine IP (LAN)
     hostname = socket.gethostname()
     local_ip = socket.gethostbyname(hostname)
@@ -142,6 +177,20 @@ async def on_start():
 
 
 
+@app.on_event("shutdown")
+async def on_shutdown():
+    from extensions.mongo import async_client
+    from utils.audit_log import logger as audit_logger
+    from services.notification_service import notification_workers
+    from services.sms_providers import close_providers
+    from services.background_jobs import job_runner
+    notification_workers.stop()
+    job_runner.stop()
+    close_providers()
+    audit_logger.close()
+    await async_client.close()
+
+
 # Health check endpoint
 # Health check endpoint
 
@@ -154,7 +203,8 @@ async def get_api_key(api_key: str = Security(api_key_header)):
 # Health check endpoint
 @app.get("/health")
 def health():
-    return {"status": "ok"}
+    from services.face_model import model_manager
+    return {"status": "ok", "face_model": model_manager.status()}
 
 
 @app.get("/")
@@ -0,0 +1,11 @@
+"""
+Offline benchmark suite for the face and request hot paths.
+
+    python -m benchmarks.run --backend mongomock --out bench/HEAD.json
+    python -m benchmarks.run --backend mongod --mongo-uri mongodb://localhost:27017
+    python -m benchmarks.compare bench/BASE.json bench/HEAD.json
+
+Everything runs against synthetic data (random unit embeddings, generated
+JPEGs, seeded students / mappings / requests); the InsightFace model is only
+used when --face-image is given and the model loads.
+"""
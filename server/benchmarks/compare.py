@@ -0,0 +1,62 @@
+"""
+Compare two result files from `benchmarks.run --out`:
+
+    python -m benchmarks.compare BASE.json HEAD.json [--metric p95_ms] [--threshold 0.2]
+
+Exits non-zero when any benchmark regressed by more than `threshold`.
+"""
+import argparse
+import json
+import sys
+
+from benchmarks.harness import result_key
+
+
+def load(path):
+    with open(path) as f:
+        data = json.load(f)
+    return data.get("meta", {}), {result_key(r): r for r in data["results"]}
+
+
+def compare(base, head, metric="p95_ms", threshold=0.2):
+    rows, regressions = [], []
+    for key in sorted(set(base) | set(head)):
+        old = base.get(key, {}).get(metric)
+        new = head.get(key, {}).get(metric)
+        if old is None or new is None:
+            rows.append((key, old, new, None))
+            continue
+        delta = (new - old) / old if old else 0.0
+        rows.append((key, old, new, delta))
+        if delta > threshold:
+            regressions.append(key)
+    return rows, regressions
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Compare two benchmark result files")
+    parser.add_argument("base")
+    parser.add_argument("head")
+    parser.add_argument("--metric", default="p95_ms")
+    parser.add_argument("--threshold", type=float, default=0.2, help="allowed relative slowdown")
+    args = parser.parse_args(argv)
+
+    base_meta, base = load(args.base)
+    head_meta, head = load(args.head)
+    rows, regressions = compare(base, head, args.metric, args.threshold)
+
+    print(f"{args.metric}: {base_meta.get('commit')} -> {head_meta.get('commit')}")
+    for key, old, new, delta in rows:
+        old_s = f"{old:.3f}" if old is not None else "-"
+        new_s = f"{new:.3f}" if new is not None else "-"
+        delta_s = f"{delta:+.1%}" if delta is not None else "n/a"
+        flag = "  REGRESSION" if key in regressions else ""
+        print(f"{key:<70} {old_s:>10} {new_s:>10} {delta_s:>8}{flag}")
+
+    if regressions:
+        print(f"\n{len(regressions)} regression(s) above {args.threshold:.0%}")
+        sys.exit(1)
+
+
+if __name__ == "__main__":
+    main()
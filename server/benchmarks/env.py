@@ -0,0 +1,49 @@
+"""
+Wire the app's data layer to a benchmark database.
+
+Must run before any `data.*` / `services.*` import: repositories bind their
+collections (`db["faces"]` etc.) at import time from `extensions.mongo.db`.
+"""
+import os
+import sys
+
+SERVER_DIR = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+BENCH_DB_NAME = "faceAuthDB_bench"
+
+
+def configure(backend="mongomock", mongo_uri=None, db_name=BENCH_DB_NAME):
+    if SERVER_DIR not in sys.path:
+        sys.path.insert(0, SERVER_DIR)
+
+    # Throwaway secrets; benchmark data is synthetic
+    if not os.environ.get("FACE_ENCRYPTION_KEY"):
+        from cryptography.fernet import Fernet
+        os.environ["FACE_ENCRYPTION_KEY"] = Fernet.generate_key().decode()
+    os.environ.setdefault("JWT_SECRET", "bench")
+    # Keep audit events out of the working directory
+    os.environ["AUDIT_LOG_SINKS"] = ""
+    os.environ["SMS_ENABLED"] = "false"
+    if mongo_uri:
+        os.environ["MONGO_URI"] = mongo_uri
+
+    import extensions.mongo as mongo
+
+    if backend == "mongomock":
+        try:
+            import mongomock
+        except ImportError:
+            raise SystemExit("mongomock is not installed: pip install mongomock (or use --backend mongod)")
+        mongo.client = mongomock.MongoClient()
+    elif backend != "mongod":
+        raise SystemExit(f"unknown backend {backend!r}")
+
+    mongo.client.drop_database(db_name)
+    mongo.db = mongo.client[db_name]
+    return mongo.db
+
+
+def create_indexes(backend):
+    # mongomock accepts but ignores most index options; only matters on mongod
+    if backend == "mongod":
+        from utils.create_indexes import create_all_indexes
+        create_all_indexes()
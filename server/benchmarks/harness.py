@@ -0,0 +1,93 @@
+import contextlib
+import io
+import json
+import os
+import platform
+import subprocess
+import time
+from datetime import datetime
+
+import numpy as np
+
+
+def measure(name, fn, iterations=100, warmup=5, params=None, quiet=True):
+    """
+    Call `fn()` `warmup` times untimed, then `iterations` times timed.
+    Returns a result dict with latency percentiles (ms) and throughput.
+    The service layer prints a lot; `quiet` swallows stdout while timing.
+    """
+    from utils.db_monitor import start_request_stats, stop_request_stats
+
+    sink = io.StringIO() if quiet else None
+    with contextlib.redirect_stdout(sink) if quiet else contextlib.nullcontext():
+        for _ in range(warmup):
+            fn()
+        samples = np.empty(iterations, np.float64)
+        # Same per-request command accounting the API uses (counts need a
+        # real mongod; mongomock doesn't emit command events)
+        db_stats, token = start_request_stats()
+        started = time.perf_counter()
+        try:
+            for i in range(iterations):
+                t0 = time.perf_counter()
+                fn()
+                samples[i] = time.perf_counter() - t0
+        finally:
+            wall = time.perf_counter() - started
+            stop_request_stats(token)
+
+    ms = samples * 1000
+    result = {
+        "name": name,
+        "params": params or {},
+        "iterations": iterations,
+        "mean_ms": round(float(ms.mean()), 4),
+        "p50_ms": round(float(np.percentile(ms, 50)), 4),
+        "p95_ms": round(float(np.percentile(ms, 95)), 4),
+        "p99_ms": round(float(np.percentile(ms, 99)), 4),
+        "max_ms": round(float(ms.max()), 4),
+        "throughput_per_s": round(iterations / wall, 2) if wall > 0 else None,
+        "db_commands": round(db_stats.count / iterations, 2),
+        "db_ms": round(db_stats.total_ms / iterations, 4)
+    }
+    print(
+        f"{name:<48} p50={result['p50_ms']:>9.3f}ms  p95={result['p95_ms']:>9.3f}ms  "
+        f"p99={result['p99_ms']:>9.3f}ms  {result['throughput_per_s']:>9}/s"
+    )
+    return result
+
+
+def _git_commit():
+    try:
+        return subprocess.check_output(
+            ["git", "rev-parse", "--short", "HEAD"], stderr=subprocess.DEVNULL, text=True,
+            cwd=os.path.dirname(os.path.abspath(__file__))
+        ).strip()
+    except Exception:
+        return None
+
+
+def save_results(path, results, meta):
+    payload = {
+        "meta": {
+            "commit": _git_commit(),
+            "created_at": datetime.utcnow().isoformat(),
+            "python": platform.python_version(),
+            "machine": platform.machine(),
+            "cpu_count": os.cpu_count(),
+            **meta
+        },
+        "results": results
+    }
+    directory = os.path.dirname(path)
+    if directory:
+        os.makedirs(directory, exist_ok=True)
+    with open(path, "w") as f:
+        json.dump(payload, f, indent=2)
+    print(f"\nSaved {len(results)} results to {path}")
+    return payload
+
+
+def result_key(result):
+    params = ",".join(f"{k}={v}" for k, v in sorted(result.get("params", {}).items()))
+    return f"{result['name']}[{params}]" if params else result["name"]
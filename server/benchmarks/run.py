@@ -0,0 +1,58 @@
+import argparse
+
+from benchmarks import env
+
+
+def parse_args(argv=None):
+    parser = argparse.ArgumentParser(description="FaceAuth benchmark suite")
+    parser.add_argument("--backend", choices=["mongomock", "mongod"], default="mongomock")
+    parser.add_argument("--mongo-uri", help="MongoDB URI for --backend mongod (defaults to MONGO_URI)")
+    parser.add_argument("--suites", default="decode,verify,duplicate,listing,filter",
+                        help="comma-separated subset of: decode,verify,duplicate,listing,filter")
+    parser.add_argument("--iterations", type=int, default=50)
+    parser.add_argument("--sizes", default="1000,10000,100000",
+                        help="enrolled-vector counts for the duplicate search suite")
+    parser.add_argument("--vector-search", action="store_true",
+                        help="also run Atlas $vectorSearch alongside the local exact search "
+                             "(requires an Atlas cluster with face_vector_index)")
+    parser.add_argument("--students", type=int, default=3000)
+    parser.add_argument("--requests", type=int, default=20000)
+    parser.add_argument("--with-faces", action="store_true",
+                        help="enroll a face per student so listings pay image decrypt + base64")
+    parser.add_argument("--face-image", help="JPEG with one real face; enables the full verify_face_for_user run")
+    parser.add_argument("--out", help="write results JSON here")
+    args = parser.parse_args(argv)
+    args.suites = [s.strip() for s in args.suites.split(",") if s.strip()]
+    args.sizes = [int(s) for s in args.sizes.split(",") if s.strip()]
+    return args
+
+
+def main(argv=None):
+    args = parse_args(argv)
+    env.configure(args.backend, args.mongo_uri)
+    env.create_indexes(args.backend)
+
+    # Only import app code once the data layer points at the bench database
+    from benchmarks.harness import save_results
+    from benchmarks.suites import SUITES
+
+    unknown = [s for s in args.suites if s not in SUITES]
+    if unknown:
+        raise SystemExit(f"unknown suites: {', '.join(unknown)}")
+
+    results = []
+    for name in args.suites:
+        print(f"\n== {name} ==")
+        results.extend(SUITES[name](args))
+
+    if args.out:
+        save_results(args.out, results, {
+            "backend": args.backend,
+            "suites": args.suites,
+            "iterations": args.iterations
+        })
+    return results
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,227 @@
+"""
+Benchmark suites. Each takes the parsed CLI args and returns a list of
+result dicts from `harness.measure`.
+"""
+import numpy as np
+
+from benchmarks import synthetic
+from benchmarks.harness import measure
+
+
+# ===============================================================
+# DECODE
+# ===============================================================
+def bench_decode(args):
+    from services.face_service import decode_image, decode_image_bytes
+    import base64
+
+    results = []
+    for width, height in ((640, 480), (1280, 960), (4000, 3000)):
+        jpeg = synthetic.synthetic_face_jpeg(width, height)
+        params = {"resolution": f"{width}x{height}", "kb": len(jpeg) // 1024}
+        results.append(measure(
+            "decode_image_bytes", lambda: decode_image_bytes(jpeg),
+            iterations=args.iterations, params=params
+        ))
+        b64 = base64.b64encode(jpeg).decode()
+        results.append(measure(
+            "decode_image", lambda: decode_image(b64),
+            iterations=args.iterations, params=params
+        ))
+    return results
+
+
+# ===============================================================
+# VERIFY
+# ===============================================================
+def _enroll(user_id, emb, jpeg):
+    from data.face_vectors_repo import create_vector
+    from data.faces_repo import create_face_doc
+
+    vector_id = f"vec_{user_id}"
+    create_vector(vector_id, user_id, emb.tolist())
+    create_face_doc(user_id, "STUDENT", jpeg, vector_id)
+
+
+def bench_verify(args):
+    from services import face_service
+
+    user_id = "BV000001"
+    jpeg = synthetic.synthetic_face_jpeg(640, 640)
+    emb = synthetic.random_embeddings(1, seed=7)[0]
+    _enroll(user_id, emb, jpeg)
+    lm = np.zeros((68, 3), np.float32)
+
+    def stored_match():
+        face = face_service._get_reference_face(user_id)
+        return face_service._match_against_stored(user_id, face, emb, lm)
+
+    # Everything verify does except inference: face read + image decrypt,
+    # vector read + embedding decrypt, scoring
+    results = [measure(
+        "verify_face_for_user.no_inference", stored_match,
+        iterations=args.iterations, params={"image_kb": len(jpeg) // 1024}
+    )]
+
+    if args.face_image:
+        with open(args.face_image, "rb") as f:
+            probe = f.read()
+        try:
+            face_service.model_manager.get_model(timeout=300)
+        except Exception as e:
+            print(f"verify_face_for_user: model unavailable, skipping full run ({e})")
+            return results
+        real_emb, _ = face_service.extract_embedding_and_landmarks(
+            face_service.decode_image_bytes(probe)[0]
+        )
+        _enroll("BV000002", real_emb, probe)
+        results.append(measure(
+            "verify_face_for_user", lambda: face_service.verify_face_for_user("BV000002", image_bytes=probe),
+            iterations=max(10, args.iterations // 5), warmup=2, params={"probe_kb": len(probe) // 1024}
+        ))
+    return results
+
+
+# ===============================================================
+# DUPLICATE SEARCH
+# ===============================================================
+def _local_vector_index(matrix, user_ids):
+    """
+    Exact cosine top-k over an in-memory matrix, with the result shape of
+    face_vectors_repo.search_similar_faces. Stands in for Atlas
+    $vectorSearch when the benchmark database isn't an Atlas cluster, so the
+    suite still times the app's ensure_not_duplicate path.
+    """
+    norms = np.linalg.norm(matrix, axis=1)
+
+    def search_similar_faces(query_vector, limit=5):
+        query = np.asarray(query_vector, np.float32)
+        scores = (matrix @ query) / (norms * np.linalg.norm(query))
+        top = np.argpartition(scores, -limit)[-limit:]
+        top = top[np.argsort(scores[top])[::-1]]
+        return [{"_id": f"vec_{user_ids[i]}", "user_id": user_ids[i], "score": float(scores[i])} for i in top]
+
+    return search_similar_faces
+
+
+def bench_duplicate(args):
+    from data.face_vectors_repo import face_vectors
+    from services import face_service
+    from utils.encryption import encrypt_embedding
+    from datetime import datetime, timedelta
+
+    results = []
+    query = synthetic.random_embeddings(1, seed=99)[0]
+    for n in args.sizes:
+        matrix = synthetic.random_embeddings(n, seed=n)
+        user_ids = [f"B{i}" for i in range(n)]
+
+        if args.vector_search:
+            face_vectors.delete_many({})
+            batch = [
+                {"_id": f"vec_{user_ids[i]}", "user_id": user_ids[i], "embedding": matrix[i].tolist(),
+                 "embedding_encrypted": encrypt_embedding(matrix[i].tolist()), "created_at": datetime.utcnow()}
+                for i in range(n)
+            ]
+            for i in range(0, n, 5000):
+                face_vectors.insert_many(batch[i:i + 5000])
+            results.append(measure(
+                "duplicate_search.vector_search",
+                lambda: face_service.ensure_not_duplicate(query.tolist()),
+                iterations=args.iterations, params={"enrolled": n}
+            ))
+
+        # Same ensure_not_duplicate call, with the search served locally
+        atlas_search = face_service.search_similar_faces
+        face_service.search_similar_faces = _local_vector_index(matrix, user_ids)
+        try:
+            results.append(measure(
+                "duplicate_search.local_exact",
+                lambda: face_service.ensure_not_duplicate(query.tolist()),
+                iterations=args.iterations, params={"enrolled": n}
+            ))
+        finally:
+            face_service.search_similar_faces = atlas_search
+
+    # Token re-check: only vectors enrolled since the token was issued
+    face_vectors.delete_many({})
+    since = datetime.utcnow() - timedelta(minutes=5)
+    recent = synthetic.random_embeddings(50, seed=5)
+    face_vectors.insert_many([
+        {"_id": f"vec_R{i}", "user_id": f"R{i}", "embedding_encrypted": encrypt_embedding(recent[i].tolist()),
+         "created_at": datetime.utcnow()}
+        for i in range(len(recent))
+    ])
+    results.append(measure(
+        "ensure_not_duplicate_since", lambda: face_service.ensure_not_duplicate_since(query, since),
+        iterations=args.iterations, params={"recent": len(recent)}
+    ))
+    return results
+
+
+# ===============================================================
+# REQUEST WORKFLOWS
+# ===============================================================
+def _seed_cohort(args):
+    from extensions.mongo import db
+
+    students, hod_maps, mentor_maps, hod_ids, mentor_ids = synthetic.build_cohort(args.students)
+    db["students"].insert_many(students)
+    db["student_hod"].insert_many(hod_maps)
+    db["student_mentor_mapping"].insert_many(mentor_maps)
+    db["requests"].insert_many(synthetic.build_requests(students, args.requests))
+
+    if args.with_faces:
+        from data.faces_repo import create_face_doc
+        jpeg = synthetic.synthetic_face_jpeg(640, 640)
+        for st in students:
+            create_face_doc(st["_id"], "STUDENT", jpeg, f"vec_{st['_id']}")
+    return hod_ids, mentor_ids
+
+
+def bench_listing(args):
+    from services import request_service
+
+    hod_ids, mentor_ids = _seed_cohort(args)
+    params = {"students": args.students, "requests": args.requests, "faces": args.with_faces}
+    iterations = max(5, args.iterations // 5)
+    return [
+        measure(
+            "service_get_mentor_pending_requests",
+            lambda: request_service.service_get_mentor_pending_requests(mentor_ids[0]),
+            iterations=iterations, warmup=1, params=params
+        ),
+        measure(
+            "service_get_hod_pending_requests",
+            lambda: request_service.service_get_hod_pending_requests(hod_ids[0]),
+            iterations=iterations, warmup=1, params=params
+        ),
+    ]
+
+
+def bench_filter(args):
+    from extensions.mongo import db
+    from services import request_service
+
+    if db["requests"].estimated_document_count() == 0:
+        _seed_cohort(args)
+
+    results = []
+    for page in (1, 10, 100, 500):
+        filters = {"page": page, "pageSize": 20, "statuses": ["approved", "left"]}
+        results.append(measure(
+            "service_filter_requests",
+            lambda: request_service.service_filter_requests(filters, "bench", "SUPER_ADMIN"),
+            iterations=max(5, args.iterations // 5), warmup=1,
+            params={"page": page, "requests": args.requests}
+        ))
+    return results
+
+
+SUITES = {
+    "decode": bench_decode,
+    "verify": bench_verify,
+    "duplicate": bench_duplicate,
+    "listing": bench_listing,
+    "filter": bench_filter,
+}
@@ -0,0 +1,122 @@
+"""
+Synthetic data generators. Deterministic for a given seed so runs on
+different commits see the same data.
+"""
+from datetime import datetime, timedelta
+
+import numpy as np
+
+EMBEDDING_DIM = 512
+
+COLLEGE = "BENCH"
+COURSES = ["CSE", "ECE", "MECH", "CIVIL"]
+SECTIONS = ["A", "B", "C"]
+YEARS = [1, 2, 3, 4]
+
+
+def random_embeddings(n, dim=EMBEDDING_DIM, seed=0):
+    """Unit-norm float32 vectors, like ArcFace output after normalisation."""
+    rng = np.random.default_rng(seed)
+    vecs = rng.standard_normal((n, dim)).astype(np.float32)
+    vecs /= np.linalg.norm(vecs, axis=1, keepdims=True)
+    return vecs
+
+
+def synthetic_face_jpeg(width=1280, height=960, seed=0, quality=90):
+    """
+    A mid-brightness gradient + noise JPEG: big enough and bright enough to
+    pass decode_image's size/brightness gates, with realistic entropy so the
+    encoded size resembles a phone photo.
+    """
+    import cv2
+
+    rng = np.random.default_rng(seed)
+    x = np.linspace(60, 190, width, dtype=np.float32)
+    y = np.linspace(-30, 30, height, dtype=np.float32)[:, None]
+    base = x[None, :] + y
+    img = np.stack([base, base * 0.95, base * 1.05], axis=-1)
+    img += rng.normal(0, 12, img.shape).astype(np.float32)
+    img = np.clip(img, 0, 255).astype(np.uint8)
+    ok, buf = cv2.imencode(".jpg", img, [cv2.IMWRITE_JPEG_QUALITY, quality])
+    if not ok:
+        raise RuntimeError("failed to encode synthetic image")
+    return buf.tobytes()
+
+
+def student_id(i):
+    return f"BS{i:06d}"
+
+
+def build_cohort(n_students, mentors_per_section=1):
+    """
+    Students spread over YEARS x COURSES x SECTIONS, one HOD per
+    (year, course) and `mentors_per_section` mentors per section.
+    Returns (students, hod_mappings, mentor_mappings, hod_ids, mentor_ids).
+    """
+    scopes = [(y, c, s) for y in YEARS for c in COURSES for s in SECTIONS]
+    students, hod_maps, mentor_maps = [], [], []
+    hod_ids, mentor_ids = set(), set()
+    now = datetime.utcnow()
+    for i in range(n_students):
+        year, course, section = scopes[i % len(scopes)]
+        sid = student_id(i)
+        hod_id = f"BH_{year}_{course}"
+        hod_ids.add(hod_id)
+        students.append({
+            "_id": sid,
+            "name": f"Student {i}",
+            "phone": f"9{i:09d}",
+            "college": COLLEGE,
+            "year": year,
+            "course": course,
+            "section": section,
+            "father_mobile": f"8{i:09d}",
+            "mother_mobile": f"7{i:09d}",
+            "created_at": now
+        })
+        hod_maps.append({
+            "student_id": sid, "hod_id": hod_id,
+            "year": year, "course": course, "college": COLLEGE
+        })
+        for m in range(mentors_per_section):
+            mentor_id = f"BM_{year}_{course}_{section}_{m}"
+            mentor_ids.add(mentor_id)
+            mentor_maps.append({
+                "student_id": sid, "mentor_id": mentor_id, "college": COLLEGE,
+                "year": year, "course": course, "section": section, "created_at": now
+            })
+    return students, hod_maps, mentor_maps, sorted(hod_ids), sorted(mentor_ids)
+
+
+def build_requests(students, n_requests, pending_fraction=0.05, seed=0):
+    """
+    Historical requests spread over the past 60 days (mostly closed) plus a
+    slice created today and still pending, which is what dashboards poll for.
+    """
+    rng = np.random.default_rng(seed)
+    closed = ["APPROVED", "LEFT_CAMPUS", "REJECTED", "REJECTED_BY_MENTOR", "APPROVED_NOT_LEFT"]
+    pending = ["PENDING_MENTOR", "PENDING_HOD"]
+    now = datetime.utcnow()
+    docs = []
+    for i in range(n_requests):
+        st = students[int(rng.integers(len(students)))]
+        is_pending = rng.random() < pending_fraction
+        when = now - timedelta(minutes=int(rng.integers(1, 120))) if is_pending \
+            else now - timedelta(days=int(rng.integers(1, 60)), minutes=int(rng.integers(0, 1440)))
+        status = pending[int(rng.integers(len(pending)))] if is_pending else closed[int(rng.integers(len(closed)))]
+        docs.append({
+            "student_id": st["_id"],
+            "student_name": st["name"],
+            "college": st["college"],
+            "year": st["year"],
+            "course": st["course"],
+            "section": st["section"],
+            "reason": "bench",
+            "status": status,
+            "request_time": when,
+            "approval_time": when + timedelta(minutes=30) if status in ("APPROVED", "LEFT_CAMPUS") else None,
+            "hod_id": None if is_pending else f"BH_{st['year']}_{st['course']}",
+            "father_mobile": st["father_mobile"],
+            "mother_mobile": st["mother_mobile"]
+        })
+    return docs
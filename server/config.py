@@ -12,8 +12,102 @@ class Config:
     FACE_EXECUTOR_MAX_WORKERS = int(os.getenv("FACE_EXECUTOR_MAX_WORKERS", "4"))
     FACE_INFERENCE_CONCURRENCY = int(os.getenv("FACE_INFERENCE_CONCURRENCY", "2"))
     FACE_INFERENCE_TIMEOUT_SECONDS = float(os.getenv("FACE_INFERENCE_TIMEOUT_SECONDS", "8"))
+    # How long a face request waits for a still-loading model before 503
+    FACE_MODEL_WAIT_SECONDS = float(os.getenv("FACE_MODEL_WAIT_SECONDS", "5"))
+    FACE_MODEL_WARMUP_ON_STARTUP = os.getenv("FACE_MODEL_WARMUP_ON_STARTUP", "true").lower() in ("true", "1", "yes")
+    # A failed model load is retried after this delay, doubling per failure up to the max
+    FACE_MODEL_RETRY_BACKOFF_SECONDS = float(os.getenv("FACE_MODEL_RETRY_BACKOFF_SECONDS", "30"))
+    FACE_MODEL_RETRY_BACKOFF_MAX_SECONDS = float(os.getenv("FACE_MODEL_RETRY_BACKOFF_MAX_SECONDS", "600"))
+    # /health/ready reports not-ready once this many requests queue for inference
+    HEALTH_MAX_INFERENCE_WAITING = int(os.getenv("HEALTH_MAX_INFERENCE_WAITING", "8"))
     FACE_MIN_WIDTH = int(os.getenv("FACE_MIN_WIDTH", "320"))
     FACE_MIN_HEIGHT = int(os.getenv("FACE_MIN_HEIGHT", "320"))
     FACE_MIN_BRIGHTNESS = float(os.getenv("FACE_MIN_BRIGHTNESS", "35"))
     FACE_MAX_BRIGHTNESS = float(os.getenv("FACE_MAX_BRIGHTNESS", "220"))
+    # Larger uploads are decoded at 1/2, 1/4 or 1/8 scale down to this side
+    FACE_DECODE_MAX_SIDE = int(os.getenv("FACE_DECODE_MAX_SIDE", "1280"))
+    FACE_UPLOAD_MAX_BYTES = int(os.getenv("FACE_UPLOAD_MAX_BYTES", str(10 * 1024 * 1024)))
+    # Enrollment normalisation: stored face = square crop around the detected
+    # bbox (+ margin per side, as a fraction of the bbox), resized to
+    # FACE_STORE_SIZE and encoded at FACE_STORE_JPEG_QUALITY
+    FACE_STORE_SIZE = int(os.getenv("FACE_STORE_SIZE", "320"))
+    FACE_STORE_MARGIN = float(os.getenv("FACE_STORE_MARGIN", "0.4"))
+    FACE_STORE_JPEG_QUALITY = int(os.getenv("FACE_STORE_JPEG_QUALITY", "85"))
+    # Also keep the 112x112 aligned crop the recognition model sees
+    FACE_STORE_ALIGNED = os.getenv("FACE_STORE_ALIGNED", "false").lower() in ("true", "1", "yes")
+
+    # Caching: "memory" (in-process, default) or "redis"
+    CACHE_BACKEND = os.getenv("CACHE_BACKEND", "memory").lower()
+    CACHE_MAX_BYTES = int(os.getenv("CACHE_MAX_BYTES", str(64 * 1024 * 1024)))
+    REDIS_HOST = os.getenv("REDIS_HOST", "localhost")
+    REDIS_PORT = int(os.getenv("REDIS_PORT", "6379"))
+    REDIS_DB = int(os.getenv("REDIS_DB", "0"))
+    # Role name per user for require_roles. Role changes invalidate it in this
+    # worker (or everywhere with CACHE_BACKEND=redis); other in-memory
+    # workers may serve the old role for up to this long
+    ROLE_CACHE_TTL_SECONDS = int(os.getenv("ROLE_CACHE_TTL_SECONDS", "30"))
+
+    # Pre-validated face tokens: "memory" (per worker) or "redis" (shared)
+    FACE_TOKEN_BACKEND = os.getenv("FACE_TOKEN_BACKEND", "memory").lower()
+    FACE_TOKEN_TTL_SECONDS = int(os.getenv("FACE_TOKEN_TTL_SECONDS", "300"))
+    FACE_TOKEN_MAX_ENTRIES = int(os.getenv("FACE_TOKEN_MAX_ENTRIES", "1000"))
+    FACE_TOKEN_MAX_BYTES = int(os.getenv("FACE_TOKEN_MAX_BYTES", str(64 * 1024 * 1024)))
+
+    # Audit trail: queued in memory, written in batches by a background thread
+    AUDIT_LOG_FILE = os.getenv("AUDIT_LOG_FILE", "audit.log")
+    AUDIT_LOG_SINKS = [x.strip() for x in os.getenv("AUDIT_LOG_SINKS", "file").split(",") if x.strip()]
+    AUDIT_QUEUE_SIZE = int(os.getenv("AUDIT_QUEUE_SIZE", "10000"))
+    AUDIT_BATCH_SIZE = int(os.getenv("AUDIT_BATCH_SIZE", "200"))
+    AUDIT_FLUSH_INTERVAL_SECONDS = float(os.getenv("AUDIT_FLUSH_INTERVAL_SECONDS", "1"))
+    AUDIT_OVERFLOW_POLICY = os.getenv("AUDIT_OVERFLOW_POLICY", "drop_newest")
+    AUDIT_BLOCK_TIMEOUT_SECONDS = float(os.getenv("AUDIT_BLOCK_TIMEOUT_SECONDS", "0.05"))
+    AUDIT_LOG_MAX_BYTES = int(os.getenv("AUDIT_LOG_MAX_BYTES", str(50 * 1024 * 1024)))
+    AUDIT_LOG_BACKUP_COUNT = int(os.getenv("AUDIT_LOG_BACKUP_COUNT", "5"))
+
+    # Parent SMS outbox (mark-left notifications are sent by background workers)
+    SMS_WORKERS = int(os.getenv("SMS_WORKERS", "2"))
+    SMS_POLL_INTERVAL_SECONDS = float(os.getenv("SMS_POLL_INTERVAL_SECONDS", "2"))
+    SMS_MAX_ATTEMPTS = int(os.getenv("SMS_MAX_ATTEMPTS", "6"))
+    SMS_RETRY_BASE_SECONDS = float(os.getenv("SMS_RETRY_BASE_SECONDS", "10"))
+    SMS_RETRY_MAX_SECONDS = float(os.getenv("SMS_RETRY_MAX_SECONDS", "900"))
+    SMS_LEASE_SECONDS = int(os.getenv("SMS_LEASE_SECONDS", "120"))
+    # Max time a send waits on a provider's token bucket before giving up
+    SMS_RATE_LIMIT_WAIT_SECONDS = float(os.getenv("SMS_RATE_LIMIT_WAIT_SECONDS", "5"))
+
+    # Bulk student import (services/student_import_service.py)
+    STUDENT_IMPORT_CHUNK_SIZE = int(os.getenv("STUDENT_IMPORT_CHUNK_SIZE", "500"))
+    STUDENT_IMPORT_MAX_ROWS = int(os.getenv("STUDENT_IMPORT_MAX_ROWS", "20000"))
+    STUDENT_IMPORT_MAX_ERRORS = int(os.getenv("STUDENT_IMPORT_MAX_ERRORS", "1000"))
+    STUDENT_IMPORT_HASH_WORKERS = int(os.getenv("STUDENT_IMPORT_HASH_WORKERS", str(min(8, os.cpu_count() or 2))))
+
+    # Scope -> HOD / mentor lookup map (data/scope_map_repo.py): how often a
+    # worker re-checks the stored map version
+    SCOPE_MAP_CHECK_SECONDS = float(os.getenv("SCOPE_MAP_CHECK_SECONDS", "1"))
+
+    # Resumable background jobs (services/background_jobs.py)
+    BACKGROUND_JOB_WORKERS = int(os.getenv("BACKGROUND_JOB_WORKERS", "2"))
+    BACKGROUND_JOB_LEASE_SECONDS = int(os.getenv("BACKGROUND_JOB_LEASE_SECONDS", "120"))
+    # How often each worker re-claims jobs whose runner died (lease expired)
+    BACKGROUND_JOB_RESUME_INTERVAL_SECONDS = float(os.getenv("BACKGROUND_JOB_RESUME_INTERVAL_SECONDS", "60"))
+    HOD_ASSIGN_BATCH_SIZE = int(os.getenv("HOD_ASSIGN_BATCH_SIZE", "1000"))
+    PROMOTION_BATCH_SIZE = int(os.getenv("PROMOTION_BATCH_SIZE", "500"))
+
+    # Admin list endpoints (core/listing.py): rows per page by default / at most
+    LIST_DEFAULT_LIMIT = int(os.getenv("LIST_DEFAULT_LIMIT", "500"))
+    LIST_MAX_LIMIT = int(os.getenv("LIST_MAX_LIMIT", "5000"))
+
+    # Request profiling (core/profiling.py). Header trigger is off unless a token is set.
+    PROFILING_TOKEN = os.getenv("PROFILING_TOKEN")
+    PROFILING_SAMPLE_RATE = float(os.getenv("PROFILING_SAMPLE_RATE", "0"))
+    PROFILING_REPORT_LINES = int(os.getenv("PROFILING_REPORT_LINES", "60"))
+
+    # Mongo command budgets per endpoint (core/query_budget.py): off | warn | fail
+    _QUERY_BUDGET_MODE_BY_ENV = {"production": "off", "test": "fail"}
+    QUERY_BUDGET_MODE = os.getenv(
+        "QUERY_BUDGET_MODE",
+        _QUERY_BUDGET_MODE_BY_ENV.get(os.getenv("ENV", "development"), "warn")
+    )
+    # Budget for routes without @query_budget; 0 = only check declared routes
+    QUERY_BUDGET_DEFAULT = int(os.getenv("QUERY_BUDGET_DEFAULT", "50"))
+
     # Remove hardcoded superadmin credentials. Manage superadmins securely (e.g., via environment, admin panel, or secure vault)
@@ -0,0 +1,131 @@
+"""
+Bounded, projected list responses for admin views.
+
+List endpoints take these query parameters (`params=Depends(list_params)`):
+- fields=name,phone,...  field selection; `_id` is always included and a
+  collection's hidden fields (password_hash, ...) can never be selected
+- limit / after          cursor pagination in `_id` order. At most
+  LIST_DEFAULT_LIMIT rows by default (LIST_MAX_LIMIT max); when more exist
+  the `_id` to pass as `after` comes back in the X-Next-Cursor header.
+  Clients must follow it (client/src/services/api.js `getAllPages`)
+- format=ndjson          stream every matching document as newline-delimited
+  JSON (exports); limit / after still apply when given
+
+Projection happens in the Mongo query, so hidden fields never leave the
+database and large collections are never loaded into memory at once.
+
+Per-row data from other collections is attached with `enrich(docs)`, called
+once per page (or per ENRICH_BATCH streamed rows) so it can batch its lookup.
+"""
+import json
+import re
+from datetime import datetime
+
+from bson import ObjectId
+from fastapi import HTTPException, Query
+from fastapi.encoders import jsonable_encoder
+from fastapi.responses import JSONResponse, StreamingResponse
+
+from config import Config
+from core.global_response import success
+
+_FIELD_NAME = re.compile(r"^[A-Za-z_][A-Za-z0-9_]*$")
+
+ENRICH_BATCH = 500
+
+
+class ListParams:
+    def __init__(self, fields=None, limit=None, after=None, format="json"):
+        self.fields = [f.strip() for f in fields.split(",") if f.strip()] if fields else []
+        self.after = after
+        self.format = format
+        if limit is None and format != "ndjson":
+            limit = Config.LIST_DEFAULT_LIMIT
+        self.limit = limit
+
+    @property
+    def streaming(self):
+        return self.format == "ndjson"
+
+    def projection(self, hidden=()):
+        if not self.fields:
+            return {f: 0 for f in hidden} or None
+        for f in self.fields:
+            if not _FIELD_NAME.match(f) or f in hidden:
+                raise HTTPException(status_code=400, detail=f"Field not selectable: {f}")
+        projection = {f: 1 for f in self.fields}
+        projection["_id"] = 1
+        return projection
+
+    def after_id(self, object_ids=False):
+        """
+        `after` as the listed collection's `_id` type. The cursor travels as
+        a string; collections keyed by ObjectId pass object_ids=True.
+        """
+        if object_ids and self.after and ObjectId.is_valid(self.after):
+            return ObjectId(self.after)
+        return self.after
+
+    @property
+    def fetch_limit(self):
+        # One extra row tells us whether there is a next page
+        return self.limit + 1 if self.limit else None
+
+    def respond(self, message, cursor, transform=None, enrich=None):
+        if self.streaming:
+            return ndjson_response(cursor, transform, enrich)
+
+        docs = list(cursor)
+        next_cursor = None
+        if self.limit and len(docs) > self.limit:
+            docs = docs[:self.limit]
+            next_cursor = docs[-1]["_id"]
+        if enrich and docs:
+            enrich(docs)
+        if transform:
+            docs = [transform(d) for d in docs]
+        headers = {"X-Next-Cursor": str(next_cursor)} if next_cursor is not None else None
+        return JSONResponse(
+            content=jsonable_encoder(success(message, docs), custom_encoder={ObjectId: str}),
+            headers=headers
+        )
+
+
+def list_params(
+    fields: str = Query(None, description="Comma-separated fields to return"),
+    limit: int = Query(None, ge=1, le=Config.LIST_MAX_LIMIT),
+    after: str = Query(None, description="Return rows after this _id (X-Next-Cursor)"),
+    format: str = Query("json", pattern="^(json|ndjson)$")
+):
+    return ListParams(fields=fields, limit=limit, after=after, format=format)
+
+
+def _json_default(value):
+    if isinstance(value, datetime):
+        return value.isoformat()
+    return str(value)
+
+
+def _batches(cursor, size):
+    batch = []
+    for doc in cursor:
+        batch.append(doc)
+        if len(batch) >= size:
+            yield batch
+            batch = []
+    if batch:
+        yield batch
+
+
+def ndjson_response(cursor, transform=None, enrich=None):
+    def rows():
+        # Sync generator: Starlette iterates it in the threadpool
+        for batch in _batches(cursor, ENRICH_BATCH):
+            if enrich:
+                enrich(batch)
+            yield "".join(
+                json.dumps(transform(doc) if transform else doc, default=_json_default) + "\n"
+                for doc in batch
+            )
+
+    return StreamingResponse(rows(), media_type="application/x-ndjson")
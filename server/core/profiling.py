@@ -0,0 +1,173 @@
+"""
+On-demand request profiling.
+
+A request is profiled when it carries `X-Profile-Token: <PROFILING_TOKEN>`
+or is picked by PROFILING_SAMPLE_RATE. Profiled requests get:
+- a cProfile report covering the event loop and the threadpool workers that
+  ran the endpoint / its sync dependencies (loop time may include other
+  requests' coroutines interleaved on the same loop)
+- the Mongo command count, DB time and per-command breakdown
+stored in `request_profiles` under a server-generated id (returned in
+X-Profile-Id; the client-supplied X-Request-ID is only a searchable field),
+retrievable via /profiles (SUPER_ADMIN). Only one request is profiled at a time per worker;
+concurrent candidates still get DB stats.
+
+DB stats are collected for every request (cheap); they are only persisted
+and echoed as X-DB-* headers when the request is profiled.
+"""
+import cProfile
+import io
+import pstats
+import random
+import threading
+import time
+import uuid
+from contextvars import ContextVar
+from datetime import datetime
+
+from starlette.concurrency import run_in_threadpool
+from starlette.middleware.base import BaseHTTPMiddleware
+
+from config import Config
+from utils.db_monitor import start_request_stats, stop_request_stats
+
+PROFILE_HEADER = "X-Profile-Token"
+
+_active_profile = ContextVar("active_profile", default=None)
+_profiler_lock = threading.Lock()
+
+
+class RequestProfile:
+    def __init__(self):
+        self._stats = None
+        self._lock = threading.Lock()
+
+    def _collect(self, prof):
+        with self._lock:
+            if self._stats is None:
+                self._stats = pstats.Stats(prof)
+            else:
+                self._stats.add(prof)
+
+    def _start(self):
+        prof = cProfile.Profile()
+        try:
+            prof.enable()
+        except ValueError:
+            # 3.12+: profiling is process-wide and the loop profiler already
+            # sees this thread
+            return None
+        return prof
+
+    def _stop(self, prof):
+        if prof is not None:
+            prof.disable()
+            self._collect(prof)
+
+    def run(self, func, *args, **kwargs):
+        prof = self._start()
+        try:
+            return func(*args, **kwargs)
+        finally:
+            self._stop(prof)
+
+    async def run_async(self, func, *args, **kwargs):
+        prof = self._start()
+        try:
+            return await func(*args, **kwargs)
+        finally:
+            self._stop(prof)
+
+    def report(self, limit=Config.PROFILING_REPORT_LINES):
+        if self._stats is None:
+            return ""
+        out = io.StringIO()
+        self._stats.stream = out
+        self._stats.sort_stats("cumulative").print_stats(limit)
+        return out.getvalue()
+
+
+# ===============================================================
+# THREADPOOL HOOK
+# ===============================================================
+def _wrap_run_in_threadpool(original):
+    async def run_in_threadpool(func, *args, **kwargs):
+        profile = _active_profile.get()
+        if profile is None:
+            return await original(func, *args, **kwargs)
+        return await original(profile.run, func, *args, **kwargs)
+    run_in_threadpool._profiling_wrapped = True
+    return run_in_threadpool
+
+
+def install_threadpool_profiling():
+    """
+    Sync endpoints and dependencies run via FastAPI's `run_in_threadpool`;
+    wrap it so their worker-thread time shows up in the request's profile.
+    Outside a profiled request the wrapper is a single ContextVar lookup.
+    """
+    import fastapi.routing
+    import fastapi.dependencies.utils
+
+    for module in (fastapi.routing, fastapi.dependencies.utils):
+        current = getattr(module, "run_in_threadpool", None)
+        if current is not None and not getattr(current, "_profiling_wrapped", False):
+            module.run_in_threadpool = _wrap_run_in_threadpool(current)
+
+
+# ===============================================================
+# MIDDLEWARE
+# ===============================================================
+def _should_profile(request):
+    token = request.headers.get(PROFILE_HEADER)
+    if token and Config.PROFILING_TOKEN and token == Config.PROFILING_TOKEN:
+        return True
+    return Config.PROFILING_SAMPLE_RATE > 0 and random.random() < Config.PROFILING_SAMPLE_RATE
+
+
+class ProfilingMiddleware(BaseHTTPMiddleware):
+    async def dispatch(self, request, call_next):
+        db_stats, db_token = start_request_stats()
+        profile = None
+        if _should_profile(request) and _profiler_lock.acquire(blocking=False):
+            profile = RequestProfile()
+        profile_token = _active_profile.set(profile)
+
+        started = time.perf_counter()
+        try:
+            if profile is None:
+                return await call_next(request)
+            response = await profile.run_async(call_next, request)
+        finally:
+            _active_profile.reset(profile_token)
+            stop_request_stats(db_token)
+            if profile is not None:
+                _profiler_lock.release()
+
+        duration_ms = round((time.perf_counter() - started) * 1000, 3)
+        # Never key on X-Request-ID: it is client-controlled
+        profile_id = uuid.uuid4().hex
+        request_id = getattr(request.state, "request_id", None)
+        db = db_stats.to_dict()
+        doc = {
+            "_id": profile_id,
+            "request_id": request_id,
+            "method": request.method,
+            "path": request.url.path,
+            "query": str(request.url.query),
+            "status_code": response.status_code,
+            "duration_ms": duration_ms,
+            "db": db,
+            "report": profile.report(),
+            "created_at": datetime.utcnow()
+        }
+        try:
+            from data.request_profiles_repo import save_profile
+            await run_in_threadpool(save_profile, doc)
+            response.headers["X-Profile-Id"] = profile_id
+        except Exception as e:
+            print(f"[PROFILE] failed to store profile {profile_id} ({request_id}): {e}")
+
+        response.headers["X-DB-Commands"] = str(db["count"])
+        response.headers["X-DB-Time-Ms"] = str(db["total_ms"])
+        return response
@@ -0,0 +1,117 @@
+"""
+Mongo command budgets per endpoint.
+
+Routes declare how many Mongo commands one call may issue:
+
+    @router.get("/")
+    @query_budget(5)
+    def get_all_guards(...):
+
+`@query_budget(0)` opts a route out (bulk endpoints whose command count
+grows with the input, e.g. /student/import).
+
+QueryBudgetMiddleware reads the per-request command count collected by
+utils/db_monitor (started in ProfilingMiddleware) and, depending on
+QUERY_BUDGET_MODE:
+- "off":  nothing (production default)
+- "warn": log the overrun and add an X-Query-Budget header (dev default)
+- "fail": replace the response with a 500 describing the overrun (tests)
+
+Every observed request also feeds an in-process per-endpoint report
+(`get_query_report()`, GET /profiles/query-report) so N+1 patterns show up
+as high max/mean command counts before they reach production.
+"""
+import threading
+
+from starlette.middleware.base import BaseHTTPMiddleware
+from starlette.responses import JSONResponse
+
+from config import Config
+from core.global_response import error
+from utils.db_monitor import current_request_stats
+
+
+def query_budget(max_commands):
+    """Declare the Mongo command budget for a route function."""
+    def decorator(func):
+        func.__query_budget__ = max_commands
+        return func
+    return decorator
+
+
+def budget_for(endpoint):
+    budget = getattr(endpoint, "__query_budget__", None)
+    return budget if budget is not None else Config.QUERY_BUDGET_DEFAULT
+
+
+# ===============================================================
+# PER-ENDPOINT REPORT
+# ===============================================================
+_report = {}
+_report_lock = threading.Lock()
+
+
+def _record(key, count, budget):
+    with _report_lock:
+        row = _report.get(key)
+        if row is None:
+            row = _report[key] = {"calls": 0, "total": 0, "max": 0, "budget": budget, "violations": 0}
+        row["calls"] += 1
+        row["total"] += count
+        row["max"] = max(row["max"], count)
+        row["budget"] = budget
+        if budget and count > budget:
+            row["violations"] += 1
+
+
+def get_query_report():
+    with _report_lock:
+        rows = {k: dict(v) for k, v in _report.items()}
+    for row in rows.values():
+        row["mean"] = round(row["total"] / row["calls"], 2) if row["calls"] else 0
+    return dict(sorted(rows.items(), key=lambda kv: kv[1]["max"], reverse=True))
+
+
+def reset_query_report():
+    with _report_lock:
+        _report.clear()
+
+
+# ===============================================================
+# MIDDLEWARE
+# ===============================================================
+class QueryBudgetMiddleware(BaseHTTPMiddleware):
+    async def dispatch(self, request, call_next):
+        stats = current_request_stats()
+        response = await call_next(request)
+        if stats is None:
+            return response
+
+        # The router stores the matched route/endpoint on the shared scope
+        route = request.scope.get("route")
+        endpoint = request.scope.get("endpoint")
+        if route is None or endpoint is None:
+            return response
+
+        count = stats.count
+        budget = budget_for(endpoint)
+        key = f"{request.method} {route.path}"
+        _record(key, count, budget)
+
+        if not budget or count <= budget:
+            return response
+
+        message = f"{key} issued {count} Mongo commands (budget {budget})"
+        if Config.QUERY_BUDGET_MODE == "fail":
+            return JSONResponse(
+                status_code=500,
+                content=error("Query budget exceeded", 500, detail={
+                    "endpoint": key,
+                    "commands": count,
+                    "budget": budget,
+                    "breakdown": stats.to_dict()["commands"]
+                })
+            )
+        print(f"[QUERY BUDGET] {message}: {stats.to_dict()['commands']}")
+        response.headers["X-Query-Budget"] = f"{count}/{budget}"
+        return response
@@ -0,0 +1,49 @@
+from fastapi import Request, HTTPException, status
+from config import Config
+
+
+def _too_large():
+    raise HTTPException(
+        status_code=status.HTTP_413_REQUEST_ENTITY_TOO_LARGE,
+        detail=f"Image too large. Maximum {Config.FACE_UPLOAD_MAX_BYTES // (1024 * 1024)} MB"
+    )
+
+
+async def read_image_upload(request: Request, field: str = "image"):
+    """
+    Read an image sent either as multipart/form-data (`field`) or as a raw
+    binary body (image/jpeg, image/png, application/octet-stream).
+
+    Raw bodies are streamed into one bytearray, which `np.frombuffer`
+    can then wrap without another copy.
+    """
+    limit = Config.FACE_UPLOAD_MAX_BYTES
+    declared = request.headers.get("content-length")
+    if declared and declared.isdigit() and int(declared) > limit:
+        _too_large()
+
+    content_type = request.headers.get("content-type", "")
+    if content_type.startswith("multipart/form-data"):
+        form = await request.form()
+        upload = form.get(field)
+        if upload is None or not hasattr(upload, "read"):
+            raise HTTPException(
+                status_code=status.HTTP_400_BAD_REQUEST,
+                detail=f"Multipart field '{field}' is required"
+            )
+        data = await upload.read()
+        if len(data) > limit:
+            _too_large()
+        return data
+
+    buf = bytearray()
+    async for chunk in request.stream():
+        buf += chunk
+        if len(buf) > limit:
+            _too_large()
+    if not buf:
+        raise HTTPException(
+            status_code=status.HTTP_400_BAD_REQUEST,
+            detail="Empty image upload"
+        )
+    return buf
@@ -1,7 +1,11 @@
 from extensions.mongo import db
+from bson import ObjectId
 
 admins = db["admins"]
 
+LIST_HIDDEN_FIELDS = ("password_hash",)
+_LIST_PROJECTION = {f: 0 for f in LIST_HIDDEN_FIELDS}
+
 def create_admin(doc: dict, session=None):
     return admins.insert_one(doc, session=session)
 
@@ -22,4 +26,20 @@ def delete_admin(admin_id: str, session=None):
     )
 
 def get_all_admins():
-    return list(admins.find({}).sort("_id", 1))
+    return list(admins.find({}, _LIST_PROJECTION).sort("_id", 1))
+
+def list_admins(projection=None, after=None, limit=None):
+    """
+    Cursor over admins in _id order, starting after `after`. Older admin
+    documents have ObjectId `_id`s, which sort after every string one, so a
+    string cursor also lets all ObjectIds through.
+    """
+    if after is None:
+        query = {}
+    elif isinstance(after, ObjectId):
+        query = {"_id": {"$gt": after}}
+    else:
+        query = {"$or": [{"_id": {"$gt": after}}, {"_id": {"$type": "objectId"}}]}
+    cursor = admins.find(query, projection or _LIST_PROJECTION).sort("_id", 1)
+    return cursor.limit(limit) if limit else cursor
+
@@ -0,0 +1,6 @@
+"""Async mirrors of the `data/` repositories.
+
+Same function names and signatures as the sync modules, backed by
+`extensions.mongo.async_db`. Use them from `async def` routes and
+services; sync code keeps using the modules in `data/`.
+"""
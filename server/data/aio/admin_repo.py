@@ -0,0 +1,7 @@
+from extensions.mongo import async_db
+
+admins = async_db["admins"]
+
+
+async def get_admin_by_id(admin_id: str):
+    return await admins.find_one({"_id": admin_id})
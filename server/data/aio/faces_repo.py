@@ -0,0 +1,39 @@
+import asyncio
+from bson import ObjectId
+from extensions.mongo import async_db
+from utils.encryption import decrypt_image_bytes
+
+faces = async_db["faces"]
+
+
+def _decrypt_all(docs):
+    for doc in docs:
+        if doc.get("is_encrypted"):
+            doc["image_data"] = decrypt_image_bytes(doc["image_data_encrypted"])
+    return docs
+
+
+async def _decrypt(doc):
+    if doc and doc.get("is_encrypted"):
+        # Fernet on a multi-hundred-KB JPEG is CPU work; keep it off the loop
+        doc["image_data"] = await asyncio.to_thread(decrypt_image_bytes, doc["image_data_encrypted"])
+    return doc
+
+
+async def get_face_by_id(face_id: str):
+    return await _decrypt(await faces.find_one({"_id": ObjectId(face_id)}))
+
+
+async def get_face_by_user(user_id: str):
+    return await _decrypt(await faces.find_one({"user_id": user_id}))
+
+
+async def get_faces_by_users(user_ids):
+    """{user_id: face doc with `image_data`} for the given users, in one query."""
+    ids = list(dict.fromkeys(user_ids))
+    if not ids:
+        return {}
+    docs = await faces.find({"user_id": {"$in": ids}}).to_list()
+    # One thread hop for the whole batch instead of one per face
+    await asyncio.to_thread(_decrypt_all, docs)
+    return {doc["user_id"]: doc for doc in docs}
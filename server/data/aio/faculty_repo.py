@@ -0,0 +1,9 @@
+from extensions.mongo import async_db
+
+faculty = async_db["faculty"]
+
+_PROFILE_PROJECTION = {"hod_student_ids": 0, "mentor_student_ids": 0}
+
+
+async def get_faculty_by_id(faculty_id: str):
+    return await faculty.find_one({"_id": faculty_id}, _PROFILE_PROJECTION)
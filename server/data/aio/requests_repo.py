@@ -0,0 +1,109 @@
+from extensions.mongo import async_db
+from bson import ObjectId
+from utils.time_utils import ist_today_range_utc
+
+requests = async_db["requests"]
+
+
+# ==========================================================
+# READ
+# ==========================================================
+async def get_request_by_id(request_id):
+    try:
+        return await requests.find_one({"_id": ObjectId(request_id)})
+    except Exception:
+        return None
+
+
+async def get_requests_by_student(student_id):
+    return await requests.find({"student_id": student_id}).sort("request_time", -1).to_list()
+
+
+async def get_requests_by_hod(hod_id):
+    return await requests.find({"hod_id": hod_id}).sort("request_time", -1).to_list()
+
+
+async def get_all_requests():
+    return await requests.find().sort("request_time", -1).to_list()
+
+
+async def get_requests_filtered(query: dict, skip: int = 0, limit: int = 20, sort_by: str = "request_time", sort_order: int = -1):
+    """Returns (list of request docs, total count) for custom filter view. Does not modify status."""
+    total = await requests.count_documents(query)
+    cursor = (
+        requests.find(query)
+        .sort(sort_by, sort_order)
+        .skip(skip)
+        .limit(limit)
+    )
+    return await cursor.to_list(), total
+
+
+# ==========================================================
+# UPDATE
+# ==========================================================
+async def update_request(request_id, updates):
+    return await requests.update_one(
+        {"_id": ObjectId(request_id)},
+        {"$set": updates}
+    )
+
+
+# ==========================================================
+# INTERNAL: AUTO CLEAN (IST SAFE)
+# ==========================================================
+async def auto_mark_unchecked():
+    start, _ = ist_today_range_utc()
+
+    await requests.update_many(
+        {
+            "request_time": {"$lt": start},
+            "status": {"$in": ["REQUESTED", "PENDING_MENTOR"]}
+        },
+        {"$set": {"status": "MENTOR_UNCHECKED"}}
+    )
+
+    await requests.update_many(
+        {
+            "request_time": {"$lt": start},
+            "status": {"$in": ["APPROVED_BY_MENTOR", "PENDING_HOD"]}
+        },
+        {"$set": {"status": "HOD_UNCHECKED"}}
+    )
+
+    await requests.update_many(
+        {
+            "approval_time": {"$lt": start},
+            "status": "APPROVED",
+            "left_time": {"$exists": False}
+        },
+        {"$set": {"status": "APPROVED_NOT_LEFT"}}
+    )
+
+
+# ==========================================================
+# TODAY (IST)
+# ==========================================================
+async def get_todays_approved_requests():
+    start, end = ist_today_range_utc()
+
+    return await requests.find({
+        "approval_time": {"$gte": start, "$lt": end},
+        "status": "APPROVED"
+    }).sort("approval_time", 1).to_list()
+
+
+async def get_todays_requests_for_student(student_id):
+    start, end = ist_today_range_utc()
+
+    return await requests.find({
+        "student_id": student_id,
+        "request_time": {"$gte": start, "$lt": end}
+    }).sort("request_time", 1).to_list()
+
+
+async def get_approved_requests_for_guard_college(college: str):
+    return await requests.find({
+        "status": "APPROVED",
+        "college": college
+    }).sort("approval_time", -1).to_list()
@@ -0,0 +1,11 @@
+from extensions.mongo import async_db
+
+student_hod = async_db["student_hod"]
+
+
+async def get_hods_for_student(student_id: str):
+    return await student_hod.find({"student_id": student_id}).to_list()
+
+
+async def get_students_for_hod(hod_id: str):
+    return await student_hod.find({"hod_id": hod_id}).to_list()
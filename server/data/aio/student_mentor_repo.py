@@ -0,0 +1,28 @@
+from extensions.mongo import async_db
+
+student_mentor = async_db["student_mentor_mapping"]
+faculty = async_db["faculty"]
+
+
+async def get_mentors_for_scope(college: str, year: int, course: str, section: str):
+    """Get all mentor IDs assigned to a specific course/year/section"""
+    return await student_mentor.distinct(
+        "mentor_id",
+        {
+            "college": college,
+            "year": year,
+            "course": course,
+            "section": section
+        }
+    )
+
+
+async def get_students_for_mentor(mentor_id: str):
+    """Returns list of student_ids mapped to a mentor"""
+    doc = await faculty.find_one({"_id": mentor_id}, {"mentor_student_ids": 1, "read_model_version": 1})
+    if doc and doc.get("read_model_version") is not None:
+        return list(doc.get("mentor_student_ids") or [])
+    return await student_mentor.distinct(
+        "student_id",
+        {"mentor_id": mentor_id}
+    )
@@ -0,0 +1,19 @@
+from bson import ObjectId
+from extensions.mongo import async_db
+
+students = async_db["students"]
+
+
+async def get_student_by_id(student_id: str):
+    if not student_id:
+        return None
+    doc = await students.find_one({"_id": student_id})
+    if doc is not None:
+        return doc
+    # Request often stores student_id as str(ObjectId); DB _id may be ObjectId
+    try:
+        if len(student_id) == 24 and all(c in "0123456789abcdefABCDEF" for c in student_id):
+            return await students.find_one({"_id": ObjectId(student_id)})
+    except Exception:
+        pass
+    return None
@@ -0,0 +1,20 @@
+from config import Config
+from extensions.mongo import async_db
+from utils.cache import cache_result
+
+user_roles = async_db["user_roles"]
+roles = async_db["roles"]
+
+
+async def get_user_role(user_id: str):
+    return await user_roles.find_one({"user_id": user_id})
+
+
+@cache_result(ttl=Config.ROLE_CACHE_TTL_SECONDS)
+async def get_user_role_name(user_id: str):
+    """Role name of a user (None if unassigned); cached, see invalidate_user_cache."""
+    mapping = await user_roles.find_one({"user_id": user_id}, {"role_id": 1})
+    if not mapping:
+        return None
+    role = await roles.find_one({"_id": mapping["role_id"]}, {"name": 1})
+    return role["name"] if role else None
@@ -0,0 +1,159 @@
+from datetime import datetime
+
+from pymongo import ReturnDocument
+from pymongo.errors import DuplicateKeyError
+
+from extensions.mongo import db
+
+background_jobs = db["background_jobs"]
+# One doc per locked resource key; the unique _id makes taking a lock atomic
+job_locks = db["background_job_locks"]
+
+QUEUED = "QUEUED"
+RUNNING = "RUNNING"
+COMPLETED = "COMPLETED"
+FAILED = "FAILED"
+
+
+def create_job(job_id: str, job_type: str, params: dict, created_by: str = None):
+    now = datetime.utcnow()
+    doc = {
+        "_id": job_id,
+        "type": job_type,
+        "params": params,
+        "status": QUEUED,
+        "progress": {"done": 0, "total": None},
+        "checkpoint": None,
+        "attempts": 0,
+        "error": None,
+        "created_by": created_by,
+        "created_at": now,
+        "updated_at": now,
+        "lease_until": None
+    }
+    background_jobs.insert_one(doc)
+    return doc
+
+
+def claim_job(job_id: str, now, lease_until):
+    """Lease a specific queued job (or one whose previous runner died)."""
+    return background_jobs.find_one_and_update(
+        {"_id": job_id, "$or": [
+            {"status": QUEUED},
+            {"status": RUNNING, "lease_until": {"$lte": now}}
+        ]},
+        {"$set": {"status": RUNNING, "lease_until": lease_until, "updated_at": now}, "$inc": {"attempts": 1}},
+        return_document=ReturnDocument.AFTER
+    )
+
+
+def claim_stale_job(now, lease_until):
+    """Lease any queued job or running job with an expired lease (resume after restart)."""
+    return background_jobs.find_one_and_update(
+        {"$or": [
+            {"status": QUEUED},
+            {"status": RUNNING, "lease_until": {"$lte": now}}
+        ]},
+        {"$set": {"status": RUNNING, "lease_until": lease_until, "updated_at": now}, "$inc": {"attempts": 1}},
+        sort=[("created_at", 1)],
+        return_document=ReturnDocument.AFTER
+    )
+
+
+def update_job_progress(job_id: str, done: int, total: int, checkpoint, lease_until):
+    now = datetime.utcnow()
+    return background_jobs.update_one(
+        {"_id": job_id, "status": RUNNING},
+        {"$set": {
+            "progress": {"done": done, "total": total},
+            "checkpoint": checkpoint,
+            "lease_until": lease_until,
+            "updated_at": now
+        }}
+    )
+
+
+def finish_job(job_id: str, result=None):
+    now = datetime.utcnow()
+    res = background_jobs.update_one(
+        {"_id": job_id},
+        {"$set": {"status": COMPLETED, "result": result, "lease_until": None, "updated_at": now, "finished_at": now}}
+    )
+    release_job_locks(job_id)
+    return res
+
+
+def fail_job(job_id: str, error: str):
+    now = datetime.utcnow()
+    res = background_jobs.update_one(
+        {"_id": job_id},
+        {"$set": {"status": FAILED, "error": error, "lease_until": None, "updated_at": now, "finished_at": now}}
+    )
+    release_job_locks(job_id)
+    return res
+
+
+def get_job(job_id: str):
+    return background_jobs.find_one({"_id": job_id})
+
+
+def list_jobs(job_type: str = None, status: str = None, limit: int = 50):
+    query = {}
+    if job_type:
+        query["type"] = job_type
+    if status:
+        query["status"] = status
+    return list(background_jobs.find(query).sort("created_at", -1).limit(limit))
+
+
+# ==========================================================
+# LOCKS (mutually exclusive jobs)
+# ==========================================================
+class JobLockConflict(Exception):
+    """A lock key is held by another job (`job_id`, None if it just went away)."""
+    def __init__(self, key, job_id):
+        super().__init__(f"{key} is locked by job {job_id}")
+        self.key = key
+        self.job_id = job_id
+
+
+def _lock_is_stale(lock, stale_before):
+    # Held by a finished job, or by a job that was never created (the
+    # requester died between taking the lock and submitting the job)
+    job = background_jobs.find_one({"_id": lock["job_id"]}, {"status": 1})
+    if job is None:
+        return lock["created_at"] <= stale_before
+    return job["status"] not in (QUEUED, RUNNING)
+
+
+def acquire_job_locks(job_id: str, keys, stale_before):
+    """
+    Take every key in `keys` for `job_id`, all or nothing; raises
+    JobLockConflict with the holder's job id. Locks are released by
+    finish_job / fail_job, or by release_job_locks if the job never starts.
+    """
+    taken = []
+    try:
+        for key in sorted(set(keys)):
+            try:
+                job_locks.insert_one({"_id": key, "job_id": job_id, "created_at": datetime.utcnow()})
+            except DuplicateKeyError:
+                holder = job_locks.find_one({"_id": key})
+                if holder is None or not _lock_is_stale(holder, stale_before):
+                    raise JobLockConflict(key, holder and holder["job_id"])
+                job_locks.delete_one({"_id": key, "job_id": holder["job_id"]})
+                try:
+                    job_locks.insert_one({"_id": key, "job_id": job_id, "created_at": datetime.utcnow()})
+                except DuplicateKeyError:
+                    # Another requester took over the stale lock first
+                    raise JobLockConflict(key, (job_locks.find_one({"_id": key}) or {}).get("job_id"))
+            taken.append(key)
+    except Exception:
+        if taken:
+            job_locks.delete_many({"_id": {"$in": taken}, "job_id": job_id})
+        raise
+    return taken
+
+
+def release_job_locks(job_id: str):
+    return job_locks.delete_many({"job_id": job_id})
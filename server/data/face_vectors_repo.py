@@ -1,4 +1,5 @@
 
+from datetime import datetime
 from extensions.mongo import db
 from utils.encryption import encrypt_embedding, decrypt_embedding
 
@@ -10,7 +11,8 @@ def create_vector(vector_id, user_id, embedding, session=None):
         "_id": vector_id,
         "user_id": user_id,
         "embedding_encrypted": encrypted_embedding,
-        "is_encrypted": True
+        "is_encrypted": True,
+        "created_at": datetime.utcnow()
     }
     return face_vectors.insert_one(doc, session=session)
 
@@ -20,6 +22,17 @@ def get_vector(vector_id):
         doc["embedding"] = decrypt_embedding(doc["embedding_encrypted"])
     return doc
 
+def get_vectors_created_after(since):
+    """
+    Vectors inserted after `since`. Used to re-check a pre-validated face
+    only against enrollments that its original duplicate search could not see.
+    """
+    docs = list(face_vectors.find({"created_at": {"$gt": since}}))
+    for doc in docs:
+        if doc.get("is_encrypted"):
+            doc["embedding"] = decrypt_embedding(doc["embedding_encrypted"])
+    return docs
+
 def delete_vector(vector_id, session=None):
     return face_vectors.delete_one(
         {"_id": vector_id},
@@ -1,4 +1,3 @@
-
 from extensions.mongo import db
 from bson import ObjectId
 from datetime import datetime
@@ -6,7 +5,42 @@ from utils.encryption import encrypt_image_bytes, decrypt_image_bytes
 
 faces = db["faces"]
 
-def create_face_doc(user_id, user_type, image_bytes, vector_ref, session=None):
+# Everything but the encrypted JPEG: existence checks, face_id / vector_ref
+FACE_META_PROJECTION = {"image_data_encrypted": 0, "aligned_data_encrypted": 0}
+
+
+class LazyFaceDoc(dict):
+    """
+    Face document whose `image_data` is decrypted on first access (then
+    cached), so callers that only read `_id` / `vector_ref` never pay for
+    Fernet on the JPEG.
+    """
+
+    def _decryptable(self):
+        return self.get("is_encrypted") and dict.__contains__(self, "image_data_encrypted")
+
+    def __missing__(self, key):
+        if key == "image_data" and self._decryptable():
+            value = decrypt_image_bytes(self["image_data_encrypted"])
+            dict.__setitem__(self, key, value)
+            return value
+        raise KeyError(key)
+
+    def get(self, key, default=None):
+        try:
+            return self[key]
+        except KeyError:
+            return default
+
+    def __contains__(self, key):
+        return dict.__contains__(self, key) or (key == "image_data" and self._decryptable())
+
+
+def _lazy(doc):
+    return LazyFaceDoc(doc) if doc is not None else None
+
+
+def create_face_doc(user_id, user_type, image_bytes, vector_ref, session=None, aligned_bytes=None):
     encrypted_image = encrypt_image_bytes(image_bytes)
     doc = {
         "user_id": user_id,
@@ -14,25 +48,52 @@ def create_face_doc(user_id, user_type, image_bytes, vector_ref, session=None):
         "image_data_encrypted": encrypted_image,
         "is_encrypted": True,
         "vector_ref": vector_ref,
+        "image_size": len(image_bytes),
+        "normalized": True,
         "created_at": datetime.utcnow()
     }
+    if aligned_bytes:
+        doc["aligned_data_encrypted"] = encrypt_image_bytes(aligned_bytes)
     res = faces.insert_one(doc, session=session)
     return str(res.inserted_id)
 
+# =========================
+# WITH IMAGE (decrypted lazily on `image_data` access)
+# =========================
 def get_face_by_id(face_id: str):
-    doc = faces.find_one({"_id": ObjectId(face_id)})
-    if doc and doc.get("is_encrypted"):
-        doc["image_data"] = decrypt_image_bytes(doc["image_data_encrypted"])
-    return doc
+    return _lazy(faces.find_one({"_id": ObjectId(face_id)}))
 
 def get_face_by_user(user_id: str):
-    doc = faces.find_one({"user_id": user_id})
-    if doc and doc.get("is_encrypted"):
-        doc["image_data"] = decrypt_image_bytes(doc["image_data_encrypted"])
-    return doc
+    return _lazy(faces.find_one({"user_id": user_id}))
+
+def get_faces_by_users(user_ids):
+    """{user_id: LazyFaceDoc} for the given users, in one query."""
+    ids = list(dict.fromkeys(user_ids))
+    if not ids:
+        return {}
+    return {doc["user_id"]: LazyFaceDoc(doc) for doc in faces.find({"user_id": {"$in": ids}})}
 
 def delete_face(face_id: str, session=None):
     return faces.delete_one(
         {"_id": ObjectId(face_id)},
         session=session
     )
+
+# =========================
+# METADATA ONLY (no image, no decryption)
+# =========================
+def get_face_meta_by_id(face_id: str):
+    return faces.find_one({"_id": ObjectId(face_id)}, FACE_META_PROJECTION)
+
+def get_face_meta_by_user(user_id: str, session=None):
+    return faces.find_one({"user_id": user_id}, FACE_META_PROJECTION, session=session)
+
+def get_face_meta_by_users(user_ids):
+    """{user_id: face metadata} for the given users, in one query."""
+    ids = list(dict.fromkeys(user_ids))
+    if not ids:
+        return {}
+    return {
+        doc["user_id"]: doc
+        for doc in faces.find({"user_id": {"$in": ids}}, FACE_META_PROJECTION)
+    }
@@ -0,0 +1,186 @@
+"""
+Denormalised faculty read model.
+
+Each faculty document can carry:
+
+    hod_scopes:          [{college, year, course}]
+    mentor_scopes:       [{college, year, course, section}]
+    hod_student_ids:     [student_id, ...]
+    mentor_student_ids:  [student_id, ...]
+    read_model_version:  int, bumped on every change
+    read_model_updated_at
+
+so HOD / mentor dashboards resolve their scope with one faculty read instead
+of distinct/aggregate calls on student_hod / student_mentor_mapping.
+
+The mapping collections stay the source of truth. Writers either patch the
+arrays incrementally (`add_students` / `remove_students`, single-student
+paths) or recompute them (`rebuild_faculty_read_model`, bulk paths).
+Incremental patches only touch faculty that already have a read model
+(`read_model_version` set), so a partial set is never mistaken for a full
+one; faculty without it keep using the legacy queries until a rebuild or
+`python -m utils.backfill_faculty_read_model`.
+"""
+from datetime import datetime
+
+from pymongo import UpdateOne
+
+from extensions.mongo import db
+
+faculty = db["faculty"]
+student_hod = db["student_hod"]
+student_mentor = db["student_mentor_mapping"]
+scope_map = db["scope_map"]
+
+READ_MODEL_PROJECTION = {
+    "college": 1,
+    "hod_scopes": 1,
+    "mentor_scopes": 1,
+    "hod_student_ids": 1,
+    "mentor_student_ids": 1,
+    "read_model_version": 1
+}
+
+_STUDENT_FIELD = {"hod": "hod_student_ids", "mentor": "mentor_student_ids"}
+_SCOPE_FIELD = {"hod": "hod_scopes", "mentor": "mentor_scopes"}
+
+
+def _stamp():
+    return {"$inc": {"read_model_version": 1}, "$set": {"read_model_updated_at": datetime.utcnow()}}
+
+
+# ==========================================================
+# READ
+# ==========================================================
+def get_faculty_read_model(faculty_id: str):
+    """Faculty doc with the read-model fields, or None if not built for this faculty."""
+    doc = faculty.find_one({"_id": faculty_id}, READ_MODEL_PROJECTION)
+    if not doc or doc.get("read_model_version") is None:
+        return None
+    return doc
+
+
+def student_ids_from(doc, kind: str):
+    """Student ids of a faculty doc's read model (`kind` = "hod" | "mentor"), None if absent."""
+    if not doc or doc.get("read_model_version") is None:
+        return None
+    return list(doc.get(_STUDENT_FIELD[kind]) or [])
+
+
+def scopes_from(doc, kind: str):
+    if not doc or doc.get("read_model_version") is None:
+        return None
+    return list(doc.get(_SCOPE_FIELD[kind]) or [])
+
+
+# ==========================================================
+# INCREMENTAL (single-student writes)
+# ==========================================================
+def add_students(faculty_ids, kind: str, student_ids, session=None):
+    """Add `student_ids` to the `kind` set of each faculty in `faculty_ids`."""
+    if not faculty_ids or not student_ids:
+        return None
+    update = _stamp()
+    update["$addToSet"] = {_STUDENT_FIELD[kind]: {"$each": list(student_ids)}}
+    return faculty.update_many(
+        {"_id": {"$in": list(faculty_ids)}, "read_model_version": {"$exists": True}},
+        update,
+        session=session
+    )
+
+
+def remove_students(student_ids, kind: str = None, session=None):
+    """Pull `student_ids` from every faculty's hod and/or mentor set."""
+    if not student_ids:
+        return None
+    fields = [_STUDENT_FIELD[kind]] if kind else list(_STUDENT_FIELD.values())
+    ids = list(student_ids)
+    update = _stamp()
+    update["$pull"] = {f: {"$in": ids} for f in fields}
+    return faculty.update_many(
+        {"$or": [{f: {"$in": ids}} for f in fields]},
+        update,
+        session=session
+    )
+
+
+# ==========================================================
+# REBUILD (bulk writes, backfill)
+# ==========================================================
+def _scope_rows(collection, key, faculty_ids, fields):
+    group_id = {f: f"${f}" for f in fields}
+    group_id["faculty_id"] = f"${key}"
+    rows = {}
+    pipeline = [
+        {"$match": {key: {"$in": faculty_ids}}},
+        {"$group": {"_id": group_id, "student_ids": {"$addToSet": "$student_id"}}}
+    ]
+    for g in collection.aggregate(pipeline, allowDiskUse=True):
+        fid = g["_id"].pop("faculty_id")
+        entry = rows.setdefault(fid, {"scopes": [], "student_ids": set()})
+        entry["scopes"].append(g["_id"])
+        entry["student_ids"].update(g["student_ids"])
+    return rows
+
+
+def _scope_map_rows(kind, faculty_ids, fields):
+    """Scopes assigned in the scope map even if they have no students yet."""
+    rows = {}
+    for doc in scope_map.find({"kind": kind, "ids": {"$in": faculty_ids}}):
+        scope = {f: doc.get(f) for f in fields}
+        for fid in doc.get("ids", []):
+            if fid in faculty_ids:
+                rows.setdefault(fid, []).append(scope)
+    return rows
+
+
+def _merge_scopes(*lists):
+    seen, merged = set(), []
+    for scopes in lists:
+        for scope in scopes:
+            key = tuple(sorted(scope.items()))
+            if key not in seen:
+                seen.add(key)
+                merged.append(scope)
+    return merged
+
+
+def rebuild_faculty_read_model(faculty_ids=None, session=None):
+    """
+    Recompute the read model of `faculty_ids` (all faculty when None) from
+    student_hod, student_mentor_mapping and the scope map. Returns the number
+    of faculty documents written.
+    """
+    if faculty_ids is None:
+        faculty_ids = faculty.distinct("_id")
+    faculty_ids = list(dict.fromkeys(faculty_ids))
+    if not faculty_ids:
+        return 0
+
+    hod_fields = ("college", "year", "course")
+    mentor_fields = ("college", "year", "course", "section")
+    hod_rows = _scope_rows(student_hod, "hod_id", faculty_ids, hod_fields)
+    mentor_rows = _scope_rows(student_mentor, "mentor_id", faculty_ids, mentor_fields)
+    hod_map = _scope_map_rows("hod", faculty_ids, hod_fields)
+    mentor_map = _scope_map_rows("mentor", faculty_ids, mentor_fields)
+
+    now = datetime.utcnow()
+    ops = []
+    for fid in faculty_ids:
+        hod = hod_rows.get(fid, {"scopes": [], "student_ids": set()})
+        mentor = mentor_rows.get(fid, {"scopes": [], "student_ids": set()})
+        ops.append(UpdateOne(
+            {"_id": fid},
+            {
+                "$set": {
+                    "hod_scopes": _merge_scopes(hod_map.get(fid, []), hod["scopes"]),
+                    "mentor_scopes": _merge_scopes(mentor_map.get(fid, []), mentor["scopes"]),
+                    "hod_student_ids": sorted(hod["student_ids"]),
+                    "mentor_student_ids": sorted(mentor["student_ids"]),
+                    "read_model_updated_at": now
+                },
+                "$inc": {"read_model_version": 1}
+            }
+        ))
+    result = faculty.bulk_write(ops, ordered=False, session=session)
+    return result.matched_count
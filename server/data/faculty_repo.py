@@ -2,6 +2,12 @@ from extensions.mongo import db
 
 faculty = db["faculty"]
 
+# Read-model student id sets (data/faculty_read_model_repo.py) can be large;
+# profile / list reads leave them out
+_PROFILE_PROJECTION = {"hod_student_ids": 0, "mentor_student_ids": 0}
+LIST_HIDDEN_FIELDS = ("password_hash", "hod_student_ids", "mentor_student_ids")
+_LIST_PROJECTION = {f: 0 for f in LIST_HIDDEN_FIELDS}
+
 # =========================
 # CREATE
 # =========================
@@ -12,7 +18,7 @@ def create_faculty(doc: dict, session=None):
 # GET BY ID
 # =========================
 def get_faculty_by_id(faculty_id: str):
-    return faculty.find_one({"_id": faculty_id})
+    return faculty.find_one({"_id": faculty_id}, _PROFILE_PROJECTION)
 
 # =========================
 # UPDATE
@@ -37,7 +43,7 @@ def delete_faculty(faculty_id: str, session=None):
 # GET ALL
 # =========================
 def get_all_faculty():
-    return list(faculty.find().sort("_id", 1))
+    return list(faculty.find({}, _PROFILE_PROJECTION).sort("_id", 1))
 
 # =========================
 # GET BY COLLEGE
@@ -45,7 +51,8 @@ def get_all_faculty():
 def get_faculty_by_college(college: str):
     return list(
         faculty.find(
-            {"college": college, "active": True}
+            {"college": college, "active": True},
+            _PROFILE_PROJECTION
         ).sort("_id", 1)
     )
 
@@ -54,7 +61,18 @@ def get_faculty_by_college(college: str):
 # =========================
 def filter_faculty(filters: dict):
     query = {k: v for k, v in filters.items() if v is not None}
-    return list(faculty.find(query).sort("_id", 1))
+    return list(faculty.find(query, _PROFILE_PROJECTION).sort("_id", 1))
+
+# =========================
+# PAGED LIST
+# =========================
+def list_faculty(filters: dict, projection=None, after=None, limit=None):
+    """Cursor over matching faculty in _id order, starting after `after`."""
+    query = {k: v for k, v in filters.items() if v is not None}
+    if after is not None:
+        query["_id"] = {"$gt": after}
+    cursor = faculty.find(query, projection or _LIST_PROJECTION).sort("_id", 1)
+    return cursor.limit(limit) if limit else cursor
 
 
 # ---------------------------------------------------------
@@ -94,7 +112,7 @@ def get_all_hods():
     ids = _hod_user_ids()
     if not ids:
         return []
-    return list(faculty.find({"_id": {"$in": ids}}).sort("_id", 1))
+    return list(faculty.find({"_id": {"$in": ids}}, _PROFILE_PROJECTION).sort("_id", 1))
 
 
 def get_hods_by_college(college: str):
@@ -103,7 +121,7 @@ def get_hods_by_college(college: str):
     if not ids:
         return []
     return list(
-        faculty.find({"_id": {"$in": ids}, "college": college, "active": True}).sort("_id", 1)
+        faculty.find({"_id": {"$in": ids}, "college": college, "active": True}, _PROFILE_PROJECTION).sort("_id", 1)
     )
 
 
@@ -114,7 +132,7 @@ def filter_hods(filters: dict):
     if not ids:
         return []
     query["_id"] = {"$in": ids}
-    return list(faculty.find(query).sort("_id", 1))
+    return list(faculty.find(query, _PROFILE_PROJECTION).sort("_id", 1))
 
 
 def _mentor_user_ids():
@@ -132,7 +150,7 @@ def get_mentors_by_college(college: str):
     if not ids:
         return []
     return list(
-        faculty.find({"_id": {"$in": ids}, "college": college, "active": True}).sort("_id", 1)
+        faculty.find({"_id": {"$in": ids}, "college": college, "active": True}, _PROFILE_PROJECTION).sort("_id", 1)
     )
 
 
@@ -141,7 +159,7 @@ def get_all_mentors():
     ids = _mentor_user_ids()
     if not ids:
         return []
-    return list(faculty.find({"_id": {"$in": ids}, "active": True}).sort("_id", 1))
+    return list(faculty.find({"_id": {"$in": ids}, "active": True}, _PROFILE_PROJECTION).sort("_id", 1))
 
 
 
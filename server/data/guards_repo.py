@@ -2,6 +2,9 @@ from extensions.mongo import db
 
 guards = db["guards"]
 
+LIST_HIDDEN_FIELDS = ("password_hash",)
+_LIST_PROJECTION = {f: 0 for f in LIST_HIDDEN_FIELDS}
+
 def get_guard_by_id(guard_id: str):
     return guards.find_one({"_id": guard_id})
 
@@ -22,4 +25,11 @@ def delete_guard(guard_id: str, session=None):
     )
 
 def get_all_guards():
-    return list(guards.find().sort("_id", 1))
+    return list(guards.find({}, _LIST_PROJECTION).sort("_id", 1))
+
+def list_guards(projection=None, after=None, limit=None):
+    """Cursor over guards in _id order, starting after `after`."""
+    query = {"_id": {"$gt": after}} if after is not None else {}
+    cursor = guards.find(query, projection or _LIST_PROJECTION).sort("_id", 1)
+    return cursor.limit(limit) if limit else cursor
+
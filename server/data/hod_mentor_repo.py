@@ -54,4 +54,26 @@ def delete_hod_mentor_mappings_for_scope(
     return hod_mentor.delete_many(
         query,
         session=session
-    )
\ No newline at end of file
+    )
+
+def _scopes_query(college, scopes):
+    return {"college": college, "$or": [{"year": y, "course": c} for y, c in scopes]}
+
+
+def get_hod_ids_for_scopes(college: str, scopes):
+    """Distinct hod_ids with mentor mappings in any (year, course) of `scopes`."""
+    return hod_mentor.distinct("hod_id", _scopes_query(college, scopes))
+
+
+def delete_hod_mentor_mappings_for_scopes(hod_ids, college: str, scopes, session=None):
+    if not hod_ids:
+        return None
+    query = _scopes_query(college, scopes)
+    query["hod_id"] = {"$in": list(hod_ids)}
+    return hod_mentor.delete_many(query, session=session)
+
+
+def create_hod_mentor_mappings(docs, session=None):
+    if not docs:
+        return None
+    return hod_mentor.insert_many(docs, session=session)
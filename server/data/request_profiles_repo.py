@@ -0,0 +1,28 @@
+from extensions.mongo import db
+
+request_profiles = db["request_profiles"]
+
+# Listing view leaves out the (large) profiler report
+_SUMMARY_PROJECTION = {"report": 0}
+
+
+def save_profile(doc):
+    # `_id` is generated per profile; insert never overwrites another one
+    return request_profiles.insert_one(doc)
+
+
+def get_profile(profile_id: str):
+    return request_profiles.find_one({"_id": profile_id})
+
+
+def list_profiles(limit: int = 50, path: str = None, request_id: str = None):
+    query = {}
+    if path:
+        query["path"] = path
+    if request_id:
+        query["request_id"] = request_id
+    return list(
+        request_profiles.find(query, _SUMMARY_PROJECTION)
+        .sort("created_at", -1)
+        .limit(limit)
+    )
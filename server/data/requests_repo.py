@@ -1,10 +1,14 @@
 from extensions.mongo import db
 from bson import ObjectId
+from pymongo import ReturnDocument
 from datetime import datetime
 from utils.time_utils import ist_today_range_utc
 
 requests = db["requests"]
 
+# Requests still moving through the approval flow
+ACTIVE_STATUSES = ["REQUESTED", "PENDING_MENTOR", "APPROVED", "PENDING_HOD", "APPROVED_BY_MENTOR"]
+
 # ==========================================================
 # CREATE
 # ==========================================================
@@ -71,6 +75,64 @@ def delete_request(request_id):
     )
 
 
+# ==========================================================
+# SMS OUTBOX (job embedded as `sms_notification` on the request)
+# ==========================================================
+def mark_left_with_notification(request_id, left_time, notification):
+    """
+    APPROVED -> LEFT_CAMPUS and enqueue the parent SMS job in one write.
+    Returns the updated doc, or None if the request is missing / not APPROVED.
+    """
+    try:
+        oid = ObjectId(request_id)
+    except Exception:
+        return None
+    return requests.find_one_and_update(
+        {"_id": oid, "status": "APPROVED"},
+        {"$set": {
+            "status": "LEFT_CAMPUS",
+            "left_time": left_time,
+            "sms_notification": notification
+        }},
+        return_document=ReturnDocument.AFTER
+    )
+
+
+def claim_due_notification(now, lease_until):
+    """
+    Atomically lease one due SMS job. Jobs whose lease expired (worker died
+    mid-send) are picked up again.
+    """
+    return requests.find_one_and_update(
+        {"$or": [
+            {
+                "sms_notification.status": {"$in": ["PENDING", "RETRY"]},
+                "sms_notification.next_attempt_at": {"$lte": now}
+            },
+            {
+                "sms_notification.status": "SENDING",
+                "sms_notification.lease_until": {"$lte": now}
+            }
+        ]},
+        {
+            "$set": {
+                "sms_notification.status": "SENDING",
+                "sms_notification.lease_until": lease_until
+            },
+            "$inc": {"sms_notification.attempts": 1}
+        },
+        sort=[("sms_notification.next_attempt_at", 1)],
+        return_document=ReturnDocument.AFTER
+    )
+
+
+def update_notification(request_id, updates):
+    return requests.update_one(
+        {"_id": ObjectId(request_id)},
+        {"$set": {f"sms_notification.{k}": v for k, v in updates.items()}}
+    )
+
+
 # ==========================================================
 # INTERNAL: AUTO CLEAN (IST SAFE)
 # ==========================================================
@@ -213,12 +275,21 @@ def has_active_request(student_id: str, session=None) -> bool:
     return requests.find_one(
         {
             "student_id": student_id,
-            "status": {"$in": ["REQUESTED", "PENDING_MENTOR", "APPROVED", "PENDING_HOD", "APPROVED_BY_MENTOR"]}
+            "status": {"$in": ACTIVE_STATUSES}
         },
         session=session
     ) is not None
 
 
+def set_active_requests_year(student_ids, year: int, session=None):
+    """Keep the denormalised `year` of in-flight requests in step with a promotion."""
+    return requests.update_many(
+        {"student_id": {"$in": [str(s) for s in student_ids]}, "status": {"$in": ACTIVE_STATUSES}},
+        {"$set": {"year": year}},
+        session=session
+    )
+
+
 # ==========================================================
 # TODAY REQUEST COUNT (IST)
 # ==========================================================
@@ -0,0 +1,277 @@
+"""
+Materialised scope -> faculty lookup tables.
+
+    hod:    (college, year, course)          -> [hod_id, ...]
+    mentor: (college, year, course, section) -> [mentor_id, ...]
+
+One small document per scope lives in `scope_map`; assign_hod_service and
+assign_mentors_service rewrite the scopes they touch, and faculty updates,
+deletes and role changes move or drop that faculty's entries (all inside
+the caller's transaction), bumping the `__meta__` version. Writers call
+`invalidate_scope_map()` once their transaction has committed. Readers keep the whole map as
+an in-process dict and re-check the version at most every
+SCOPE_MAP_CHECK_SECONDS, so a student write resolves its HODs / mentors with
+a dictionary lookup instead of the roles -> user_roles -> faculty scan.
+
+The map is built from the legacy sources (HOD faculty documents,
+student_hod and student_mentor_mapping) on first start, see
+`ensure_scope_map()`.
+"""
+import threading
+import time
+from datetime import datetime
+
+from pymongo import ReplaceOne
+
+from config import Config
+from extensions.mongo import db
+
+scope_map = db["scope_map"]
+
+_META_ID = "__meta__"
+
+
+def _hod_key(college, year, course):
+    return f"hod:{college}:{year}:{course}"
+
+
+def _mentor_key(college, year, course, section):
+    return f"mentor:{college}:{year}:{course}:{section}"
+
+
+# ==========================================================
+# IN-PROCESS SNAPSHOT
+# ==========================================================
+class _Snapshot:
+    def __init__(self):
+        self.version = None
+        self.entries = {}
+        self.checked_at = 0.0
+        self.lock = threading.Lock()
+
+
+_snapshot = _Snapshot()
+
+
+def _current_version():
+    meta = scope_map.find_one({"_id": _META_ID}, {"version": 1})
+    return meta.get("version", 0) if meta else None
+
+
+def _load():
+    entries = {}
+    version = None
+    for doc in scope_map.find({}, {"ids": 1, "version": 1}):
+        if doc["_id"] == _META_ID:
+            version = doc.get("version", 0)
+        else:
+            entries[doc["_id"]] = doc.get("ids", [])
+    return version, entries
+
+
+def _entries():
+    snap = _snapshot
+    now = time.monotonic()
+    if snap.version is not None and now - snap.checked_at < Config.SCOPE_MAP_CHECK_SECONDS:
+        return snap.entries
+    with snap.lock:
+        if snap.version is not None and now - snap.checked_at < Config.SCOPE_MAP_CHECK_SECONDS:
+            return snap.entries
+        version = _current_version()
+        if version is None:
+            ensure_scope_map()
+            version = _current_version()
+        if version != snap.version:
+            snap.version, snap.entries = _load()
+        snap.checked_at = time.monotonic()
+        return snap.entries
+
+
+def invalidate_scope_map():
+    """Force the next lookup in this process to re-check the stored version."""
+    _snapshot.checked_at = 0.0
+
+
+# ==========================================================
+# READ
+# ==========================================================
+def get_hod_ids_for_scope(college: str, year: int, course: str):
+    return list(_entries().get(_hod_key(college, year, course), ()))
+
+
+def get_mentor_ids_for_scope(college: str, year: int, course: str, section: str):
+    return list(_entries().get(_mentor_key(college, year, course, section), ()))
+
+
+def get_mentor_ids_for_year_course(college: str, year: int, course: str):
+    """Mentors of every section of a (college, year, course)."""
+    prefix = _mentor_key(college, year, course, "")
+    ids = set()
+    for key, mentor_ids in _entries().items():
+        if key.startswith(prefix):
+            ids.update(mentor_ids)
+    return list(ids)
+
+
+# ==========================================================
+# WRITE
+# ==========================================================
+def _bump_version(session=None):
+    # No invalidate here: inside a transaction the new version is not
+    # visible to this process' re-check until the caller commits
+    scope_map.update_one(
+        {"_id": _META_ID},
+        {"$inc": {"version": 1}, "$set": {"updated_at": datetime.utcnow()}},
+        upsert=True,
+        session=session
+    )
+
+
+def _set_scope(key, fields, ids, session=None):
+    scope_map.update_one(
+        {"_id": key},
+        {"$set": {**fields, "ids": sorted(set(ids)), "updated_at": datetime.utcnow()}},
+        upsert=True,
+        session=session
+    )
+
+
+def set_hod_scopes(college: str, years, courses, hod_ids, session=None):
+    """Replace the HOD list of every (college, year, course) in years x courses."""
+    for year in years:
+        for course in courses:
+            _set_scope(
+                _hod_key(college, year, course),
+                {"kind": "hod", "college": college, "year": year, "course": course},
+                hod_ids,
+                session=session
+            )
+    _bump_version(session=session)
+
+
+def set_mentor_scope(college: str, year: int, course: str, section: str, mentor_ids, session=None):
+    _set_scope(
+        _mentor_key(college, year, course, section),
+        {"kind": "mentor", "college": college, "year": year, "course": course, "section": section},
+        mentor_ids,
+        session=session
+    )
+    _bump_version(session=session)
+
+
+def _hod_scope_keys(doc):
+    college = doc.get("college")
+    return {
+        _hod_key(college, year, course): {"kind": "hod", "college": college, "year": year, "course": course}
+        for year in doc.get("years") or []
+        for course in doc.get("courses") or []
+    }
+
+
+def remove_faculty_from_scopes(faculty_ids, kind: str = None, session=None):
+    """Drop `faculty_ids` from every scope (of `kind` = "hod" | "mentor", or both)."""
+    ids = list(dict.fromkeys(faculty_ids))
+    if not ids:
+        return 0
+    query = {"ids": {"$in": ids}}
+    if kind:
+        query["kind"] = kind
+    result = scope_map.update_many(
+        query,
+        {"$pull": {"ids": {"$in": ids}}, "$set": {"updated_at": datetime.utcnow()}},
+        session=session
+    )
+    if result.modified_count:
+        _bump_version(session=session)
+    return result.modified_count
+
+
+def move_hod_scopes(hod_id: str, old_doc: dict, new_doc: dict, session=None):
+    """
+    Re-scope a HOD whose faculty document changed college / years / courses:
+    drop it from the scopes it no longer covers (every scope of the old
+    college when the college changed) and add it to the new ones.
+    """
+    old_keys = _hod_scope_keys(old_doc)
+    new_keys = _hod_scope_keys(new_doc)
+    now = datetime.utcnow()
+
+    if old_doc.get("college") != new_doc.get("college"):
+        stale = {"kind": "hod", "college": old_doc.get("college"), "ids": hod_id}
+    else:
+        stale = {"_id": {"$in": [k for k in old_keys if k not in new_keys]}, "ids": hod_id}
+    scope_map.update_many(stale, {"$pull": {"ids": hod_id}, "$set": {"updated_at": now}}, session=session)
+
+    for key, fields in new_keys.items():
+        scope_map.update_one(
+            {"_id": key},
+            {"$set": {**fields, "updated_at": now}, "$addToSet": {"ids": hod_id}},
+            upsert=True,
+            session=session
+        )
+    _bump_version(session=session)
+
+
+# ==========================================================
+# BUILD FROM LEGACY MAPPINGS
+# ==========================================================
+def rebuild_scope_map():
+    """
+    Recompute every scope from the existing data:
+    - HOD scopes: HOD faculty documents (college x years x courses, as
+      register_student used to match them) plus the student_hod groups
+      written by assign_hod_service
+    - mentor scopes: student_mentor_mapping groups
+    """
+    role = db["roles"].find_one({"name": "HOD"})
+    hod_ids = set(db["user_roles"].distinct("user_id", {"role_id": role["_id"]})) if role else set()
+
+    hod_scopes = {}
+    if hod_ids:
+        for h in db["faculty"].find({"_id": {"$in": list(hod_ids)}}, {"college": 1, "years": 1, "courses": 1}):
+            for year in h.get("years") or []:
+                for course in h.get("courses") or []:
+                    hod_scopes.setdefault((h.get("college"), year, course), set()).add(h["_id"])
+        for g in db["student_hod"].aggregate([
+            {"$match": {"hod_id": {"$in": list(hod_ids)}}},
+            {"$group": {"_id": {"college": "$college", "year": "$year", "course": "$course"},
+                        "ids": {"$addToSet": "$hod_id"}}}
+        ]):
+            key = (g["_id"]["college"], g["_id"]["year"], g["_id"]["course"])
+            hod_scopes.setdefault(key, set()).update(g["ids"])
+
+    mentor_scopes = {}
+    for g in db["student_mentor_mapping"].aggregate([
+        {"$group": {"_id": {"college": "$college", "year": "$year", "course": "$course", "section": "$section"},
+                    "ids": {"$addToSet": "$mentor_id"}}}
+    ]):
+        s = g["_id"]
+        mentor_scopes[(s["college"], s["year"], s["course"], s["section"])] = set(g["ids"])
+
+    now = datetime.utcnow()
+    docs = [
+        {"_id": _hod_key(c, y, co), "kind": "hod", "college": c, "year": y, "course": co,
+         "ids": sorted(ids), "updated_at": now}
+        for (c, y, co), ids in hod_scopes.items()
+    ] + [
+        {"_id": _mentor_key(c, y, co, se), "kind": "mentor", "college": c, "year": y, "course": co,
+         "section": se, "ids": sorted(ids), "updated_at": now}
+        for (c, y, co, se), ids in mentor_scopes.items()
+    ]
+
+    # Upsert + prune rather than delete + insert: several workers may run
+    # this concurrently on first start
+    if docs:
+        scope_map.bulk_write([ReplaceOne({"_id": d["_id"]}, d, upsert=True) for d in docs], ordered=False)
+    scope_map.delete_many({"_id": {"$nin": [d["_id"] for d in docs] + [_META_ID]}})
+    _bump_version()
+    invalidate_scope_map()
+    return {"hod_scopes": len(hod_scopes), "mentor_scopes": len(mentor_scopes)}
+
+
+def ensure_scope_map():
+    """Build the map once if it has never been built (no `__meta__` doc)."""
+    if scope_map.find_one({"_id": _META_ID}, {"_id": 1}) is None:
+        counts = rebuild_scope_map()
+        print(f"[SCOPE MAP] built {counts}")
+
@@ -1,3 +1,4 @@
+from pymongo import UpdateOne, DeleteMany
 from extensions.mongo import db
 
 student_hod = db["student_hod"]
@@ -40,6 +41,15 @@ def get_students_for_hod(hod_id: str):
     return list(student_hod.find({"hod_id": hod_id}))
 
 
+def get_student_ids_for_hod(hod_id: str):
+    """Student ids under a HOD: faculty read model, else the mapping collection."""
+    from data.faculty_read_model_repo import get_faculty_read_model, student_ids_from
+    ids = student_ids_from(get_faculty_read_model(hod_id), "hod")
+    if ids is not None:
+        return ids
+    return student_hod.distinct("student_id", {"hod_id": hod_id})
+
+
 # ==========================================================
 # DELETE
 # ==========================================================
@@ -63,7 +73,12 @@ def delete_hod_mappings(hod_id, year, course, college, session=None):
 
 # data/student_hod_repo.py
 def get_hod_assignments(hod_id):
+    from data.faculty_read_model_repo import get_faculty_read_model, scopes_from
+    scopes = scopes_from(get_faculty_read_model(hod_id), "hod")
+    if scopes is not None:
+        return scopes
     return student_hod.aggregate([
+        {"$match": {"hod_id": hod_id}},
         {
             "$group": {
                 "_id": {
@@ -110,3 +125,57 @@ def delete_hod_mappings_for_scope(
         query,
         session=session
     )
+
+
+# ==========================================================
+# SET-BASED (assign_hod_service)
+# ==========================================================
+def _scopes_query(college, scopes):
+    return {"college": college, "$or": [{"year": y, "course": c} for y, c in scopes]}
+
+
+def get_hod_ids_for_scopes(college: str, scopes):
+    """Distinct hod_ids mapped in any (year, course) of `scopes`."""
+    return student_hod.distinct("hod_id", _scopes_query(college, scopes))
+
+
+def bulk_map_students_to_hod(student_ids, hod_id: str, college: str, year: int, course: str, session=None):
+    """
+    Point every student in `student_ids` at `hod_id` with one bulk_write.
+    Upserts on student_id (unique), so a previous HOD's mapping is replaced.
+    """
+    if not student_ids:
+        return None
+    ops = [
+        UpdateOne(
+            {"student_id": sid},
+            {"$set": {"student_id": sid, "hod_id": hod_id, "year": year, "course": course, "college": college}},
+            upsert=True
+        )
+        for sid in student_ids
+    ]
+    return student_hod.bulk_write(ops, ordered=False, session=session)
+
+
+def delete_hod_mappings_for_scopes(hod_ids, college: str, scopes, session=None):
+    if not hod_ids:
+        return None
+    query = _scopes_query(college, scopes)
+    query["hod_id"] = {"$in": list(hod_ids)}
+    return student_hod.delete_many(query, session=session)
+
+
+def bulk_set_student_hods(assignments, session=None):
+    """
+    `assignments`: [{student_id, hod_id, college, year, course}]; hod_id None
+    removes the student's mapping. One bulk_write.
+    """
+    ops = []
+    for a in assignments:
+        if a["hod_id"] is None:
+            ops.append(DeleteMany({"student_id": a["student_id"]}))
+        else:
+            ops.append(UpdateOne({"student_id": a["student_id"]}, {"$set": dict(a)}, upsert=True))
+    if not ops:
+        return None
+    return student_hod.bulk_write(ops, ordered=False, session=session)
@@ -82,6 +82,10 @@ def get_students_for_mentor(mentor_id: str):
     Returns list of student_ids mapped to a mentor
     Used by mentor request approval flow
     """
+    from data.faculty_read_model_repo import get_faculty_read_model, student_ids_from
+    ids = student_ids_from(get_faculty_read_model(mentor_id), "mentor")
+    if ids is not None:
+        return ids
     results = student_mentor.distinct(
         "student_id",
         {"mentor_id": mentor_id}
@@ -94,6 +98,15 @@ def get_mentors_for_hod_scope(hod_id: str):
     Returns mentor_ids assigned to the same (college, year, course) as the HOD's student_hod mappings.
     Used for HOD filter options - only mentors in their scope.
     """
+    from data.faculty_read_model_repo import get_faculty_read_model, scopes_from
+    from data.scope_map_repo import get_mentor_ids_for_year_course
+    scopes = scopes_from(get_faculty_read_model(hod_id), "hod")
+    if scopes is not None:
+        mentor_ids = set()
+        for sc in scopes:
+            mentor_ids.update(str(m) for m in get_mentor_ids_for_year_course(sc["college"], sc["year"], sc["course"]))
+        return list(mentor_ids)
+
     from data.student_hod_repo import get_hod_assignments
     assignments = list(get_hod_assignments(hod_id))
     if not assignments:
@@ -111,3 +124,57 @@ def get_mentors_for_hod_scope(hod_id: str):
         )
         mentor_ids.update(str(m) for m in mids)
     return list(mentor_ids)
+
+
+def get_mentor_ids_by_year_course(college: str, scopes):
+    """{(year, course): [mentor_id, ...]} for every (year, course) in `scopes`, one aggregation."""
+    pipeline = [
+        {"$match": {"college": college, "$or": [{"year": y, "course": c} for y, c in scopes]}},
+        {"$group": {"_id": {"year": "$year", "course": "$course"}, "mentor_ids": {"$addToSet": "$mentor_id"}}}
+    ]
+    return {
+        (g["_id"]["year"], g["_id"]["course"]): g["mentor_ids"]
+        for g in student_mentor.aggregate(pipeline)
+    }
+
+
+def get_mentor_pairs_for_students(student_ids):
+    """Existing (student_id, mentor_id) pairs plus mapping scope fields."""
+    return list(student_mentor.find(
+        {"student_id": {"$in": student_ids}},
+        {"_id": 0, "student_id": 1, "mentor_id": 1, "college": 1, "year": 1, "course": 1, "section": 1}
+    ))
+
+
+def delete_mentor_mappings_except(student_ids, keep_mentor_ids, session=None):
+    """Remove mappings of `student_ids` to any mentor not in `keep_mentor_ids`."""
+    return student_mentor.delete_many(
+        {"student_id": {"$in": student_ids}, "mentor_id": {"$nin": list(keep_mentor_ids)}},
+        session=session
+    )
+
+
+def update_mentor_mapping_scope(student_ids, mentor_ids, college: str, year: int, course: str, section: str, session=None):
+    """Refresh scope fields of kept mappings whose (college, year, course, section) changed."""
+    return student_mentor.update_many(
+        {
+            "student_id": {"$in": student_ids},
+            "mentor_id": {"$in": list(mentor_ids)},
+            "$or": [
+                {"college": {"$ne": college}},
+                {"year": {"$ne": year}},
+                {"course": {"$ne": course}},
+                {"section": {"$ne": section}}
+            ]
+        },
+        {"$set": {"college": college, "year": year, "course": course, "section": section}},
+        session=session
+    )
+
+
+def get_mentors_with_other_mappings(mentor_ids, exclude_student_ids):
+    """Mentors in `mentor_ids` that still mentor someone outside `exclude_student_ids`."""
+    return student_mentor.distinct(
+        "mentor_id",
+        {"mentor_id": {"$in": list(mentor_ids)}, "student_id": {"$nin": exclude_student_ids}}
+    )
@@ -33,8 +33,11 @@ def delete_student(student_id: str, session=None):
         session=session
     )
 
+LIST_HIDDEN_FIELDS = ("password_hash",)
+_LIST_PROJECTION = {f: 0 for f in LIST_HIDDEN_FIELDS}
+
 def get_all_students():
-    return list(students.find({}).sort("_id", 1))
+    return list(students.find({}, _LIST_PROJECTION).sort("_id", 1))
 
 def delete_students_by_year_and_college_repo(year: str, college: str, session=None):
     return students.delete_many(
@@ -45,16 +48,17 @@ def delete_students_by_year_and_college_repo(year: str, college: str, session=No
 def get_students_by_year_and_college(year: str, college: str):
     return list(students.find({"year": year, "college": college}).sort("_id", 1))
 
-def promote_students_year_repo(year: str, college: str, new_year: str, session=None):
-    return students.update_many(
-        {"year": year, "college": college},
-        {"$set": {"year": new_year}},
-        session=session
-    )
-
 def filter_students(filters: dict):
     query = {k: v for k, v in filters.items() if v is not None}
-    return list(students.find(query).sort("_id", 1))
+    return list(students.find(query, _LIST_PROJECTION).sort("_id", 1))
+
+def list_students(filters: dict, projection=None, after=None, limit=None):
+    """Cursor over matching students in _id order, starting after `after`."""
+    query = {k: v for k, v in filters.items() if v is not None}
+    if after is not None:
+        query["_id"] = {"$gt": after}
+    cursor = students.find(query, projection or _LIST_PROJECTION).sort("_id", 1)
+    return cursor.limit(limit) if limit else cursor
 
 
 def get_students_by_college_year_course_section(
@@ -74,4 +78,49 @@ def get_students_by_college_year_course_section(
             "course": course,
             "section": section
         }).sort("_id", 1)
-    )
\ No newline at end of file
+    )
+
+def count_students_in_scopes(college: str, scopes):
+    """Students in any (year, course) of `scopes`."""
+    return students.count_documents({"college": college, "$or": [{"year": y, "course": c} for y, c in scopes]})
+
+
+def iter_student_batches(query: dict, batch_size: int, after_id=None, projection=None):
+    """
+    Yield lists of student documents matching `query` in _id order,
+    `batch_size` at a time. `after_id` resumes after a previously processed id.
+    """
+    if after_id is not None:
+        query = {**query, "_id": {"$gt": after_id}}
+    batch = []
+    for doc in students.find(query, projection or {"_id": 1}).sort("_id", 1).batch_size(batch_size):
+        batch.append(doc)
+        if len(batch) >= batch_size:
+            yield batch
+            batch = []
+    if batch:
+        yield batch
+
+
+def iter_student_id_batches(query: dict, batch_size: int, after_id=None):
+    """`iter_student_batches`, ids only."""
+    for batch in iter_student_batches(query, batch_size, after_id=after_id):
+        yield [d["_id"] for d in batch]
+
+
+def get_student_ids_by_college_year_course_section(college: str, year: int, course: str, section: str):
+    """Only the _ids of a section, in roll order."""
+    return [
+        d["_id"] for d in students.find(
+            {"college": college, "year": year, "course": course, "section": section},
+            {"_id": 1}
+        ).sort("_id", 1)
+    ]
+
+
+def promote_students_by_ids(student_ids, year: int, new_year: int, session=None):
+    return students.update_many(
+        {"_id": {"$in": student_ids}, "year": year},
+        {"$set": {"year": new_year}},
+        session=session
+    )
@@ -1,3 +1,4 @@
+from pymongo import UpdateOne
 from extensions.mongo import db
 
 user_roles = db["user_roles"]
@@ -24,3 +25,29 @@ def delete_specific_role(user_id: str, role_id: str, session=None):
         {"user_id": user_id, "role_id": role_id},
         session=session
     )
+
+
+def get_role_ids_for_users(user_ids):
+    """{user_id: role_id} for the given users (one query)."""
+    return {
+        r["user_id"]: r["role_id"]
+        for r in user_roles.find({"user_id": {"$in": list(user_ids)}}, {"user_id": 1, "role_id": 1})
+    }
+
+
+def set_roles_bulk(role_by_user: dict, session=None):
+    """
+    Set each user's (single) role in one bulk_write. Same effect as
+    `delete_specific_role` + `assign_role` per user.
+    """
+    if not role_by_user:
+        return None
+    ops = [
+        UpdateOne(
+            {"user_id": user_id},
+            {"$set": {"user_id": user_id, "role_id": role_id}},
+            upsert=True
+        )
+        for user_id, role_id in role_by_user.items()
+    ]
+    return user_roles.bulk_write(ops, ordered=False, session=session)
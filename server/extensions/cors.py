@@ -11,6 +11,7 @@ def init_cors(app):
             allow_credentials=True,
             allow_methods=["GET", "POST", "PUT", "DELETE"],
             allow_headers=["Authorization", "Content-Type"],
+            expose_headers=["X-Next-Cursor"],  # list pagination (core/listing.py)
         )
     else:
         app.add_middleware(
@@ -19,4 +20,5 @@ def init_cors(app):
             allow_credentials=True,
             allow_methods=["*"],
             allow_headers=["*"],
+            expose_headers=["X-Next-Cursor"],
         )
@@ -1,10 +1,10 @@
 
-from pymongo import MongoClient
+from pymongo import MongoClient, AsyncMongoClient
 from config import Config
+from utils.db_monitor import command_tracker
 
 # Optimize connection pool for 10k users
-client = MongoClient(
-	Config.MONGO_URI,
+_POOL_OPTIONS = dict(
 	maxPoolSize=100,  # Max concurrent connections
 	minPoolSize=10,   # Keep connections warm
 	maxIdleTimeMS=45000,  # Close idle connections after 45s
@@ -13,11 +13,20 @@ client = MongoClient(
 	socketTimeoutMS=20000,
 	retryWrites=True,
 	w="majority",  # Write concern for durability
-	readPreference="primary"  # Read from primary, fallback to secondary
+	readPreference="primary",  # Read from primary, fallback to secondary
+	event_listeners=[command_tracker]  # Per-request command counts (utils/db_monitor.py)
 )
 
+client = MongoClient(Config.MONGO_URI, **_POOL_OPTIONS)
+
 db = client["faceAuthDB"]
 
+# Async client for `async def` routes (data/aio). It has its own pool, so
+# async handlers are bounded by connections rather than threadpool size.
+async_client = AsyncMongoClient(Config.MONGO_URI, **_POOL_OPTIONS)
+
+async_db = async_client["faceAuthDB"]
+
 # Health check function
 def check_db_connection():
 	try:
@@ -25,3 +34,11 @@ def check_db_connection():
 		return True
 	except Exception:
 		return False
+
+
+async def check_db_connection_async():
+	try:
+		await async_client.admin.command('ping')
+		return True
+	except Exception:
+		return False
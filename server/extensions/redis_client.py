@@ -0,0 +1,35 @@
+# extensions/redis_client.py
+from config import Config
+
+_client = None
+
+
+def get_redis_client():
+    """
+    Shared Redis connection pool, created on first use.
+
+    `redis` is only imported when a Redis-backed feature is enabled so
+    deployments without Redis never need the package or a server.
+    """
+    global _client
+    if _client is None:
+        import redis
+
+        _client = redis.Redis(
+            host=Config.REDIS_HOST,
+            port=Config.REDIS_PORT,
+            db=Config.REDIS_DB,
+            decode_responses=True,
+            max_connections=50,
+            socket_connect_timeout=2,
+            socket_timeout=2
+        )
+    return _client
+
+
+# Health check function
+def check_redis_connection():
+    try:
+        return bool(get_redis_client().ping())
+    except Exception:
+        return False
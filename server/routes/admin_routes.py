@@ -1,5 +1,6 @@
 from fastapi import APIRouter, Depends, HTTPException,Request
 from security.dependencies import require_roles
+from core.listing import ListParams, list_params
 from schemas.api_request_models import AdminCreateRequest, AdminUpdateRequest
 from services.admin_service import (
     register_admin,
@@ -13,8 +14,11 @@ from services.admin_service import (
 router = APIRouter(prefix="/admin", tags=["Admin"])
 
 @router.get("/list/all") # Put static routes ABOVE dynamic {admin_id}
-def get_all_route(_=Depends(require_roles("SUPER_ADMIN", "ADMIN"))):
-    return get_all_admins_service()
+def get_all_route(
+    params: ListParams = Depends(list_params),
+    _=Depends(require_roles("SUPER_ADMIN", "ADMIN"))
+):
+    return get_all_admins_service(params)
 
 @router.get("/{admin_id}") # Dynamic route
 def get_admin_profile(admin_id: str):
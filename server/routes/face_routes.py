@@ -1,4 +1,5 @@
 from fastapi import APIRouter, Depends, Request
+from starlette.concurrency import run_in_threadpool
 from security.dependencies import require_roles
 from services.face_service import (
     verify_then_replace_face,
@@ -11,6 +12,7 @@ from schemas.api_request_models import (
     FaceValidateRequest
 )
 from core.global_response import success
+from core.uploads import read_image_upload
 
 # Rate Limiting
 from slowapi.util import get_remote_address
@@ -37,11 +39,15 @@ def register_face_route(request: Request,
     Enforces:
     - Exactly one face
     - No duplicate faces globally
+
+    Pass `face_token` from /face/validate instead of `image_b64`
+    to skip a second decode + inference.
     """
     verify_then_replace_face(
         user_id=payload.user_id,
         user_type=payload.user_type,
-        b64=payload.image_b64
+        b64=payload.image_b64,
+        face_token=payload.face_token
     )
 
     return success("Face registered successfully")
@@ -76,14 +82,23 @@ def verify_face_route(request: Request,
 # ==========================================================
 @router.post("/validate")
 @limiter.limit("10/minute")
-def validate_face_route(request: Request, payload: FaceValidateRequest):
+def validate_face_route(request: Request,
+    payload: FaceValidateRequest,
+    caller_id=Depends(require_roles("STUDENT", "HOD", "GUARD", "ADMIN", "SUPER_ADMIN"))
+):
     """
     Validates face quality before registration.
     Ensures:
     - Exactly one face
-    - No global duplicate
+    - No duplicate of another user's face
+
+    The returned token can only be redeemed for `user_id` (default: caller).
     """
-    ok, token = validate_and_cache_face(payload.image_b64)
+    ok, token = validate_and_cache_face(
+        payload.image_b64,
+        user_id=payload.user_id or caller_id,
+        issued_by=caller_id
+    )
     return success("Face validated", {"face_token": token})
 
 
@@ -102,7 +117,84 @@ def verify_and_replace_face_route(request: Request,
     verify_then_replace_face(
         user_id=payload.user_id,
         user_type=payload.user_type,
-        b64=payload.image_b64
+        b64=payload.image_b64,
+        face_token=payload.face_token
+    )
+
+    return success("Face biometric updated successfully")
+
+
+
+# ==========================================================
+# 5. BINARY / MULTIPART UPLOAD VARIANTS
+# ==========================================================
+# Same behaviour as the JSON routes above, but the image is sent as a
+# multipart field named "image" or as a raw image/* body. Skipping
+# base64-in-JSON avoids two full copies of the upload per request.
+
+@router.post("/register/upload")
+@limiter.limit("5/minute")
+async def register_face_upload_route(request: Request,
+    user_id: str,
+    user_type: str,
+    _=Depends(require_roles("STUDENT", "HOD", "GUARD", "ADMIN", "SUPER_ADMIN"))
+):
+    image_bytes = await read_image_upload(request)
+    await run_in_threadpool(
+        verify_then_replace_face,
+        user_id=user_id,
+        user_type=user_type,
+        image_bytes=image_bytes
+    )
+    return success("Face registered successfully")
+
+
+@router.post("/verify/upload")
+@limiter.limit("10/minute")
+async def verify_face_upload_route(request: Request,
+    user_id: str,
+    _=Depends(require_roles("STUDENT", "HOD", "GUARD", "ADMIN", "SUPER_ADMIN"))
+):
+    image_bytes = await read_image_upload(request)
+    ok, score = await run_in_threadpool(
+        verify_face_for_user,
+        user_id=user_id,
+        image_bytes=image_bytes
+    )
+    return success(
+        "Face verified" if ok else "Face mismatch",
+        {"verified": ok, "score": score}
+    )
+
+
+@router.post("/validate/upload")
+@limiter.limit("10/minute")
+async def validate_face_upload_route(request: Request,
+    user_id: str = None,
+    caller_id=Depends(require_roles("STUDENT", "HOD", "GUARD", "ADMIN", "SUPER_ADMIN"))
+):
+    image_bytes = await read_image_upload(request)
+    ok, token = await run_in_threadpool(
+        validate_and_cache_face,
+        image_bytes=image_bytes,
+        user_id=user_id or caller_id,
+        issued_by=caller_id
     )
+    return success("Face validated", {"face_token": token})
 
+
+@router.post("/verify-replace/upload")
+@limiter.limit("5/minute")
+async def verify_and_replace_face_upload_route(request: Request,
+    user_id: str,
+    user_type: str,
+    _=Depends(require_roles("STUDENT", "HOD", "GUARD", "ADMIN", "SUPER_ADMIN"))
+):
+    image_bytes = await read_image_upload(request)
+    await run_in_threadpool(
+        verify_then_replace_face,
+        user_id=user_id,
+        user_type=user_type,
+        image_bytes=image_bytes
+    )
     return success("Face biometric updated successfully")
@@ -1,5 +1,6 @@
 from fastapi import APIRouter, Depends
 from security.dependencies import require_roles
+from core.listing import ListParams, list_params
 from services.faculty_service import (
     register_faculty,
     update_faculty_service,
@@ -90,9 +91,10 @@ def delete_faculty(
 # ==================================================
 @router.get("/")
 def get_all_faculty(
+    params: ListParams = Depends(list_params),
     _=Depends(require_roles("ADMIN", "SUPER_ADMIN"))
 ):
-    return service_get_all_faculty()
+    return service_get_all_faculty(params)
 
 
 # ==================================================
@@ -101,9 +103,10 @@ def get_all_faculty(
 @router.get("/college/{college}")
 def get_faculty_college(
     college: str,
+    params: ListParams = Depends(list_params),
     _=Depends(require_roles("ADMIN", "SUPER_ADMIN", "HOD"))
 ):
-    return service_get_faculty_by_college(college)
+    return service_get_faculty_by_college(college, params)
 
 
 # ==================================================
@@ -112,6 +115,7 @@ def get_faculty_college(
 @router.post("/filter")
 def filter_faculty(
     payload: FacultyFilterRequest,
+    params: ListParams = Depends(list_params),
     _=Depends(require_roles("ADMIN", "SUPER_ADMIN"))
 ):
-    return filter_faculty_service(payload.dict(exclude_unset=True))
+    return filter_faculty_service(payload.dict(exclude_unset=True), params)
@@ -16,6 +16,8 @@ from services.guard_service import (
 from security.dependencies import require_roles
 from schemas.api_request_models import GuardCreateRequest, GuardUpdateRequest
 from core.global_response import success # Added success import
+from core.query_budget import query_budget
+from core.listing import ListParams, list_params
 
 router = APIRouter(prefix="/guard", tags=["Guard"])
 
@@ -65,5 +67,9 @@ def delete_guard(guard_id: str, _=Depends(require_roles("SUPER_ADMIN", "ADMIN"))
 # GET ALL GUARDS
 # ==========================================================
 @router.get("/")
-def get_all_guards(_=Depends(require_roles("ADMIN", "SUPER_ADMIN"))):
-    return service_get_all_guards()
\ No newline at end of file
+@query_budget(5)
+def get_all_guards(
+    params: ListParams = Depends(list_params),
+    _=Depends(require_roles("ADMIN", "SUPER_ADMIN"))
+):
+    return service_get_all_guards(params)
\ No newline at end of file
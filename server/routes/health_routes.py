@@ -0,0 +1,79 @@
+import asyncio
+import os
+import time
+
+from anyio import to_thread
+from fastapi import APIRouter
+from fastapi.responses import JSONResponse
+
+from config import Config
+from extensions.mongo import async_client
+from services.face_model import model_manager
+from services.face_service import inference_load
+
+router = APIRouter(prefix="/health", tags=["Health"])
+
+_STARTED_AT = time.time()
+
+
+# ==========================================================
+# LIVENESS: the process is up and the event loop responds
+# ==========================================================
+@router.get("/live")
+async def live():
+    return {
+        "status": "ok",
+        "pid": os.getpid(),
+        "uptime_seconds": round(time.time() - _STARTED_AT, 1)
+    }
+
+
+# ==========================================================
+# READINESS: safe to route gate traffic to this worker
+# ==========================================================
+async def _check_mongo():
+    started = time.perf_counter()
+    try:
+        await asyncio.wait_for(async_client.admin.command("ping"), timeout=2)
+        return {"ok": True, "rtt_ms": round((time.perf_counter() - started) * 1000, 2)}
+    except Exception as e:
+        return {"ok": False, "error": str(e) or type(e).__name__}
+
+
+async def _check_redis():
+    # Only a dependency when one of the shared backends is switched on
+    if "redis" not in (Config.CACHE_BACKEND, Config.FACE_TOKEN_BACKEND):
+        return {"ok": True, "required": False}
+    from extensions.redis_client import check_redis_connection
+    started = time.perf_counter()
+    ok = await asyncio.to_thread(check_redis_connection)
+    return {"ok": ok, "required": True, "rtt_ms": round((time.perf_counter() - started) * 1000, 2)}
+
+
+def _check_load():
+    load = inference_load()
+    limiter = to_thread.current_default_thread_limiter()
+    load["threadpool_busy"] = limiter.borrowed_tokens
+    load["threadpool_size"] = int(limiter.total_tokens)
+    load["ok"] = load["waiting"] < Config.HEALTH_MAX_INFERENCE_WAITING
+    return load
+
+
+@router.get("/ready")
+async def ready():
+    # With FACE_MODEL_WARMUP_ON_STARTUP off (or after a failed load) nothing
+    # else starts the load: a balancer gated on this probe never sends the
+    # face request that would, so the probe kicks it off / retries it itself
+    model_manager.ensure_loading()
+
+    mongo, redis = await asyncio.gather(_check_mongo(), _check_redis())
+    model = model_manager.status()
+    model["ok"] = model_manager.is_ready()
+    load = _check_load()
+
+    checks = {"model": model, "mongo": mongo, "redis": redis, "load": load}
+    is_ready = all(c["ok"] for c in checks.values())
+    return JSONResponse(
+        status_code=200 if is_ready else 503,
+        content={"status": "ready" if is_ready else "not_ready", "checks": checks}
+    )
@@ -7,8 +7,8 @@ from schemas.api_request_models import AssignHODRequest
 router = APIRouter(prefix="/hod", tags=["HOD Assignment"])
 
 @router.post("/assign")
-def assign_hod(payload : AssignHODRequest, _=Depends(require_roles("ADMIN", "SUPER_ADMIN"))):
-    return assign_hod_service(payload)
+def assign_hod(payload : AssignHODRequest, user_id=Depends(require_roles("ADMIN", "SUPER_ADMIN"))):
+    return assign_hod_service(payload, created_by=user_id)
 
 # @router.delete("/remove/{faculty_id}")
 # def remove_hod(faculty_id: str, _=Depends(require_roles("ADMIN", "SUPER_ADMIN"))):
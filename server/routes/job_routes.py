@@ -0,0 +1,31 @@
+from fastapi import APIRouter, Depends, HTTPException, Query
+
+from core.global_response import success
+from data.background_jobs_repo import get_job, list_jobs
+from security.dependencies import require_roles
+
+router = APIRouter(prefix="/jobs", tags=["Background Jobs"])
+
+
+# ==========================================================
+# RECENT JOBS
+# ==========================================================
+@router.get("")
+def recent_jobs(
+    type: str = None,
+    status: str = None,
+    limit: int = Query(50, ge=1, le=500),
+    _=Depends(require_roles("ADMIN", "SUPER_ADMIN"))
+):
+    return success("Background jobs", list_jobs(job_type=type, status=status, limit=limit))
+
+
+# ==========================================================
+# ONE JOB (status + progress)
+# ==========================================================
+@router.get("/{job_id}")
+def job_status(job_id: str, _=Depends(require_roles("ADMIN", "SUPER_ADMIN"))):
+    job = get_job(job_id)
+    if not job:
+        raise HTTPException(404, "Job not found")
+    return success("Background job", job)
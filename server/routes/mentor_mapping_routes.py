@@ -14,8 +14,7 @@ def assign_mentors(
     payload: MentorMappingRequest,
     _=Depends(require_roles("ADMIN", "SUPER_ADMIN", "HOD"))
 ):
-    assign_mentors_service(payload)
-    return {"message": "Mentors mapped and roles updated successfully"}
+    return assign_mentors_service(payload)
 
 @router.get("/all")
 def get_all_mappings(
@@ -0,0 +1,46 @@
+from fastapi import APIRouter, Depends, HTTPException, Query
+
+from core.global_response import success
+from core.query_budget import get_query_report, reset_query_report
+from data.request_profiles_repo import get_profile, list_profiles
+from security.dependencies import require_roles
+
+router = APIRouter(prefix="/profiles", tags=["Profiling"])
+
+
+# ==========================================================
+# RECENT PROFILES (summary only)
+# ==========================================================
+@router.get("")
+def recent_profiles(
+    limit: int = Query(50, ge=1, le=500),
+    path: str = None,
+    request_id: str = Query(None, description="X-Request-ID of the profiled request"),
+    _=Depends(require_roles("SUPER_ADMIN"))
+):
+    return success("Request profiles", list_profiles(limit=limit, path=path, request_id=request_id))
+
+
+# ==========================================================
+# MONGO COMMANDS PER ENDPOINT (since worker start / reset)
+# ==========================================================
+@router.get("/query-report")
+def query_report(_=Depends(require_roles("SUPER_ADMIN"))):
+    return success("Query report", get_query_report())
+
+
+@router.delete("/query-report")
+def clear_query_report(_=Depends(require_roles("SUPER_ADMIN"))):
+    reset_query_report()
+    return success("Query report cleared")
+
+
+# ==========================================================
+# ONE PROFILE BY X-Profile-Id
+# ==========================================================
+@router.get("/{profile_id}")
+def profile_by_id(profile_id: str, _=Depends(require_roles("SUPER_ADMIN"))):
+    doc = get_profile(profile_id)
+    if not doc:
+        raise HTTPException(404, "Profile not found")
+    return success("Request profile", doc)
@@ -8,20 +8,21 @@ from services.request_service import (
     service_get_hod_pending_requests,
     service_delete_requested_request,
     mark_left,
-    service_get_student_requests,
-    service_get_hod_requests,
-    service_get_guard_approved_requests,
-    service_get_all_requests,
-    service_get_todays_approved,
-    service_get_student_todays_requests,
     service_get_mentor_pending_requests,
     service_get_mentor_todays_requests,
     mentor_approve_request,
     mentor_reject_request,
     service_filter_requests,
+    service_get_student_requests_async,
+    service_get_hod_requests_async,
+    service_get_all_requests_async,
+    service_get_todays_approved_async,
+    service_get_student_todays_requests_async,
+    service_get_guard_approved_requests_async,
 )
 
 from security.dependencies import require_roles, get_current_user_and_role
+from core.query_budget import query_budget
 from services.sms_service import send_sms
 from schemas.api_request_models import (
     RequestCreate,
@@ -52,22 +53,22 @@ def create_request(request: Request, payload: RequestCreate, _=Depends(require_r
 
 
 @router.get("/student/{student_id}")
-def student_reqs(student_id: str, _=Depends(require_roles("STUDENT"))):
-    return service_get_student_requests(student_id)
+async def student_reqs(student_id: str, _=Depends(require_roles("STUDENT"))):
+    return await service_get_student_requests_async(student_id)
 
 
 @router.get("/student/history/{student_id}")
-def student_history_for_staff(student_id: str, _=Depends(require_roles("MENTOR", "HOD", "ADMIN"))):
+async def student_history_for_staff(student_id: str, _=Depends(require_roles("MENTOR", "HOD", "ADMIN"))):
     """Allow MENTOR/HOD/ADMIN to fetch a student's request history."""
-    return service_get_student_requests(student_id)
+    return await service_get_student_requests_async(student_id)
 
 
 @router.get("/student/today/{student_id}")
-def student_todays_reqs(
+async def student_todays_reqs(
     student_id: str,
     _=Depends(require_roles("STUDENT"))
 ):
-    return service_get_student_todays_requests(student_id)
+    return await service_get_student_todays_requests_async(student_id)
 
 
 @router.delete("/{req_id}")
@@ -81,6 +82,7 @@ def delete_requested_request(
 # MENTOR
 # ==================================================
 @router.get("/mentor/pending/{mentor_id}")
+@query_budget(10)
 def mentor_pending_requests(
     mentor_id: str,
     _=Depends(require_roles("MENTOR"))
@@ -131,6 +133,7 @@ def mentor_reject(
 # HOD
 # ==================================================
 @router.get("/hod/pending/{hod_id}")
+@query_budget(10)
 def hod_pending_requests(
     hod_id: str,
     _=Depends(require_roles("HOD"))
@@ -139,8 +142,8 @@ def hod_pending_requests(
 
 
 @router.get("/hod/{hod_id}")
-def hod_reqs(hod_id: str, _=Depends(require_roles("HOD"))):
-    return service_get_hod_requests(hod_id)
+async def hod_reqs(hod_id: str, _=Depends(require_roles("HOD"))):
+    return await service_get_hod_requests_async(hod_id)
 
 
 @router.post("/{req_id}/approve")
@@ -169,16 +172,17 @@ def left(req_id: str, _=Depends(require_roles("GUARD"))):
 
 
 @router.get("/guard/approved/{college}")
-def guard_approved_requests(
+async def guard_approved_requests(
     college: str,
     _=Depends(require_roles("GUARD"))
 ):
-    return service_get_guard_approved_requests(college)
+    return await service_get_guard_approved_requests_async(college)
 
 # ==================================================
 # ADMIN / CUSTOM VIEW (ALL ROLES: ADMIN, SUPER_ADMIN, HOD, MENTOR)
 # ==================================================
 @router.get("/filter-options")
+@query_budget(10)
 def filter_options(user_and_role=Depends(get_current_user_and_role)):
     """Filter options (HODs, Mentors) for Custom View filter UI."""
     user_id, role_name = user_and_role
@@ -188,6 +192,7 @@ def filter_options(user_and_role=Depends(get_current_user_and_role)):
 
 
 @router.post("/filter")
+@query_budget(10)
 def filter_requests(
     payload: RequestFilterBody,
     user_and_role=Depends(get_current_user_and_role),
@@ -204,13 +209,13 @@ def filter_requests(
 # ADMIN
 # ==================================================
 @router.get("/all")
-def all_requests(_=Depends(require_roles("ADMIN"))):
-    return service_get_all_requests()
+async def all_requests(_=Depends(require_roles("ADMIN"))):
+    return await service_get_all_requests_async()
 
 
 @router.get("/approved/today")
-def today(_=Depends(require_roles("ADMIN"))):
-    return service_get_todays_approved()
+async def today(_=Depends(require_roles("ADMIN"))):
+    return await service_get_todays_approved_async()
 
 
 @router.get("/debug/mentor/{mentor_id}")
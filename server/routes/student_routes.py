@@ -1,4 +1,5 @@
-from fastapi import APIRouter, Depends
+from fastapi import APIRouter, Depends, File, UploadFile
+from starlette.concurrency import run_in_threadpool
 from security.dependencies import require_roles
 from services.student_service import (
     register_student,
@@ -9,6 +10,10 @@ from services.student_service import (
     get_student_service,
     register_student_face_service
 )
+from services.student_import_service import import_students_service
+from core.uploads import read_image_upload
+from core.query_budget import query_budget
+from core.listing import ListParams, list_params
 from schemas.api_request_models import (
     StudentCreateRequest,
     StudentSelfUpdateRequest,
@@ -25,6 +30,7 @@ router = APIRouter(prefix="/student", tags=["Student"])
 # ADMIN / SUPER_ADMIN -> CREATE STUDENT (NO FACE)
 # ======================================================
 @router.post("/create")
+@query_budget(15)
 def create_student(payload: StudentCreateRequest, _=Depends(require_roles("ADMIN", "SUPER_ADMIN"))):
     return register_student(
         student_id=payload.id,
@@ -41,6 +47,33 @@ def create_student(payload: StudentCreateRequest, _=Depends(require_roles("ADMIN
     )
 
 
+
+# ======================================================
+# ADMIN / SUPER_ADMIN -> BULK IMPORT STUDENTS (CSV / XLSX)
+# ======================================================
+@router.post("/import")
+@query_budget(0)
+async def import_students(
+    file: UploadFile = File(...),
+    dry_run: bool = False,
+    user_id=Depends(require_roles("ADMIN", "SUPER_ADMIN"))
+):
+    """
+    Columns: id, name, phone, year, course, section, college, password
+    (+ optional father_mobile, mother_mobile). Returns a per-row error report;
+    `dry_run=true` only validates.
+    """
+    try:
+        return await run_in_threadpool(
+            import_students_service,
+            file.file,
+            file.filename,
+            created_by=user_id,
+            dry_run=dry_run
+        )
+    finally:
+        await file.close()
+
 from slowapi.util import get_remote_address
 from slowapi.errors import RateLimitExceeded
 from slowapi import Limiter
@@ -57,7 +90,20 @@ limiter = Limiter(key_func=get_remote_address)
 def register_student_face(request: Request, payload: StudentFaceRegisterRequest, _=Depends(require_roles("STUDENT"))):
     return register_student_face_service(
         student_id=payload.student_id,
-        image_b64=payload.image_b64
+        image_b64=payload.image_b64,
+        face_token=payload.face_token
+    )
+
+
+@router.post("/register-face/upload")
+@limiter.limit("5/minute")
+async def register_student_face_upload(request: Request, student_id: str, _=Depends(require_roles("STUDENT"))):
+    """Binary/multipart variant of /register-face (field "image" or raw image/* body)."""
+    image_bytes = await read_image_upload(request)
+    return await run_in_threadpool(
+        register_student_face_service,
+        student_id=student_id,
+        image_bytes=image_bytes
     )
 
 
@@ -95,11 +141,12 @@ def delete_student(student_id: str, _=Depends(require_roles("ADMIN", "SUPER_ADMI
 # ADMIN -> PROMOTE STUDENTS
 # ======================================================
 @router.post("/promote")
-def promote_students(payload: PromoteStudentsRequest, _=Depends(require_roles("ADMIN"))):
+def promote_students(payload: PromoteStudentsRequest, user_id=Depends(require_roles("ADMIN"))):
     return promote_students_service(
         payload.year,
         payload.college,
-        payload.new_year
+        payload.new_year,
+        created_by=user_id
     )
 
 
@@ -107,8 +154,12 @@ def promote_students(payload: PromoteStudentsRequest, _=Depends(require_roles("A
 # ADMIN / SUPER_ADMIN -> FILTER STUDENTS
 # ======================================================
 @router.post("/filter")
-def filter_students(payload: StudentFilterRequest, _=Depends(require_roles("ADMIN", "SUPER_ADMIN"))):
-    return filter_students_service(payload.dict(exclude_unset=True))
+def filter_students(
+    payload: StudentFilterRequest,
+    params: ListParams = Depends(list_params),
+    _=Depends(require_roles("ADMIN", "SUPER_ADMIN"))
+):
+    return filter_students_service(payload.dict(exclude_unset=True), params)
 
 
 # ======================================================
@@ -84,7 +84,14 @@ class StudentCreateRequest(BaseModel):
 # STUDENT -> REGISTER FACE AFTER LOGIN
 class StudentFaceRegisterRequest(BaseModel):
     student_id: str
-    image_b64: Annotated[str, constr(min_length=100, max_length=100000, pattern=r'^([A-Za-z0-9+/=]+)$')]
+    image_b64: Optional[Annotated[str, constr(min_length=100, max_length=100000, pattern=r'^([A-Za-z0-9+/=]+)$')]] = None
+    face_token: Optional[str] = None  # from /face/validate
+
+    @model_validator(mode="after")
+    def image_or_token(self):
+        if not self.image_b64 and not self.face_token:
+            raise ValueError("Either image_b64 or face_token is required")
+        return self
 
 
 # STUDENT -> UPDATE OWN PROFILE (limited fields)
@@ -150,7 +157,14 @@ class GuardUpdateRequest(BaseModel):
 class FaceReplaceRequest(BaseModel):
     user_id: str
     user_type: str
-    image_b64: Annotated[str, constr(min_length=100, max_length=100000, pattern=r'^([A-Za-z0-9+/=]+)$')]
+    image_b64: Optional[Annotated[str, constr(min_length=100, max_length=100000, pattern=r'^([A-Za-z0-9+/=]+)$')]] = None
+    face_token: Optional[str] = None  # from /face/validate
+
+    @model_validator(mode="after")
+    def image_or_token(self):
+        if not self.image_b64 and not self.face_token:
+            raise ValueError("Either image_b64 or face_token is required")
+        return self
 
 
 class FaceVerifyRequest(BaseModel):
@@ -160,6 +174,7 @@ class FaceVerifyRequest(BaseModel):
 
 class FaceValidateRequest(BaseModel):
     image_b64: Annotated[str, constr(min_length=100, max_length=100000, pattern=r'^([A-Za-z0-9+/=]+)$')]
+    user_id: Optional[str] = None  # whose face this is; defaults to the caller
 
 
 # ================= REQUESTS =================
@@ -4,8 +4,7 @@ from fastapi import Depends, Header, HTTPException
 from starlette.status import HTTP_401_UNAUTHORIZED, HTTP_403_FORBIDDEN
 
 from security.jwt_tokens import decode_token
-from data.user_roles_repo import get_user_role
-from data.roles_repo import get_role_by_id
+from data.aio.user_roles_repo import get_user_role_name
 from data.refresh_token_repo import is_refresh_token_valid
 
 
@@ -30,14 +29,13 @@ def get_current_user(authorization: str = Header(None)):
 
 
 def require_roles(*allowed_roles):
-    def wrapper(user_id=Depends(get_current_user)):
-        mapping = get_user_role(user_id)
-        if not mapping:
+    # async so the role lookup runs on the event loop via the async Mongo
+    # pool instead of taking a threadpool slot; the name is cached per user
+    async def wrapper(user_id=Depends(get_current_user)):
+        role_name = await get_user_role_name(user_id)
+        if not role_name:
             raise HTTPException(HTTP_403_FORBIDDEN, "User has no role assigned")
 
-        role_doc = get_role_by_id(mapping["role_id"])
-        role_name = role_doc["name"]
-
         if role_name not in allowed_roles:
             raise HTTPException(HTTP_403_FORBIDDEN, "Access denied")
 
@@ -46,15 +44,12 @@ def require_roles(*allowed_roles):
     return wrapper
 
 
-def get_current_user_and_role(user_id: str = Depends(get_current_user)):
+async def get_current_user_and_role(user_id: str = Depends(get_current_user)):
     """Returns (user_id: str, role_name: str). Use for endpoints that need role-aware logic (e.g. filter scope)."""
-    mapping = get_user_role(user_id)
-    if not mapping:
+    role_name = await get_user_role_name(user_id)
+    if not role_name:
         raise HTTPException(HTTP_403_FORBIDDEN, "User has no role assigned")
-    role_doc = get_role_by_id(mapping["role_id"])
-    if not role_doc:
-        raise HTTPException(HTTP_403_FORBIDDEN, "Role not found")
-    return user_id, role_doc["name"]
+    return user_id, role_name
 
 
 def validate_refresh_token(refresh_token: str):
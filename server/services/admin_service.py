@@ -9,6 +9,7 @@ from schemas.admin_schema import Admin as AdminSchema
 # Core Utilities
 from core.http_errors import conflict
 from core.global_response import success
+from utils.cache import invalidate_user_cache
 from utils.audit_log import logger
 
 # Repositories (Data Layer)
@@ -16,7 +17,8 @@ from data.admin_repo import (
     get_admin_by_id as repo_get_admin, # Rename to avoid conflict with service function
     update_admin as repo_update_admin,
     delete_admin as repo_delete_admin,
-    get_all_admins as repo_get_all_admins
+    list_admins as repo_list_admins,
+    LIST_HIDDEN_FIELDS as ADMIN_HIDDEN_FIELDS
 )
 from data.roles_repo import get_role_by_name
 
@@ -133,6 +135,7 @@ def delete_admin_service(admin_id):
             with s.start_transaction():
                 repo_delete_admin(admin_id)
                 db["user_roles"].delete_many({"user_id": admin_id}, session=s)
+        invalidate_user_cache(admin_id)
         logger.log(admin_id, 'admin_delete_success', details='Admin deleted')
         return success("Admin deleted successfully")
     except PyMongoError:
@@ -142,12 +145,17 @@ def delete_admin_service(admin_id):
 # ==========================================================
 #  GET ALL ADMINS
 # ==========================================================
-def get_all_admins_service():
+def get_all_admins_service(params):
+    def with_id(a):
+        a["id"] = str(a.get("_id"))
+        return a
+
     try:
-        admins = repo_get_all_admins()
-        for a in admins:
-            a.pop("password_hash", None)
-            a["id"] = str(a.get("_id"))
-        return success("All admins retrieved", admins)
+        cursor = repo_list_admins(
+            projection=params.projection(ADMIN_HIDDEN_FIELDS),
+            after=params.after_id(object_ids=True),
+            limit=params.fetch_limit
+        )
+        return params.respond("All admins retrieved", cursor, transform=with_id)
     except PyMongoError:
         raise HTTPException(status_code=500, detail="Failed to fetch admins")
\ No newline at end of file
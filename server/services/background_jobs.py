@@ -0,0 +1,177 @@
+"""
+Resumable background jobs.
+
+Long data migrations (HOD reassignment, promotions, ...) run outside the
+request as jobs stored in `background_jobs`:
+
+    @job_handler("assign_hod")
+    def run_assign_hod(ctx):
+        for batch in ...:
+            ...
+            ctx.progress(done, total, checkpoint={"last_id": ...})
+
+    job_id = job_runner.submit("assign_hod", params, created_by=user_id)
+
+Handlers read `ctx.params` and `ctx.checkpoint` (None on the first run) and
+must be idempotent from the last checkpoint. Every `ctx.progress()` persists
+progress + checkpoint and renews the job's lease; a job whose runner died
+(lease expired) is picked up again by `resume_stale()`, which `start()` runs
+at startup and then every BACKGROUND_JOB_RESUME_INTERVAL_SECONDS, so a worker
+that dies mid-job is recovered by the ones still running.
+Progress is exposed through GET /jobs/{job_id}.
+
+Jobs that must not overlap take lock keys before they are submitted:
+
+    job_id = reserve_job_locks([f"assign_hod:{college}:{year}:{course}", ...])
+    ...
+    job_runner.submit("assign_hod", params, job_id=job_id)
+
+A key held by another queued / running job raises JobLockConflict
+(data.background_jobs_repo); the keys
+are released when the job finishes or fails.
+"""
+import threading
+import traceback
+import uuid
+from concurrent.futures import ThreadPoolExecutor
+from datetime import datetime, timedelta
+
+from config import Config
+from data.background_jobs_repo import (
+    create_job,
+    claim_job,
+    claim_stale_job,
+    update_job_progress,
+    finish_job,
+    fail_job,
+    acquire_job_locks
+)
+
+_handlers = {}
+
+
+def job_handler(job_type):
+    """Register `func(ctx)` as the runner for `job_type`."""
+    def decorator(func):
+        _handlers[job_type] = func
+        return func
+    return decorator
+
+
+def _lease_until():
+    return datetime.utcnow() + timedelta(seconds=Config.BACKGROUND_JOB_LEASE_SECONDS)
+
+
+def reserve_job_locks(keys):
+    """Lock `keys` for a job about to be submitted and return its job id."""
+    job_id = str(uuid.uuid4())
+    # A lock whose job never got created is reclaimed after one lease period
+    stale_before = datetime.utcnow() - timedelta(seconds=Config.BACKGROUND_JOB_LEASE_SECONDS)
+    acquire_job_locks(job_id, keys, stale_before)
+    return job_id
+
+
+class JobContext:
+    def __init__(self, job):
+        self.job_id = job["_id"]
+        self.params = job.get("params") or {}
+        self.checkpoint = job.get("checkpoint")
+        progress = job.get("progress") or {}
+        self.done = progress.get("done", 0)
+        self.total = progress.get("total")
+
+    def progress(self, done, total=None, checkpoint=None):
+        self.done = done
+        if total is not None:
+            self.total = total
+        if checkpoint is not None:
+            self.checkpoint = checkpoint
+        update_job_progress(self.job_id, self.done, self.total, self.checkpoint, _lease_until())
+
+
+class BackgroundJobRunner:
+    def __init__(self, workers=Config.BACKGROUND_JOB_WORKERS,
+                 resume_interval=Config.BACKGROUND_JOB_RESUME_INTERVAL_SECONDS):
+        self.workers = workers
+        self.resume_interval = resume_interval
+        self._executor = None
+        self._lock = threading.Lock()
+        self._sweeper = None
+        self._stop = threading.Event()
+
+    def _pool(self):
+        if self._executor is None:
+            with self._lock:
+                if self._executor is None:
+                    self._executor = ThreadPoolExecutor(
+                        max_workers=self.workers,
+                        thread_name_prefix="background-job"
+                    )
+        return self._executor
+
+    def submit(self, job_type, params, created_by=None, job_id=None):
+        """Queue a job; pass the `job_id` from reserve_job_locks for a locked job."""
+        if job_type not in _handlers:
+            raise ValueError(f"Unknown job type: {job_type}")
+        job_id = job_id or str(uuid.uuid4())
+        create_job(job_id, job_type, params, created_by=created_by)
+        self._pool().submit(self._claim_and_run, job_id)
+        return job_id
+
+    def resume_stale(self):
+        """Claim queued / abandoned jobs (e.g. after a restart) and run them."""
+        resumed = 0
+        while True:
+            job = claim_stale_job(datetime.utcnow(), _lease_until())
+            if job is None:
+                return resumed
+            print(f"[JOBS] resuming {job['type']} job {job['_id']} at {job.get('progress')}")
+            self._pool().submit(self._run, job)
+            resumed += 1
+
+    def start(self):
+        """Resume abandoned jobs now and keep sweeping for them in the background."""
+        if self._sweeper is not None:
+            return
+        self._stop.clear()
+        self._sweeper = threading.Thread(target=self._sweep, name="background-job-sweeper", daemon=True)
+        self._sweeper.start()
+
+    def _sweep(self):
+        while not self._stop.is_set():
+            try:
+                self.resume_stale()
+            except Exception as e:
+                print(f"[JOBS] resume failed: {e}")
+            self._stop.wait(self.resume_interval)
+
+    def _claim_and_run(self, job_id):
+        job = claim_job(job_id, datetime.utcnow(), _lease_until())
+        if job is not None:
+            self._run(job)
+
+    def _run(self, job):
+        handler = _handlers.get(job["type"])
+        if handler is None:
+            fail_job(job["_id"], f"No handler for job type {job['type']}")
+            return
+        try:
+            result = handler(JobContext(job))
+        except Exception as e:
+            print(f"[JOBS] {job['type']} job {job['_id']} failed: {e}")
+            traceback.print_exc()
+            fail_job(job["_id"], str(e))
+            return
+        finish_job(job["_id"], result)
+
+    def stop(self, wait=False):
+        self._stop.set()
+        if self._sweeper is not None:
+            self._sweeper.join(5)
+            self._sweeper = None
+        if self._executor is not None:
+            self._executor.shutdown(wait=wait, cancel_futures=True)
+            self._executor = None
+
+
+job_runner = BackgroundJobRunner()
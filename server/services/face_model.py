@@ -0,0 +1,141 @@
+"""
+Lazy InsightFace model manager.
+
+Nothing heavy happens at import time. `start_warmup()` (called on app
+startup) loads buffalo_l on a background thread and runs one dummy inference
+so the ONNX sessions are initialised before the first real request.
+Until then the API serves everything that doesn't need the model, and face
+endpoints wait briefly (FACE_MODEL_WAIT_SECONDS) or return 503. A failed load
+is retried on demand once its backoff (FACE_MODEL_RETRY_BACKOFF_SECONDS,
+doubling per consecutive failure) has passed.
+"""
+import threading
+import time
+import traceback
+
+import numpy as np
+from fastapi import HTTPException
+
+from config import Config
+from utils.metrics import record_rejection
+
+IDLE = "idle"
+LOADING = "loading"
+READY = "ready"
+FAILED = "failed"
+
+
+def detect_providers():
+    """ONNX Runtime reports its own execution providers; no torch needed."""
+    try:
+        import onnxruntime
+        available = onnxruntime.get_available_providers()
+    except Exception:
+        available = []
+    if "CUDAExecutionProvider" in available:
+        return ["CUDAExecutionProvider", "CPUExecutionProvider"], 0
+    return ["CPUExecutionProvider"], -1
+
+
+class FaceModelManager:
+    def __init__(self):
+        self.state = IDLE
+        self.error = None
+        self.device = None
+        self.load_seconds = None
+        self.warmup_ms = None
+        self.failures = 0
+        self._retry_at = 0.0
+        self._model = None
+        self._thread = None
+        self._lock = threading.Lock()
+        self._ready = threading.Event()
+
+    def start_warmup(self):
+        """Kick off loading in the background (idempotent)."""
+        with self._lock:
+            if self.state in (LOADING, READY):
+                return
+            self.state = LOADING
+            self.error = None
+            self._ready.clear()
+            self._thread = threading.Thread(target=self._load, name="face-model-warmup", daemon=True)
+            self._thread.start()
+
+    def ensure_loading(self):
+        """Start the load if idle, or retry a failed one once its backoff is up."""
+        if self.state == IDLE or (self.state == FAILED and time.monotonic() >= self._retry_at):
+            self.start_warmup()
+
+    def _retry_delay(self):
+        delay = Config.FACE_MODEL_RETRY_BACKOFF_SECONDS * 2 ** (self.failures - 1)
+        return min(delay, Config.FACE_MODEL_RETRY_BACKOFF_MAX_SECONDS)
+
+    def _load(self):
+        started = time.perf_counter()
+        try:
+            from insightface.app import FaceAnalysis
+
+            providers, ctx_id = detect_providers()
+            model = FaceAnalysis(name="buffalo_l", providers=providers)
+            model.prepare(ctx_id=ctx_id, det_size=(640, 640))
+            self.load_seconds = round(time.perf_counter() - started, 3)
+
+            # First inference allocates the ONNX sessions' buffers; pay it here
+            t0 = time.perf_counter()
+            model.get(np.zeros((640, 640, 3), np.uint8), max_num=1)
+            self.warmup_ms = round((time.perf_counter() - t0) * 1000, 1)
+
+            self._model = model
+            self.device = "GPU" if ctx_id == 0 else "CPU"
+            self.failures = 0
+            self.state = READY
+            print(f"✅ Face model loaded on {self.device} in {self.load_seconds}s (warm-up {self.warmup_ms} ms)")
+        except Exception as e:
+            self.error = str(e)
+            self.failures += 1
+            self._retry_at = time.monotonic() + self._retry_delay()
+            self.state = FAILED
+            print(f"❌ Face model load failed (attempt {self.failures}): {e}")
+            traceback.print_exc()
+        finally:
+            self._ready.set()
+
+    def get_model(self, timeout=None):
+        """Return the loaded model, starting/awaiting the load if needed, else 503."""
+        if self.state == READY:
+            return self._model
+        self.ensure_loading()
+        self._ready.wait(Config.FACE_MODEL_WAIT_SECONDS if timeout is None else timeout)
+        if self.state == READY:
+            return self._model
+        record_rejection("model_" + self.state)
+        if self.state == FAILED:
+            raise HTTPException(
+                status_code=503,
+                detail="Face service unavailable: model failed to initialize"
+            )
+        raise HTTPException(
+            status_code=503,
+            detail="Face service is starting up. Please retry in a moment."
+        )
+
+    def is_ready(self):
+        return self.state == READY
+
+    def status(self):
+        return {
+            "state": self.state,
+            "device": self.device,
+            "load_seconds": self.load_seconds,
+            "warmup_ms": self.warmup_ms,
+            "error": self.error,
+            "failures": self.failures,
+            "retry_in_seconds": (
+                max(0.0, round(self._retry_at - time.monotonic(), 1))
+                if self.state == FAILED else None
+            )
+        }
+
+
+model_manager = FaceModelManager()
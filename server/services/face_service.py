@@ -10,16 +10,43 @@ import threading
 face_executor = ThreadPoolExecutor(max_workers=Config.FACE_EXECUTOR_MAX_WORKERS)
 _inference_semaphore = threading.BoundedSemaphore(Config.FACE_INFERENCE_CONCURRENCY)
 
+# Load counters for /health/ready (in flight = holding the semaphore)
+_inference_counts = {"in_flight": 0, "waiting": 0}
+_inference_counts_lock = threading.Lock()
+
+
+def _bump_inference_count(key, delta):
+    with _inference_counts_lock:
+        _inference_counts[key] += delta
+
+
+def inference_load():
+    with _inference_counts_lock:
+        counts = dict(_inference_counts)
+    counts["capacity"] = Config.FACE_INFERENCE_CONCURRENCY
+    return counts
+
 
 def _run_face_get(img, max_num=1):
-    if not _inference_semaphore.acquire(timeout=Config.FACE_INFERENCE_TIMEOUT_SECONDS):
+    _bump_inference_count("waiting", 1)
+    try:
+        with timed("semaphore_wait"):
+            acquired = _inference_semaphore.acquire(timeout=Config.FACE_INFERENCE_TIMEOUT_SECONDS)
+    finally:
+        _bump_inference_count("waiting", -1)
+    if not acquired:
+        record_rejection("busy")
         raise HTTPException(
             status_code=503,
             detail="Face service busy. Please retry in a moment."
         )
+    _bump_inference_count("in_flight", 1)
     try:
-        return face_model.get(img, max_num=max_num)
+        model = model_manager.get_model()
+        with timed("face_get"):
+            return model.get(img, max_num=max_num)
     finally:
+        _bump_inference_count("in_flight", -1)
         _inference_semaphore.release()
 
 async def extract_embedding_async(img):
@@ -35,25 +62,25 @@ async def extract_embedding_async(img):
             timeout=Config.FACE_INFERENCE_TIMEOUT_SECONDS,
         )
     except asyncio.TimeoutError:
+        record_rejection("timeout")
         raise HTTPException(
             status_code=504,
             detail="Face processing timed out. Please retry."
         )
-import cv2
+import io
+import time
 import base64
 import numpy as np
-import importlib
 from datetime import datetime
 from pymongo.errors import PyMongoError
 from fastapi import HTTPException, status
 from utils.audit_log import logger
-import traceback
+from utils.lazy_imports import lazy_module
+from utils.metrics import timed, timed_stage, observe_stage, record_rejection, record_verify
+from services.face_model import model_manager
 
-torch = None
-if importlib.util.find_spec("torch") is not None:
-    import torch  # type: ignore[import-not-found]
-
-from insightface.app import FaceAnalysis
+# cv2 is only imported when the first image is decoded
+cv2 = lazy_module("cv2")
 
 # LIVENESS DETECTION (BLINK)
 def detect_blink(face):
@@ -77,57 +104,20 @@ def detect_blink(face):
 
 from extensions.mongo import client, db
 from data.faces_repo import (
+    get_face_by_id,
     get_face_by_user,
+    get_face_meta_by_user,
     delete_face,
     create_face_doc
 )
 from data.face_vectors_repo import (
     get_vector,
+    get_vectors_created_after,
     create_vector,
     delete_vector,
     search_similar_faces
 )
-
-
-# ===============================================================
-# MODEL INITIALIZATION (Singleton with GPU support)
-# ===============================================================
-
-class FaceModelSingleton:
-    _instance = None
-    _lock = threading.Lock()
-
-    def __new__(cls):
-        if cls._instance is None:
-            with cls._lock:
-                if cls._instance is None:
-                    cls._instance = super().__new__(cls)
-                    cls._instance._initialize_model()
-        return cls._instance
-
-    def _initialize_model(self):
-        try:
-            # If torch is unavailable, run InsightFace in CPU mode.
-            use_gpu = bool(torch is not None and torch.cuda.is_available())
-            ctx_id = 0 if use_gpu else -1
-            providers = ['CUDAExecutionProvider', 'CPUExecutionProvider'] if use_gpu else ['CPUExecutionProvider']
-
-            self.model = FaceAnalysis(
-                name="buffalo_l",
-                providers=providers
-            )
-            self.model.prepare(ctx_id=ctx_id, det_size=(640, 640))
-            print(f"✅ Face model loaded on {'GPU' if ctx_id == 0 else 'CPU'}")
-        except Exception as e:
-            print(f"❌ Face model load failed: {e}")
-            traceback.print_exc() 
-            self.model = None
-
-    def get_model(self):
-        return self.model
-
-# Use singleton
-face_model = FaceModelSingleton().get_model()
+from utils.face_token_store import get_face_token_store
 
 
 # ===============================================================
@@ -136,31 +126,87 @@ face_model = FaceModelSingleton().get_model()
 VERIFY_THRESHOLD = 0.55
 DUPLICATE_HIGH = 0.65
 AMBIGUOUS_LOW = 0.50
-LANDMARK_TWIN_THRESHOLD = 18.0
+
+# Twin / spoof check: distance between the 68 3-D landmarks of the live and
+# stored face, both in the normalised enrollment frame (canonical_landmarks).
+# There the detected face box spans FACE_STORE_SIZE / (1 + 2 * FACE_STORE_MARGIN)
+# px (~178 at the defaults), so the threshold is set as a fraction of that
+# side: 0.1 keeps the former ~18 px at the defaults and follows any change to
+# FACE_STORE_SIZE / FACE_STORE_MARGIN. Framing (offset, zoom) of either photo
+# no longer counts towards the distance.
+LANDMARK_TWIN_FACE_FRACTION = 0.10
+LANDMARK_TWIN_THRESHOLD = (
+    LANDMARK_TWIN_FACE_FRACTION * Config.FACE_STORE_SIZE / (1 + 2 * Config.FACE_STORE_MARGIN)
+)
 
 
 # ===============================================================
 # IMAGE DECODER
 # ===============================================================
-def decode_image(b64):
+_REDUCED_DECODE_FLAGS = (
+    (8, "IMREAD_REDUCED_COLOR_8"),
+    (4, "IMREAD_REDUCED_COLOR_4"),
+    (2, "IMREAD_REDUCED_COLOR_2"),
+)
+
+# Rec.601 luma weights in BGR order
+_LUMA_BGR = np.array([0.114, 0.587, 0.299], np.float32)
+
+
+def _probe_dimensions(data):
+    """Read (width, height) from the image header without decoding pixels."""
     try:
-        if "," in b64:
-            b64 = b64.split(",")[1]
-        img_bytes = base64.b64decode(b64)
-        arr = np.frombuffer(img_bytes, np.uint8)
-        img = cv2.imdecode(arr, cv2.IMREAD_COLOR)
+        from PIL import Image
+        with Image.open(io.BytesIO(data)) as im:
+            return im.size
+    except Exception:
+        return None
+
+
+def _decode_flag_for(size):
+    """Pick a reduced-resolution decode when the source is oversized, while
+    keeping the longest side >= FACE_DECODE_MAX_SIDE and the minimum size."""
+    if not size:
+        return cv2.IMREAD_COLOR
+    w, h = size
+    for factor, flag in _REDUCED_DECODE_FLAGS:
+        if (
+            max(w, h) // factor >= Config.FACE_DECODE_MAX_SIDE
+            and w // factor >= Config.FACE_MIN_WIDTH
+            and h // factor >= Config.FACE_MIN_HEIGHT
+        ):
+            return getattr(cv2, flag)
+    return cv2.IMREAD_COLOR
+
+
+def _estimate_brightness(img):
+    # Strided view (no copy) of ~128 px on the short side is plenty for a mean
+    step = max(1, min(img.shape[:2]) // 128)
+    sample = img[::step, ::step]
+    return float(sample.mean(axis=(0, 1)) @ _LUMA_BGR)
+
+
+@timed_stage("decode_image")
+def decode_image_bytes(data):
+    """
+    Decode raw image bytes (bytes / bytearray / memoryview) straight into
+    an ndarray. `np.frombuffer` wraps the buffer without copying it.
+    """
+    try:
+        size = _probe_dimensions(data)
+        arr = np.frombuffer(data, np.uint8)
+        img = cv2.imdecode(arr, _decode_flag_for(size))
         if img is None:
             raise ValueError()
 
-        h, w = img.shape[:2]
+        w, h = size if size else (img.shape[1], img.shape[0])
         if w < Config.FACE_MIN_WIDTH or h < Config.FACE_MIN_HEIGHT:
             raise HTTPException(
                 status_code=status.HTTP_400_BAD_REQUEST,
                 detail=f"Image too small. Minimum {Config.FACE_MIN_WIDTH}x{Config.FACE_MIN_HEIGHT} required"
             )
 
-        gray = cv2.cvtColor(img, cv2.COLOR_BGR2GRAY)
-        brightness = float(np.mean(gray))
+        brightness = _estimate_brightness(img)
         if brightness < Config.FACE_MIN_BRIGHTNESS:
             raise HTTPException(
                 status_code=status.HTTP_400_BAD_REQUEST,
@@ -182,16 +228,31 @@ def decode_image(b64):
         )
 
 
+def decode_image(b64):
+    try:
+        if "," in b64:
+            b64 = b64.split(",")[1]
+        img_bytes = base64.b64decode(b64)
+    except Exception:
+        raise HTTPException(
+            status_code=status.HTTP_400_BAD_REQUEST,
+            detail="Invalid or corrupted image"
+        )
+    return decode_image_bytes(img_bytes)
+
+
+def load_image(b64=None, image_bytes=None):
+    """Decode whichever input the route received (binary upload or base64)."""
+    if image_bytes is not None:
+        return decode_image_bytes(image_bytes)
+    return decode_image(b64)
+
+
 # ===============================================================
 # 🚨 FACE COUNT ENFORCEMENT (NEW)
 # ===============================================================
 def ensure_single_face(img):
-    if face_model is None:
-        raise HTTPException(
-            status_code=503,
-            detail="Face service unavailable: model failed to initialize"
-        )
-
+    # 503s while the model is still warming up or failed to load
     faces = _run_face_get(img, max_num=1)
 
     if not faces:
@@ -210,14 +271,85 @@ def ensure_single_face(img):
 
 
 # ===============================================================
-# EMBEDDING EXTRACTION (UNCHANGED LOGIC)
+# ENROLLMENT NORMALISATION
 # ===============================================================
-def extract_embedding_and_landmarks(img):
+def _crop_box(bbox):
+    """Square (x0, y0, side) around the detection bbox plus FACE_STORE_MARGIN."""
+    x1, y1, x2, y2 = [float(v) for v in bbox[:4]]
+    side = max(x2 - x1, y2 - y1) * (1 + 2 * Config.FACE_STORE_MARGIN)
+    side = max(1, int(round(side)))
+    x0 = int(round((x1 + x2) / 2 - side / 2))
+    y0 = int(round((y1 + y2) / 2 - side / 2))
+    return x0, y0, side
+
+
+def canonical_landmarks(lm, bbox):
+    """
+    Landmarks in the frame of the normalised enrollment image, so live and
+    stored faces are compared independent of how the photo was framed.
+    """
+    x0, y0, side = _crop_box(bbox)
+    out = np.asarray(lm, np.float32).copy()
+    out[:, 0] -= x0
+    out[:, 1] -= y0
+    return out * (Config.FACE_STORE_SIZE / side)
+
+
+def _encode_jpeg(img):
+    ok, buf = cv2.imencode(".jpg", img, [cv2.IMWRITE_JPEG_QUALITY, Config.FACE_STORE_JPEG_QUALITY])
+    if not ok:
+        raise HTTPException(
+            status_code=status.HTTP_400_BAD_REQUEST,
+            detail="Invalid or corrupted image"
+        )
+    return buf.tobytes()
+
+
+def _aligned_crop(img, face):
+    from insightface.utils import face_align
+    return face_align.norm_crop(img, landmark=face.kps, image_size=112)
+
+
+@timed_stage("normalize_image")
+def normalize_face_image(img, face):
+    """
+    Stored form of an enrollment photo: crop around the detected face with a
+    margin (edge-padded where it leaves the frame), resize to
+    FACE_STORE_SIZE square and encode at FACE_STORE_JPEG_QUALITY.
+    Returns (jpeg_bytes, aligned_jpeg_bytes or None).
+    """
+    x0, y0, side = _crop_box(face.bbox)
+    h, w = img.shape[:2]
+    crop = img[max(0, y0):min(h, y0 + side), max(0, x0):min(w, x0 + side)]
+    pad = (max(0, -y0), max(0, y0 + side - h), max(0, -x0), max(0, x0 + side - w))
+    if any(pad):
+        crop = cv2.copyMakeBorder(crop, *pad, cv2.BORDER_REPLICATE)
+
+    size = Config.FACE_STORE_SIZE
+    interpolation = cv2.INTER_AREA if side > size else cv2.INTER_CUBIC
+    crop = cv2.resize(crop, (size, size), interpolation=interpolation)
+
+    aligned = None
+    if Config.FACE_STORE_ALIGNED and getattr(face, "kps", None) is not None:
+        aligned = _encode_jpeg(_aligned_crop(img, face))
+    return _encode_jpeg(crop), aligned
+
+
+# ===============================================================
+# EMBEDDING EXTRACTION
+# ===============================================================
+def extract_face(img):
+    """(face, embedding, canonical landmarks) for the single face in `img`."""
     face = ensure_single_face(img)
 
     emb = face.embedding.astype(np.float32)
-    lm = face.landmark_3d_68.astype(np.float32)
+    lm = canonical_landmarks(face.landmark_3d_68, face.bbox)
+
+    return face, emb, lm
+
 
+def extract_embedding_and_landmarks(img):
+    _, emb, lm = extract_face(img)
     return emb, lm
 
 
@@ -228,12 +360,15 @@ def landmark_distance(a, b):
 # ===============================================================
 # VERIFICATION
 # ===============================================================
-def verify_face_for_user(user_id, b64):
+def _get_reference_face(user_id):
     face = get_face_by_user(user_id)
     if not face:
         logger.log(user_id, 'face_verification_failed', details='Face not registered')
         raise HTTPException(404, "Face not registered")
+    return face
+
 
+def _match_against_stored(user_id, face, emb, lm1):
     vector = get_vector(face["vector_ref"])
     if not vector:
         logger.log(user_id, 'face_verification_failed', details='Stored face vector missing')
@@ -241,29 +376,22 @@ def verify_face_for_user(user_id, b64):
 
     saved_emb = np.array(vector["embedding"], np.float32)
 
-    img, _ = decode_image(b64)
-    emb, lm1 = extract_embedding_and_landmarks(img)
-    # LIVENESS CHECK: Blink detection
-    # face = ensure_single_face(img)
-    # if not detect_blink(face):
-    #     logger.log(user_id, 'liveness_failed', details='Blink not detected')
-    #     raise HTTPException(
-    #         status_code=403,
-    #         detail="Liveness check failed: Please blink during authentication."
-    #     )
-
     score = float(
         np.dot(saved_emb, emb)
         / (np.linalg.norm(saved_emb) * np.linalg.norm(emb))
     )
     logger.log(user_id, 'face_verification_attempt', details=f'Verification score: {score}')
 
-    print(f"[VERIFY] {user_id} | score={score:.3f}")
-
     if score < VERIFY_THRESHOLD:
+        record_verify(score, "mismatch")
         return False, score
 
     if score < DUPLICATE_HIGH:
+        # `face` may be metadata only; the JPEG is needed just for this check
+        if "image_data" not in face:
+            face = get_face_by_id(str(face["_id"]))
+            if not face:
+                raise HTTPException(409, "Stored face changed during verification; retry")
         img2 = cv2.imdecode(
             np.frombuffer(face["image_data"], np.uint8),
             cv2.IMREAD_COLOR
@@ -271,23 +399,39 @@ def verify_face_for_user(user_id, b64):
         _, lm2 = extract_embedding_and_landmarks(img2)
 
         if landmark_distance(lm1, lm2) > LANDMARK_TWIN_THRESHOLD:
+            record_verify(score, "ambiguous")
             raise HTTPException(
                 status_code=403,
                 detail="Identity ambiguous (Twin or spoof detected)"
             )
 
+    record_verify(score, "match")
     return True, score
 
 
+def verify_face_for_user(user_id, b64=None, image_bytes=None):
+    face = _get_reference_face(user_id)
+
+    img, _ = load_image(b64, image_bytes)
+    emb, lm1 = extract_embedding_and_landmarks(img)
+    # LIVENESS CHECK: Blink detection
+    # face = ensure_single_face(img)
+    # if not detect_blink(face):
+    #     logger.log(user_id, 'liveness_failed', details='Blink not detected')
+    #     raise HTTPException(
+    #         status_code=403,
+    #         detail="Liveness check failed: Please blink during authentication."
+    #     )
+
+    return _match_against_stored(user_id, face, emb, lm1)
+
+
 # ===============================================================
-# SAVE / REPLACE FACE (UNCHANGED FLOW)
+# DUPLICATE CHECKS
 # ===============================================================
-def save_face_replace(user_id, user_type, b64):
-    img, _ = decode_image(b64)
-    emb, _ = extract_embedding_and_landmarks(img)
-    emb_list = emb.tolist()
-
-    matches = search_similar_faces(emb_list, limit=5)
+def ensure_not_duplicate(emb_list, user_id=None):
+    with timed("duplicate_search"):
+        matches = search_similar_faces(emb_list, limit=5)
     for m in matches:
         if m.get("score", 0.0) >= DUPLICATE_HIGH and m["user_id"] != user_id:
             raise HTTPException(
@@ -295,25 +439,107 @@ def save_face_replace(user_id, user_type, b64):
                 detail=f"Face already registered to user {m['user_id']}"
             )
 
+
+def ensure_not_duplicate_since(emb, since, user_id=None):
+    """
+    Re-check a pre-validated embedding against vectors enrolled after
+    its token was issued. Everything older was covered by the full
+    search in validate_and_cache_face.
+    """
+    emb_norm = np.linalg.norm(emb)
+    with timed("duplicate_search_since"):
+        recent = get_vectors_created_after(since)
+    for doc in recent:
+        if doc["user_id"] == user_id or "embedding" not in doc:
+            continue
+        other = np.array(doc["embedding"], np.float32)
+        score = float(np.dot(other, emb) / (np.linalg.norm(other) * emb_norm))
+        if score >= DUPLICATE_HIGH:
+            raise HTTPException(
+                status_code=status.HTTP_409_CONFLICT,
+                detail=f"Face already registered to user {doc['user_id']}"
+            )
+
+
+# ===============================================================
+# PRE-VALIDATED FACE TOKENS
+# ===============================================================
+def resolve_face_token(face_token, user_id=None):
+    """
+    Consume a token issued by validate_and_cache_face for `user_id`.
+    Returns (embedding, landmarks, jpeg_bytes, aligned_jpeg_bytes) without
+    decoding or running inference again.
+    """
+    cached = get_face_token_store().pop(face_token)
+    if not cached:
+        raise HTTPException(
+            status_code=status.HTTP_400_BAD_REQUEST,
+            detail="Face token invalid or expired. Please capture again."
+        )
+    if cached.get("user_id") != user_id:
+        logger.log(user_id, 'face_token_rejected', details=f"Token issued for {cached.get('user_id')}")
+        raise HTTPException(
+            status_code=status.HTTP_403_FORBIDDEN,
+            detail="Face token was issued for another user"
+        )
+
+    emb = np.asarray(cached["embedding"], np.float32)
+    ensure_not_duplicate_since(emb, cached["issued_at"], user_id=user_id)
+
+    return (
+        emb,
+        np.asarray(cached["landmarks"], np.float32),
+        cached["image_jpeg"],
+        cached.get("aligned_jpeg")
+    )
+
+
+# ===============================================================
+# SINGLE-PASS PREPARATION
+# ===============================================================
+def prepare_face(b64=None, image_bytes=None):
+    """
+    Decode, run inference and normalise the JPEG exactly once.
+    Returns (embedding, landmarks, jpeg_bytes, aligned_jpeg_bytes) which
+    the verify, duplicate-check and persist steps all share.
+    """
+    img, _ = load_image(b64, image_bytes)
+    face, emb, lm = extract_face(img)
+    jpeg, aligned = normalize_face_image(img, face)
+    return emb, lm, jpeg, aligned
+
+
+# ===============================================================
+# SAVE / REPLACE FACE (UNCHANGED FLOW)
+# ===============================================================
+_MISSING = object()
+
+
+def persist_face(user_id, user_type, emb_list, image_bytes, old=_MISSING, aligned_bytes=None):
+    """Replace the user's face + vector. Pass `old` when the caller already
+    fetched the existing face doc so it is not read a second time."""
     vector_id = f"vec_{user_id}"
 
     try:
         with client.start_session() as session:
             with session.start_transaction():
-                old = get_face_by_user(user_id)
+                if old is _MISSING:
+                    with timed("persist_read"):
+                        old = get_face_meta_by_user(user_id)
+                write_started = time.perf_counter()
                 if old:
                     delete_vector(old["vector_ref"], session=session)
                     delete_face(old["_id"], session=session)
 
                 create_vector(vector_id, user_id, emb_list, session=session)
 
-                ok, buf = cv2.imencode(".jpg", img)
                 face_id = create_face_doc(
                     user_id,
                     user_type,
-                    buf.tobytes(),
+                    image_bytes,
                     vector_id,
-                    session=session
+                    session=session,
+                    aligned_bytes=aligned_bytes
                 )
 
                 col_map = {
@@ -331,6 +557,8 @@ def save_face_replace(user_id, user_type, b64):
                     }},
                     session=session
                 )
+            # Includes the commit round trip
+            observe_stage("persist_write", time.perf_counter() - write_started)
         return True
 
     except PyMongoError:
@@ -340,15 +568,44 @@ def save_face_replace(user_id, user_type, b64):
         )
 
 
+def save_face_replace(user_id, user_type, b64=None, image_bytes=None):
+    emb, _, image_bytes, aligned = prepare_face(b64, image_bytes)
+    emb_list = emb.tolist()
+
+    ensure_not_duplicate(emb_list, user_id=user_id)
+
+    return persist_face(user_id, user_type, emb_list, image_bytes, aligned_bytes=aligned)
+
+
+def save_face_from_token(user_id, user_type, face_token):
+    emb, _, image_bytes, aligned = resolve_face_token(face_token, user_id=user_id)
+    return persist_face(user_id, user_type, emb.tolist(), image_bytes, aligned_bytes=aligned)
+
+
 # ===============================================================
-# VERIFY THEN REPLACE (UNCHANGED)
+# VERIFY THEN REPLACE (ONE INFERENCE PASS)
 # ===============================================================
-def verify_then_replace_face(user_id, user_type, b64):
-    try:
-        verify_face_for_user(user_id, b64)
-        save_face_replace(user_id, user_type, b64)
-    except HTTPException as e:
-        if e.status_code == 404:
-            save_face_replace(user_id, user_type, b64)
-        else:
-            raise
+def verify_then_replace_face(user_id, user_type, b64=None, face_token=None, image_bytes=None):
+    if face_token:
+        # Token path already re-checked duplicates when it was consumed
+        emb, lm, image_bytes, aligned = resolve_face_token(face_token, user_id=user_id)
+    else:
+        emb, lm, image_bytes, aligned = prepare_face(b64, image_bytes)
+
+    # No stored face yet -> first enrollment, nothing to verify against.
+    # Metadata only: the stored image is read only if the twin check runs
+    old = get_face_meta_by_user(user_id)
+    if old:
+        matched, score = _match_against_stored(user_id, old, emb, lm)
+        if not matched:
+            logger.log(user_id, 'face_replace_rejected', details=f'Verification score: {score}')
+            raise HTTPException(
+                status_code=status.HTTP_403_FORBIDDEN,
+                detail="Face does not match the registered face"
+            )
+
+    emb_list = emb.tolist()
+    if not face_token:
+        ensure_not_duplicate(emb_list, user_id=user_id)
+
+    persist_face(user_id, user_type, emb_list, image_bytes, old=old, aligned_bytes=aligned)
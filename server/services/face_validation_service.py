@@ -1,62 +1,51 @@
-from datetime import datetime, timedelta
-from typing import Tuple, Optional
+from datetime import datetime
+from typing import Tuple
 from fastapi import HTTPException, status
 import numpy as np
-import cv2
 
 from services.face_service import (
-    decode_image,
-    extract_embedding_and_landmarks,
+    load_image,
+    extract_face,
+    normalize_face_image,
     DUPLICATE_HIGH
 )
 
 from data.face_vectors_repo import search_similar_faces
-
-# ==========================================================
-# TEMP CACHE (UNCHANGED)
-# ==========================================================
-FACE_CACHE = {}
-CACHE_EXPIRY_MINUTES = 5
-
-
-# ==========================================================
-# CACHE CLEANUP (UNCHANGED)
-# ==========================================================
-def cleanup_cache():
-    now = datetime.utcnow()
-    expired = [
-        k for k, v in FACE_CACHE.items()
-        if now - v["timestamp"] > timedelta(minutes=CACHE_EXPIRY_MINUTES)
-    ]
-    for k in expired:
-        del FACE_CACHE[k]
+from utils.face_token_store import get_face_token_store
+from utils.metrics import timed
 
 
 # ==========================================================
 # FACE VALIDATION (UPDATED SAFELY)
 # ==========================================================
-def validate_and_cache_face(image_b64: str) -> Tuple[bool, str]:
+def validate_and_cache_face(image_b64: str = None, image_bytes: bytes = None,
+                            user_id: str = None, issued_by: str = None) -> Tuple[bool, str]:
     """
-    Pre-validates face before registration.
+    Pre-validates face before registration for `user_id`.
 
     Enforces:
     - Exactly one face
     - Valid embedding extraction
-    - No global duplicate face
-    """
+    - No duplicate of another user's face (re-enrolling matches yourself)
 
-    cleanup_cache()
+    The token can only be redeemed for `user_id`.
+    """
 
-    img, _ = decode_image(image_b64)
+    img, _ = load_image(image_b64, image_bytes)
 
     # 🚨 This now enforces:
     # - No face
     # - Multiple faces
-    emb, _ = extract_embedding_and_landmarks(img)
+    face, emb, lm = extract_face(img)
     emb_list = emb.tolist()
 
+    # Taken before the search so a later re-check covers anything
+    # inserted while this search was running.
+    issued_at = datetime.utcnow()
+
     try:
-        matches = search_similar_faces(emb_list, limit=5)
+        with timed("duplicate_search"):
+            matches = search_similar_faces(emb_list, limit=5)
     except Exception:
         raise HTTPException(
             status_code=status.HTTP_500_INTERNAL_SERVER_ERROR,
@@ -64,24 +53,24 @@ def validate_and_cache_face(image_b64: str) -> Tuple[bool, str]:
         )
 
     for m in matches:
-        if m.get("score", 0.0) >= DUPLICATE_HIGH:
+        if m.get("score", 0.0) >= DUPLICATE_HIGH and m["user_id"] != user_id:
             raise HTTPException(
                 status_code=status.HTTP_409_CONFLICT,
                 detail=f"Face already registered to user {m['user_id']}"
             )
 
-    token = f"tmp_{datetime.utcnow().timestamp()}"
-    FACE_CACHE[token] = {
-        "image_b64": image_b64,
-        "timestamp": datetime.utcnow()
-    }
-
-    return True, token
+    # Keep the computed embedding and the normalised JPEG (not the raw
+    # upload) so registration can skip decode + inference with this token.
+    image_jpeg, aligned_jpeg = normalize_face_image(img, face)
 
+    token = get_face_token_store().put({
+        "embedding": emb,
+        "landmarks": lm,
+        "image_jpeg": image_jpeg,
+        "aligned_jpeg": aligned_jpeg,
+        "issued_at": issued_at,
+        "user_id": user_id,
+        "issued_by": issued_by
+    })
 
-# ==========================================================
-# GET CACHED FACE (UNCHANGED)
-# ==========================================================
-def get_cached_face(temp_token: str) -> Optional[str]:
-    cleanup_cache()
-    return FACE_CACHE.get(temp_token, {}).get("image_b64")
+    return True, token
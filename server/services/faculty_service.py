@@ -9,13 +9,16 @@ from data.faculty_repo import (
     get_faculty_by_id,
     update_faculty as repo_update,
     delete_faculty as repo_delete,
-    get_all_faculty,
-    get_faculty_by_college,
-    filter_faculty
+    list_faculty,
+    LIST_HIDDEN_FIELDS as FACULTY_HIDDEN_FIELDS
 )
 from data.roles_repo import get_role_by_name
+from data.user_roles_repo import get_user_role
+from data.scope_map_repo import move_hod_scopes, remove_faculty_from_scopes, invalidate_scope_map
+from data.faculty_read_model_repo import rebuild_faculty_read_model
 from extensions.mongo import client, db
 from core.global_response import success
+from utils.cache import invalidate_user_cache
 
 
 # ==================================================
@@ -96,14 +99,30 @@ def update_faculty_service(faculty_id: str, updates: dict):
     if "password" in updates:
         updates["password_hash"] = hash_password(updates.pop("password"))
 
+    # A HOD's faculty document defines its scopes (see scope_map_repo)
+    rescoped = any(
+        f in updates and updates[f] != faculty.get(f)
+        for f in ("college", "years", "courses")
+    )
+    if rescoped:
+        hod_role = get_role_by_name("HOD")
+        user_role = get_user_role(faculty_id)
+        rescoped = bool(hod_role and user_role and user_role["role_id"] == hod_role["_id"])
+
     try:
         with client.start_session() as s:
             with s.start_transaction():
                 repo_update(faculty_id, updates, session=s)
+                if rescoped:
+                    move_hod_scopes(faculty_id, faculty, {**faculty, **updates}, session=s)
 
     except PyMongoError:
         raise HTTPException(status_code=500, detail="Faculty update failed")
 
+    if rescoped:
+        invalidate_scope_map()
+        rebuild_faculty_read_model([faculty_id])
+
     updated = get_faculty_by_id(faculty_id)
     updated.pop("password_hash", None)
     return success("Faculty updated successfully", updated)
@@ -124,38 +143,43 @@ def delete_faculty_service(faculty_id: str):
                     {"user_id": faculty_id},
                     session=s
                 )
+                remove_faculty_from_scopes([faculty_id], session=s)
 
     except PyMongoError:
         raise HTTPException(status_code=500, detail="Faculty deletion failed")
 
+    invalidate_scope_map()
+    invalidate_user_cache(faculty_id)
+
     return success("Faculty deleted successfully")
 
 
 # ==================================================
 # GET ALL FACULTY
 # ==================================================
-def service_get_all_faculty():
-    faculty = get_all_faculty()
-    for f in faculty:
-        f.pop("password_hash", None)
-    return success("All faculty retrieved", faculty)
+def service_get_all_faculty(params):
+    return _list_faculty_page("All faculty retrieved", {}, params)
 
 
 # ==================================================
 # GET FACULTY BY COLLEGE
 # ==================================================
-def service_get_faculty_by_college(college: str):
-    faculty = get_faculty_by_college(college)
-    for f in faculty:
-        f.pop("password_hash", None)
-    return success("Faculty by college", faculty)
+def service_get_faculty_by_college(college: str, params):
+    return _list_faculty_page("Faculty by college", {"college": college, "active": True}, params)
 
 
 # ==================================================
 # FILTER FACULTY
 # ==================================================
-def filter_faculty_service(filters: dict):
-    faculty = filter_faculty(filters)
-    for f in faculty:
-        f.pop("password_hash", None)
-    return success("Filtered faculty", faculty)
+def filter_faculty_service(filters: dict, params):
+    return _list_faculty_page("Filtered faculty", filters, params)
+
+
+def _list_faculty_page(message, filters, params):
+    cursor = list_faculty(
+        filters,
+        projection=params.projection(FACULTY_HIDDEN_FIELDS),
+        after=params.after,
+        limit=params.fetch_limit
+    )
+    return params.respond(message, cursor)
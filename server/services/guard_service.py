@@ -10,15 +10,17 @@ from data.guards_repo import (
     create_guard as repo_create_guard,
     update_guard as repo_update_guard,
     delete_guard as repo_delete_guard,
-    get_all_guards
+    list_guards,
+    LIST_HIDDEN_FIELDS as GUARD_HIDDEN_FIELDS
 )
 
 from data.roles_repo import get_role_by_name
-from data.faces_repo import get_face_by_user, delete_face
+from data.faces_repo import get_face_meta_by_user, get_face_meta_by_users, delete_face
 from data.face_vectors_repo import delete_vector
 
 from extensions.mongo import client, db
 from core.global_response import success
+from utils.cache import invalidate_user_cache
 
 
 # =======================================================
@@ -99,7 +101,7 @@ def update_guard_service(guard_id, updates):
 # DELETE GUARD
 # =======================================================
 def delete_guard_service(guard_id):
-    old = get_face_by_user(guard_id)
+    old = get_face_meta_by_user(guard_id)
     vec = old.get("vector_ref") if old else None
     face_id = old.get("_id") if old else None
 
@@ -121,6 +123,7 @@ def delete_guard_service(guard_id):
             detail="Failed to delete guard"
         )
 
+    invalidate_user_cache(guard_id)
     return success("Guard deleted successfully")
 
 
@@ -159,26 +162,24 @@ def service_get_guard_by_id(guard_id: str):
 # =======================================================
 # GET ALL GUARDS
 # =======================================================
-def service_get_all_guards():
-    try:
-        guards = get_all_guards()
-        cleaned = []
-
-        for g in guards:
-            g.pop("password_hash", None)
-
-            face_info = None
-            face_doc = get_face_by_user(g["_id"])
-            if face_doc:
-                face_info = {
-                    "face_id": str(face_doc["_id"]),
-                    "vector_ref": face_doc.get("vector_ref")
-                }
+def service_get_all_guards(params):
+    def with_face_info(page):
+        # One $in query per page, image bytes never loaded
+        face_docs = get_face_meta_by_users([g["_id"] for g in page])
+        for g in page:
+            face_doc = face_docs.get(g["_id"])
+            g["face_info"] = {
+                "face_id": str(face_doc["_id"]),
+                "vector_ref": face_doc.get("vector_ref")
+            } if face_doc else None
 
-            g["face_info"] = face_info
-            cleaned.append(g)
-
-        return success("All guards retrieved successfully", cleaned)
+    try:
+        cursor = list_guards(
+            projection=params.projection(GUARD_HIDDEN_FIELDS),
+            after=params.after,
+            limit=params.fetch_limit
+        )
+        return params.respond("All guards retrieved successfully", cursor, enrich=with_face_info)
 
     except PyMongoError:
         raise HTTPException(
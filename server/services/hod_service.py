@@ -1,114 +1,177 @@
 # services/hod_assignment_service.py
+"""
+HOD assignment in two phases:
+
+1. In the request, one short transaction: demote the previous HOD(s) of the
+   selected scopes, promote the new one, rebuild hod_mentor for those scopes
+   and update the scope map. Role changes happen once, not per scope.
+2. A background job ("assign_hod") repoints student_hod in bulk_write
+   batches of HOD_ASSIGN_BATCH_SIZE, checkpointing after each batch, then
+   removes the previous HODs' leftover mappings. Progress: GET /jobs/{job_id}.
+   The job holds a lock per (college, year, course) from before phase 1
+   until it finishes; assignments overlapping its scopes get 409.
+"""
 from datetime import datetime
-from fastapi import HTTPException
-from extensions.mongo import client, db
+from fastapi import HTTPException, status
+from extensions.mongo import client
+from config import Config
 from core.global_response import success
+from utils.cache import invalidate_user_cache
 
 from data.faculty_repo import get_faculty_by_id
+from data.student_repo import count_students_in_scopes, iter_student_id_batches
 from data.student_hod_repo import (
-    map_student_to_hod,
-    delete_hod_mappings_for_scope,
-    get_hod_assignments
+    get_hod_assignments,
+    get_hod_ids_for_scopes as get_mapped_hod_ids,
+    bulk_map_students_to_hod,
+    delete_hod_mappings_for_scopes
 )
 from data.hod_mentor_repo import (
-    get_hod_for_year_course,
-    delete_hod_mentor_mappings_for_scope,
-    create_hod_mentor_mapping
+    get_hod_ids_for_scopes as get_mentor_mapped_hod_ids,
+    delete_hod_mentor_mappings_for_scopes,
+    create_hod_mentor_mappings
 )
+from data.student_mentor_repo import get_mentor_ids_by_year_course
+from data.scope_map_repo import set_hod_scopes, remove_faculty_from_scopes, invalidate_scope_map
+from data.faculty_read_model_repo import rebuild_faculty_read_model
 from data.roles_repo import get_role_by_name
 from data.user_roles_repo import assign_role, delete_specific_role
+from data.background_jobs_repo import JobLockConflict, release_job_locks
+from services.background_jobs import job_handler, job_runner, reserve_job_locks
 
 
-def assign_hod_service(payload):
+def assign_hod_service(payload, created_by=None):
     faculty_id = payload.faculty_id
     college = payload.college
     years = payload.years
     courses = payload.courses
+    scopes = [(year, course) for year in years for course in courses]
+    if not scopes:
+        raise HTTPException(400, "Select at least one year and course")
 
     faculty = get_faculty_by_id(faculty_id)
     if not faculty:
         raise HTTPException(404, "Faculty not found")
 
+    # Two jobs repointing the same students would race; one at a time. Taking
+    # the scope locks is the overlap check, so two requests can't both pass it
+    try:
+        job_id = reserve_job_locks(_scope_lock_keys(college, scopes))
+    except JobLockConflict as e:
+        raise HTTPException(
+            status_code=status.HTTP_409_CONFLICT,
+            detail=f"A HOD assignment for these scopes is still running (job {e.job_id})"
+        )
+
+    try:
+        old_hods = _reassign_hod_roles(faculty_id, college, years, courses, scopes)
+
+        # 🟢 MAP STUDENTS (background, resumable)
+        job_runner.submit(
+            "assign_hod",
+            {
+                "hod_id": faculty_id,
+                "old_hod_ids": sorted(old_hods),
+                "college": college,
+                "scopes": [[year, course] for year, course in scopes]
+            },
+            created_by=created_by,
+            job_id=job_id
+        )
+    except Exception:
+        release_job_locks(job_id)
+        raise
+    return success("HOD assigned; student mappings are being updated", {"job_id": job_id})
+
+
+def _scope_lock_keys(college, scopes):
+    return [f"assign_hod:{college}:{year}:{course}" for year, course in scopes]
+
+
+def _reassign_hod_roles(faculty_id, college, years, courses, scopes):
+    """Phase 1 (one transaction); returns the previous HODs it demoted."""
     hod_role = get_role_by_name("HOD")
     faculty_role = get_role_by_name("FACULTY")
 
+    # 🔴 PREVIOUS HODs OF THESE SCOPES
+    old_hods = set(get_mapped_hod_ids(college, scopes)) | set(get_mentor_mapped_hod_ids(college, scopes))
+    old_hods.discard(faculty_id)
+    mentors_by_scope = get_mentor_ids_by_year_course(college, scopes)
+
     with client.start_session() as s:
         with s.start_transaction():
 
-            for year in years:
-                for course in courses:
-
-                    # 🔴 REMOVE OLD HOD (ONLY THIS SCOPE)
-                    old = get_hod_for_year_course(college, year, course)
-                    if old:
-                        old_hod = old["hod_id"]
-
-                        delete_hod_mappings_for_scope(
-                            old_hod, college, year, course, session=s
-                        )
-                        delete_hod_mentor_mappings_for_scope(
-                            old_hod, college, year, course, session=s
-                        )
-
-                        delete_specific_role(
-                            old_hod, hod_role["_id"], session=s
-                        )
-                        assign_role(
-                            old_hod, faculty_role["_id"], session=s
-                        )
-
-                    # 🟢 ASSIGN HOD ROLE (IDEMPOTENT)
-                    delete_specific_role(
-                        faculty_id, faculty_role["_id"], session=s
-                    )
-                    assign_role(
-                        faculty_id, hod_role["_id"], session=s
-                    )
-
-                    # 🟢 MAP STUDENTS (ONLY SELECTED COHORT)
-                    students = db["students"].find(
-                        {
-                            "college": college,
-                            "year": year,
-                            "course": course
-                        },
-                        session=s
-                    )
-
-                    for st in students:
-                        map_student_to_hod(
-                            student_id=st["_id"],
-                            hod_id=faculty_id,
-                            college=college,
-                            year=year,
-                            course=course,
-                            session=s
-                        )
-
-                    # 🟢 MAP MENTORS (DERIVED FROM STUDENT_MENTOR)
-                    mentor_ids = db["student_mentor_mapping"].distinct(
-                        "mentor_id",
-                        {
-                            "college": college,
-                            "year": year,
-                            "course": course
-                        }
-                    )
-
-                    for mid in mentor_ids:
-                        create_hod_mentor_mapping(
-                            {
-                                "hod_id": faculty_id,
-                                "mentor_id": mid,
-                                "college": college,
-                                "year": year,
-                                "course": course,
-                                "created_at": datetime.utcnow()
-                            },
-                            session=s
-                        )
-
-    return success("HOD assigned successfully")
+            # 🔴 OLD HODs -> FACULTY (once each)
+            for old_hod in old_hods:
+                delete_specific_role(old_hod, hod_role["_id"], session=s)
+                assign_role(old_hod, faculty_role["_id"], session=s)
+            # ...and out of every HOD scope, not just the reassigned ones
+            remove_faculty_from_scopes(old_hods, kind="hod", session=s)
+
+            # 🟢 ASSIGN HOD ROLE (IDEMPOTENT)
+            delete_specific_role(faculty_id, faculty_role["_id"], session=s)
+            assign_role(faculty_id, hod_role["_id"], session=s)
+
+            # 🟢 MAP MENTORS (DERIVED FROM STUDENT_MENTOR)
+            delete_hod_mentor_mappings_for_scopes(old_hods | {faculty_id}, college, scopes, session=s)
+            now = datetime.utcnow()
+            create_hod_mentor_mappings(
+                [
+                    {
+                        "hod_id": faculty_id,
+                        "mentor_id": mid,
+                        "college": college,
+                        "year": year,
+                        "course": course,
+                        "created_at": now
+                    }
+                    for (year, course), mentor_ids in mentors_by_scope.items()
+                    for mid in mentor_ids
+                ],
+                session=s
+            )
+
+            # 🟢 SCOPE MAP: this faculty is now the only HOD of these scopes
+            set_hod_scopes(college, years, courses, [faculty_id], session=s)
+
+    invalidate_scope_map()
+    # Role changes are visible to require_roles only after the commit
+    for user_id in old_hods | {faculty_id}:
+        invalidate_user_cache(user_id)
+    return old_hods
+
+
+@job_handler("assign_hod")
+def run_assign_hod_job(ctx):
+    params = ctx.params
+    hod_id = params["hod_id"]
+    college = params["college"]
+    scopes = [tuple(sc) for sc in params["scopes"]]
+
+    checkpoint = ctx.checkpoint or {"scope": 0, "last_id": None}
+    done = ctx.done
+    total = ctx.total
+    if total is None:
+        total = count_students_in_scopes(college, scopes)
+        ctx.progress(done, total, checkpoint=checkpoint)
+
+    for index in range(checkpoint["scope"], len(scopes)):
+        year, course = scopes[index]
+        after_id = checkpoint["last_id"] if index == checkpoint["scope"] else None
+        for student_ids in iter_student_id_batches(
+            {"college": college, "year": year, "course": course},
+            Config.HOD_ASSIGN_BATCH_SIZE,
+            after_id=after_id
+        ):
+            bulk_map_students_to_hod(student_ids, hod_id, college, year, course)
+            done += len(student_ids)
+            ctx.progress(done, checkpoint={"scope": index, "last_id": student_ids[-1]})
+        ctx.progress(done, checkpoint={"scope": index + 1, "last_id": None})
+
+    # Mappings of the previous HODs that no current student was repointed over
+    delete_hod_mappings_for_scopes(params["old_hod_ids"], college, scopes)
+    rebuild_faculty_read_model([hod_id] + list(params["old_hod_ids"]))
+    return {"students_mapped": done}
 
 def get_hod_assignments_service(hod_id):
     return success(
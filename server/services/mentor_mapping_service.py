@@ -2,48 +2,62 @@ from datetime import datetime
 from fastapi import HTTPException
 
 from core.global_response import success
+from utils.cache import invalidate_user_cache
 from extensions.mongo import client
 
-from data.student_repo import get_students_by_college_year_course_section
+from data.student_repo import get_student_ids_by_college_year_course_section
 from data.student_mentor_repo import (
-    delete_student_mentor_mappings_by_students,
-    get_existing_mentor_ids_for_students,
+    get_mentor_pairs_for_students,
+    delete_mentor_mappings_except,
+    update_mentor_mapping_scope,
+    get_mentors_with_other_mappings,
     insert_student_mentor_mappings,
     get_all_mentor_mappings
 )
 
+from data.scope_map_repo import (
+    get_mentor_ids_for_scope,
+    set_mentor_scope,
+    remove_faculty_from_scopes,
+    invalidate_scope_map
+)
+from data.faculty_read_model_repo import rebuild_faculty_read_model
 from data.roles_repo import get_role_by_name
-from data.user_roles_repo import assign_role, delete_specific_role
+from data.user_roles_repo import get_role_ids_for_users, set_roles_bulk
 
 
 # ==========================================================
 # ASSIGN MENTORS (ROLE SWITCH LOGIC)
 # ==========================================================
 def assign_mentors_service(payload):
+    """
+    Diff-based: only mappings / roles that actually change are written, so
+    re-running an unchanged assignment is a handful of reads and no writes.
+    """
 
     # --------------------------------------------------
     # 1️⃣ Basic validation
     # --------------------------------------------------
-    if len(payload.mentor_ids) != 2:
+    mentor_ids = list(dict.fromkeys(payload.mentor_ids))
+    if len(mentor_ids) != 2:
         raise HTTPException(400, "Exactly 2 mentors must be selected")
 
-    students = get_students_by_college_year_course_section(
+    student_ids = get_student_ids_by_college_year_course_section(
         payload.college,
         payload.year,
         payload.course,
         payload.section
     )
 
-    if not students:
+    if not student_ids:
         raise HTTPException(404, "No students found")
 
-    student_ids = [s["_id"] for s in students]
-
     # --------------------------------------------------
     # 2️⃣ Role validation
     # --------------------------------------------------
     mentor_role = get_role_by_name("MENTOR")
     faculty_role = get_role_by_name("FACULTY")
+    hod_role = get_role_by_name("HOD")
 
     if not mentor_role or not faculty_role:
         raise HTTPException(500, "Role configuration missing")
@@ -52,76 +66,95 @@ def assign_mentors_service(payload):
     faculty_role_id = faculty_role["_id"]
 
     # --------------------------------------------------
-    # 3️⃣ Transaction
+    # 3️⃣ Diff against current state
+    # --------------------------------------------------
+    scope = (payload.college, payload.year, payload.course, payload.section)
+    new_mentors = set(mentor_ids)
+    existing = get_mentor_pairs_for_students(student_ids)
+    existing_pairs = {(m["student_id"], m["mentor_id"]) for m in existing}
+    old_mentor_ids = {m["mentor_id"] for m in existing}
+
+    stale = [m for m in existing if m["mentor_id"] not in new_mentors]
+    moved = [
+        m for m in existing
+        if m["mentor_id"] in new_mentors
+        and (m.get("college"), m.get("year"), m.get("course"), m.get("section")) != scope
+    ]
+    created_at = datetime.utcnow()
+    to_insert = [
+        {
+            "student_id": str(sid),  # Ensure string
+            "mentor_id": mid,
+            "college": payload.college,
+            "year": payload.year,
+            "course": payload.course,
+            "section": payload.section,
+            "created_at": created_at
+        }
+        for sid in student_ids
+        for mid in mentor_ids
+        if (sid, mid) not in existing_pairs
+    ]
+
+    # OLD mentors -> back to FACULTY, unless they still mentor another section
+    removed = old_mentor_ids - new_mentors
+    if removed:
+        removed -= set(get_mentors_with_other_mappings(removed, student_ids))
+    current_roles = get_role_ids_for_users(removed | new_mentors)
+    role_changes = {
+        mid: faculty_role_id for mid in removed
+        if current_roles.get(mid) == mentor_role_id
+    }
+    # NEW mentors -> MENTOR ONLY
+    role_changes.update({
+        mid: mentor_role_id for mid in new_mentors
+        if current_roles.get(mid) != mentor_role_id
+    })
+
+    # Role switches take the faculty out of the scopes of the role they lose
+    unmentored = [mid for mid, rid in role_changes.items() if rid == faculty_role_id]
+    unhodded = [
+        mid for mid in role_changes
+        if hod_role and current_roles.get(mid) == hod_role["_id"]
+    ]
+
+    scope_changed = set(get_mentor_ids_for_scope(*scope)) != new_mentors
+
+    summary = {
+        "students": len(student_ids),
+        "mappings_removed": len(stale),
+        "mappings_added": len(to_insert),
+        "mappings_rescoped": len(moved),
+        "role_changes": len(role_changes)
+    }
+    if not (stale or moved or to_insert or role_changes or scope_changed):
+        return success("Mentor assignment unchanged", summary)
+
+    # --------------------------------------------------
+    # 4️⃣ Transaction (only the changed parts)
     # --------------------------------------------------
     with client.start_session() as s:
         with s.start_transaction():
-
-            # ------------------------------------------
-            # 3️⃣ Fetch old mentors
-            # ------------------------------------------
-            old_mentor_ids = get_existing_mentor_ids_for_students(student_ids)
-
-            # ------------------------------------------
-            # 4️⃣ Delete old mappings
-            # ------------------------------------------
-            delete_student_mentor_mappings_by_students(
-                student_ids,
-                session=s
-            )
-
-            # ------------------------------------------
-            # 5️⃣ OLD mentors → back to FACULTY
-            # ------------------------------------------
-            for mid in old_mentor_ids:
-                # Remove mentor role
-                delete_specific_role(mid, mentor_role_id, session=s)
-
-                # Restore faculty role
-                assign_role(
-                    user_id=mid,
-                    role_id=faculty_role_id,
-                    session=s
-                )
-
-            # ------------------------------------------
-            # 6️⃣ Create new mappings (both mentors for all students)
-            # ------------------------------------------
-            mappings = []
-
-            for student in students:
-                for mentor_id in payload.mentor_ids:
-                    mappings.append({
-                        "student_id": str(student["_id"]),  # Ensure string
-                        "mentor_id": mentor_id,
-                        "college": payload.college,
-                        "year": payload.year,
-                        "course": payload.course,
-                        "section": payload.section,
-                        "created_at": datetime.utcnow()
-                    })
-
-            insert_student_mentor_mappings(mappings, session=s)
-
-            # ------------------------------------------
-            # 7️⃣ NEW mentors → MENTOR ONLY
-            # ------------------------------------------
-            for mentor_id in payload.mentor_ids:
-                # Remove faculty role
-                delete_specific_role(
-                    mentor_id,
-                    faculty_role_id,
-                    session=s
-                )
-
-                # Assign mentor role
-                assign_role(
-                    user_id=mentor_id,
-                    role_id=mentor_role_id,
-                    session=s
-                )
-
-    return success("Mentors assigned and roles updated successfully")
+            if stale:
+                delete_mentor_mappings_except(student_ids, new_mentors, session=s)
+            if moved:
+                update_mentor_mapping_scope(student_ids, new_mentors, *scope, session=s)
+            if to_insert:
+                insert_student_mentor_mappings(to_insert, session=s)
+            if role_changes:
+                set_roles_bulk(role_changes, session=s)
+                remove_faculty_from_scopes(unmentored, kind="mentor", session=s)
+                remove_faculty_from_scopes(unhodded, kind="hod", session=s)
+            if scope_changed:
+                # Scope map for students registered later
+                set_mentor_scope(*scope, mentor_ids, session=s)
+
+    invalidate_scope_map()
+    for user_id in role_changes:
+        invalidate_user_cache(user_id)
+    if stale or moved or to_insert or scope_changed or role_changes:
+        rebuild_faculty_read_model(sorted(old_mentor_ids | new_mentors))
+    return success("Mentors assigned and roles updated successfully", summary)
 
 
 # ==========================================================
@@ -0,0 +1,177 @@
+"""
+Parent SMS outbox worker.
+
+`mark_left` stores an `sms_notification` job on the request document in the
+same update that flips it to LEFT_CAMPUS. A small pool of daemon threads
+claims due jobs with `find_one_and_update`, resolves parent / HOD numbers,
+sends through `send_sms_with_failover` and writes the delivery status back.
+Failed sends are retried with exponential backoff up to SMS_MAX_ATTEMPTS.
+"""
+import random
+import threading
+from datetime import datetime, timedelta
+
+from config import Config
+from data.requests_repo import claim_due_notification, update_notification
+from data.student_repo import get_student_by_id
+from data.faculty_repo import get_faculty_by_id
+from services.sms_service import build_left_campus_message, send_sms_with_failover
+
+PENDING = "PENDING"
+RETRY = "RETRY"
+SENT = "SENT"
+FAILED = "FAILED"
+SKIPPED = "SKIPPED"
+
+
+def new_left_campus_job(now=None):
+    now = now or datetime.utcnow()
+    return {
+        "type": "LEFT_CAMPUS",
+        "status": PENDING,
+        "attempts": 0,
+        "created_at": now,
+        "next_attempt_at": now,
+        "deliveries": {},
+        "last_error": None
+    }
+
+
+def _backoff_seconds(attempts):
+    delay = Config.SMS_RETRY_BASE_SECONDS * (2 ** max(attempts - 1, 0))
+    delay = min(delay, Config.SMS_RETRY_MAX_SECONDS)
+    # Jitter so a provider outage doesn't produce synchronized retry waves
+    return delay * random.uniform(0.8, 1.2)
+
+
+# ===============================================================
+# JOB PROCESSING
+# ===============================================================
+def _resolve_recipients(req):
+    father = req.get("father_mobile") or ""
+    mother = req.get("mother_mobile") or ""
+    if not father or not mother:
+        sid = req.get("student_id")
+        student = get_student_by_id(str(sid)) if sid is not None else None
+        if student:
+            father = father or student.get("father_mobile") or ""
+            mother = mother or student.get("mother_mobile") or ""
+    return {k: v for k, v in (("father", father), ("mother", mother)) if v}
+
+
+def _resolve_hod_contact(req):
+    hod_name = req.get("hod_name") or ""
+    hod_phone = ""
+    if req.get("hod_id"):
+        hod_doc = get_faculty_by_id(str(req["hod_id"]))
+        if hod_doc:
+            hod_name = hod_name or hod_doc.get("name") or ""
+            hod_phone = hod_doc.get("phone") or hod_doc.get("mobile") or ""
+    return hod_name, hod_phone
+
+
+def process_notification(req):
+    job = req["sms_notification"]
+    now = datetime.utcnow()
+    deliveries = dict(job.get("deliveries") or {})
+
+    recipients = _resolve_recipients(req)
+    if not recipients:
+        print("[SMS] No parent numbers for request", req["_id"], "- add father_mobile/mother_mobile on student")
+        update_notification(req["_id"], {"status": SKIPPED, "finished_at": now, "last_error": "no_recipients"})
+        return SKIPPED
+
+    hod_name, hod_phone = _resolve_hod_contact(req)
+    message = build_left_campus_message(
+        req.get("student_id") or "",
+        req.get("student_name") or "",
+        req.get("reason") or "",
+        hod_name,
+        hod_phone
+    )
+
+    # Parents already reached on an earlier attempt are not re-sent; the rest
+    # share one message, so they go out as a single batched provider call.
+    pending = {who: phone for who, phone in recipients.items()
+               if deliveries.get(who, {}).get("status") != SENT}
+    try:
+        ok, provider = send_sms_with_failover(list(pending.values()), message)
+    except Exception as e:
+        ok, provider = False, None
+        print(f"[SMS] send raised: {e}")
+    sent_at = datetime.utcnow()
+    for who in pending:
+        deliveries[who] = {"status": SENT if ok else FAILED, "provider": provider, "at": sent_at}
+    failed = [] if ok else list(pending)
+
+    attempts = job.get("attempts", 1)
+    if not failed:
+        status, updates = SENT, {"finished_at": datetime.utcnow(), "last_error": None}
+    elif attempts >= Config.SMS_MAX_ATTEMPTS:
+        status, updates = FAILED, {"finished_at": datetime.utcnow(), "last_error": f"failed: {','.join(failed)}"}
+    else:
+        status = RETRY
+        updates = {
+            "next_attempt_at": datetime.utcnow() + timedelta(seconds=_backoff_seconds(attempts)),
+            "last_error": f"failed: {','.join(failed)}"
+        }
+
+    update_notification(req["_id"], {"status": status, "deliveries": deliveries, "lease_until": None, **updates})
+    print(f"[SMS] request {req['_id']} attempt {attempts}: {status}")
+    return status
+
+
+# ===============================================================
+# WORKER POOL
+# ===============================================================
+class NotificationWorkerPool:
+    def __init__(self, workers=Config.SMS_WORKERS, poll_interval=Config.SMS_POLL_INTERVAL_SECONDS):
+        self.workers = workers
+        self.poll_interval = poll_interval
+        self._threads = []
+        self._stop = threading.Event()
+        self._wakeup = threading.Event()
+
+    def start(self):
+        if self._threads:
+            return
+        self._stop.clear()
+        for i in range(self.workers):
+            t = threading.Thread(target=self._run, name=f"sms-outbox-{i}", daemon=True)
+            t.start()
+            self._threads.append(t)
+
+    def stop(self, timeout=5.0):
+        self._stop.set()
+        self._wakeup.set()
+        for t in self._threads:
+            t.join(timeout)
+        self._threads = []
+
+    def wake(self):
+        """Skip the poll wait so a freshly queued job goes out immediately."""
+        self._wakeup.set()
+
+    def _claim(self):
+        now = datetime.utcnow()
+        return claim_due_notification(now, now + timedelta(seconds=Config.SMS_LEASE_SECONDS))
+
+    def _run(self):
+        while not self._stop.is_set():
+            try:
+                req = self._claim()
+            except Exception as e:
+                print(f"[SMS] outbox claim failed: {e}")
+                req = None
+            if req is None:
+                self._wakeup.wait(self.poll_interval)
+                self._wakeup.clear()
+                continue
+            try:
+                process_notification(req)
+            except Exception as e:
+                # Lease expiry hands the job to another attempt later
+                print(f"[SMS] outbox job {req.get('_id')} crashed: {e}")
+
+
+notification_workers = NotificationWorkerPool()
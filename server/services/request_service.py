@@ -10,8 +10,6 @@ from extensions.mongo import client
 from data.requests_repo import (
     create_request,
     get_request_by_id,
-    get_requests_by_student,
-    get_requests_by_hod,
     get_all_requests,
     get_requests_filtered,
     update_request,
@@ -19,20 +17,21 @@ from data.requests_repo import (
     auto_mark_unchecked,
     has_active_request,
     count_todays_requests,
-    get_todays_approved_requests,
     get_todays_requests_for_hod,
-    get_todays_requests_for_student,
     get_todays_requests_for_mentor,
-    get_approved_requests_for_guard_college
+    mark_left_with_notification
 )
 
-from data.student_hod_repo import get_hods_for_student, get_students_for_hod
+from data.student_hod_repo import get_hods_for_student, get_student_ids_for_hod
+from data.faculty_read_model_repo import get_faculty_read_model, student_ids_from
 from data.student_mentor_repo import get_students_for_mentor
 from data.student_repo import get_student_by_id
 from data.faces_repo import get_face_by_user
 from data.admin_repo import get_admin_by_id
 from data.faculty_repo import get_faculty_by_id, get_hod_by_id, get_hods_by_college, get_mentors_by_college, get_all_mentors
 from data.student_mentor_repo import get_mentors_for_hod_scope
+from data.aio import requests_repo as requests_repo_async
+from data.aio.faces_repo import get_faces_by_users as get_faces_by_users_async
 
 # ==========================================================
 # STATUS CONSTANTS
@@ -394,8 +393,8 @@ def service_get_hod_pending_requests(hod_id: str):
         _auto_clean()
 
         student_ids = {
-            str(m["student_id"])
-            for m in get_students_for_hod(hod_id)
+            str(sid)
+            for sid in get_student_ids_for_hod(hod_id)
         }
 
         if not student_ids:
@@ -485,104 +484,67 @@ def reject_request(request_id, hod_id, hod_name):
 # GUARD – MARK LEFT (with parent SMS notification)
 # ==========================================================
 def mark_left(request_id):
-    req = get_request_by_id(request_id)
-    if not req:
-        raise HTTPException(404, "Request not found")
-    if req.get("status") != APPROVED:
+    from services.notification_service import new_left_campus_job, notification_workers
+
+    # Status flip and SMS job land in one conditional write; the parent SMS
+    # is sent by the outbox workers, never on the guard's request.
+    now = datetime.utcnow()
+    updated = mark_left_with_notification(request_id, now, new_left_campus_job(now))
+    if updated is None:
+        if not get_request_by_id(request_id):
+            raise HTTPException(404, "Request not found")
         raise HTTPException(409, "Only approved requests can be marked as left")
 
-    update_request(request_id, {
-        "status": LEFT_CAMPUS,
-        "left_time": datetime.utcnow()
-    })
-
-    # Send SMS to both parents
-    try:
-        from services.sms_service import send_left_campus_notification
-        father_mobile = req.get("father_mobile") or ""
-        mother_mobile = req.get("mother_mobile") or ""
-        if not father_mobile or not mother_mobile:
-            sid = req.get("student_id")
-            if sid is not None:
-                sid = str(sid)
-            student = get_student_by_id(sid)
-            if student:
-                father_mobile = father_mobile or student.get("father_mobile") or ""
-                mother_mobile = mother_mobile or student.get("mother_mobile") or ""
-        if not father_mobile and not mother_mobile:
-            print("[SMS] No parent numbers for request", request_id, "- add father_mobile/mother_mobile on student")
-        else:
-            hod_name = req.get("hod_name") or ""
-            hod_phone = ""
-            if req.get("hod_id"):
-                hod_doc = get_faculty_by_id(str(req["hod_id"]))
-                if hod_doc:
-                    hod_name = hod_name or hod_doc.get("name") or ""
-                    hod_phone = hod_doc.get("phone") or hod_doc.get("mobile") or ""
-            send_left_campus_notification(
-                student_roll=req.get("student_id") or "",
-                student_name=req.get("student_name") or "",
-                reason=req.get("reason") or "",
-                father_mobile=father_mobile,
-                mother_mobile=mother_mobile,
-                hod_name=hod_name,
-                hod_phone=hod_phone,
-            )
-    except Exception as e:
-        print("[SMS] Parent notification failed:", e)
-        import traceback
-        traceback.print_exc()
-
+    notification_workers.wake()
     return success("Student marked left")
 
 
 # ==========================================================
-# READ-ONLY SERVICES (UNCHANGED)
+# READ-ONLY SERVICES (ASYNC)
+# Served from `async def` routes: the DB calls run on the async Mongo pool
+# instead of occupying a threadpool worker per poll.
 # ==========================================================
-def service_get_student_requests(student_id):
-    auto_mark_unchecked()
-    reqs = get_requests_by_student(student_id)
+async def service_get_student_requests_async(student_id):
+    await requests_repo_async.auto_mark_unchecked()
+    reqs = await requests_repo_async.get_requests_by_student(student_id)
     reqs = [_stringify_ids(r) for r in reqs]
     return success("Student requests", reqs)
 
 
-
-def service_get_hod_requests(hod_id):
-    auto_mark_unchecked()
-    reqs = get_requests_by_hod(hod_id)
+async def service_get_hod_requests_async(hod_id):
+    await requests_repo_async.auto_mark_unchecked()
+    reqs = await requests_repo_async.get_requests_by_hod(hod_id)
     reqs = [_stringify_ids(r) for r in reqs]
     return success("HOD requests", reqs)
 
 
-
-def service_get_all_requests():
-    auto_mark_unchecked()
-    reqs = get_all_requests()
+async def service_get_all_requests_async():
+    await requests_repo_async.auto_mark_unchecked()
+    reqs = await requests_repo_async.get_all_requests()
     reqs = [_stringify_ids(r) for r in reqs]
     return success("All requests", reqs)
 
 
-
-def service_get_todays_approved():
-    auto_mark_unchecked()
-    return success("Today approved", get_todays_approved_requests())
+async def service_get_todays_approved_async():
+    await requests_repo_async.auto_mark_unchecked()
+    return success("Today approved", await requests_repo_async.get_todays_approved_requests())
 
 
-def service_get_student_todays_requests(student_id):
-    auto_mark_unchecked()
-    reqs = get_todays_requests_for_student(student_id)
+async def service_get_student_todays_requests_async(student_id):
+    await requests_repo_async.auto_mark_unchecked()
+    reqs = await requests_repo_async.get_todays_requests_for_student(student_id)
     reqs = [_stringify_ids(r) for r in reqs]
     return success("Today's student requests", reqs)
 
 
+async def service_get_guard_approved_requests_async(college: str):
+    await requests_repo_async.auto_mark_unchecked()
+    reqs = await requests_repo_async.get_approved_requests_for_guard_college(college)
 
-def service_get_guard_approved_requests(college: str):
-    auto_mark_unchecked()
-    reqs = get_approved_requests_for_guard_college(college)
-
+    faces = await get_faces_by_users_async([r["student_id"] for r in reqs])
     for r in reqs:
         r["_id"] = str(r["_id"])
-        face = get_face_by_user(r["student_id"])
+        face = faces.get(r["student_id"])
         r["student_face"] = (
             base64.b64encode(face["image_data"]).decode()
             if face else None
@@ -716,21 +678,26 @@ def service_filter_requests(filters: dict, user_id: str, role_name: str):
             raise HTTPException(status_code=403, detail="Admin college not found")
         query["college"] = admin_doc["college"]
     elif role_name == "HOD":
-        faculty_doc = get_faculty_by_id(user_id)
+        # One faculty read when the read model is built
+        faculty_doc = get_faculty_read_model(user_id) or get_faculty_by_id(user_id)
         if not faculty_doc or not faculty_doc.get("college"):
             raise HTTPException(status_code=403, detail="HOD college not found")
         query["college"] = faculty_doc["college"]
-        rows = get_students_for_hod(user_id)
-        allowed_student_ids = [str(r["student_id"]) for r in rows]
+        student_ids = student_ids_from(faculty_doc, "hod")
+        if student_ids is None:
+            student_ids = get_student_ids_for_hod(user_id)
+        allowed_student_ids = [str(sid) for sid in student_ids]
         if not allowed_student_ids:
             return success("Filtered requests", {"total": 0, "page": page, "pageSize": page_size, "items": []})
         query["student_id"] = {"$in": allowed_student_ids}
     elif role_name == "MENTOR":
-        faculty_doc = get_faculty_by_id(user_id)
+        faculty_doc = get_faculty_read_model(user_id) or get_faculty_by_id(user_id)
         if not faculty_doc or not faculty_doc.get("college"):
             raise HTTPException(status_code=403, detail="Mentor college not found")
         query["college"] = faculty_doc["college"]
-        student_ids = get_students_for_mentor(user_id)
+        student_ids = student_ids_from(faculty_doc, "mentor")
+        if student_ids is None:
+            student_ids = get_students_for_mentor(user_id)
         allowed_student_ids = [str(sid) for sid in student_ids]
         if not allowed_student_ids:
             return success("Filtered requests", {"total": 0, "page": page, "pageSize": page_size, "items": []})
@@ -0,0 +1,217 @@
+"""
+SMS provider clients.
+
+Each provider keeps one persistent httpx.Client (keep-alive + TLS reuse),
+sends every recipient that shares a message in as few HTTP calls as the
+gateway allows (both Fast2SMS bulkV2 and MSG91 sendhttp take comma-separated
+numbers), and gates outbound calls with a concurrency limit plus a token
+bucket sized to the provider quota.
+
+Base URLs can be overridden (SMS_FAST2SMS_BASE_URL / SMS_MSG91_BASE_URL)
+to point at `utils/fake_sms_server.py` locally.
+"""
+import logging
+import os
+import threading
+import time
+
+from config import Config
+
+logger = logging.getLogger(__name__)
+
+
+class TokenBucket:
+    """Thread-safe token bucket: `rate` tokens/second, bursts up to `capacity`."""
+
+    def __init__(self, rate, capacity):
+        self.rate = float(rate)
+        self.capacity = float(capacity)
+        self._tokens = float(capacity)
+        self._updated = time.monotonic()
+        self._lock = threading.Lock()
+
+    def acquire(self, tokens=1, timeout=None):
+        deadline = None if timeout is None else time.monotonic() + timeout
+        while True:
+            with self._lock:
+                now = time.monotonic()
+                self._tokens = min(self.capacity, self._tokens + (now - self._updated) * self.rate)
+                self._updated = now
+                if self._tokens >= tokens:
+                    self._tokens -= tokens
+                    return True
+                wait = (tokens - self._tokens) / self.rate if self.rate > 0 else 1.0
+            if deadline is not None and time.monotonic() + wait > deadline:
+                return False
+            time.sleep(wait)
+
+
+def _local_number(phone):
+    # Providers expect the 10-digit number without the "91" country code
+    return phone[2:] if phone.startswith("91") and len(phone) >= 12 else phone
+
+
+# ===============================================================
+# PROVIDER BASE
+# ===============================================================
+class SmsProvider:
+    name = None
+    default_base_url = None
+
+    def __init__(self, base_url=None, max_concurrency=4, rate_per_sec=5, burst=10, max_batch=50):
+        self.base_url = base_url or self.default_base_url
+        self.max_batch = max_batch
+        self.max_concurrency = max_concurrency
+        self._semaphore = threading.BoundedSemaphore(max_concurrency)
+        self._bucket = TokenBucket(rate_per_sec, burst)
+        self._client = None
+        self._client_lock = threading.Lock()
+
+    @property
+    def client(self):
+        if self._client is None:
+            with self._client_lock:
+                if self._client is None:
+                    import httpx
+                    self._client = httpx.Client(
+                        base_url=self.base_url,
+                        timeout=httpx.Timeout(10.0, connect=5.0),
+                        limits=httpx.Limits(
+                            max_connections=self.max_concurrency,
+                            max_keepalive_connections=self.max_concurrency
+                        ),
+                    )
+        return self._client
+
+    def is_configured(self):
+        raise NotImplementedError
+
+    def _send_batch(self, numbers, message):
+        """Send one HTTP request for `numbers` (already local format). Returns bool."""
+        raise NotImplementedError
+
+    def send(self, phones, message, timeout=Config.SMS_RATE_LIMIT_WAIT_SECONDS):
+        """Send `message` to every normalized phone in `phones`. True only if all batches succeed."""
+        if not self.is_configured():
+            logger.warning("%s: API key missing or placeholder", self.name)
+            return False
+        numbers = [_local_number(p) for p in phones]
+        ok = True
+        for i in range(0, len(numbers), self.max_batch):
+            batch = numbers[i:i + self.max_batch]
+            if not self._bucket.acquire(timeout=timeout):
+                print(f"[SMS] {self.name}: rate limit wait exceeded, deferring {len(batch)} recipient(s)")
+                ok = False
+                continue
+            with self._semaphore:
+                try:
+                    ok = self._send_batch(batch, message[:1600]) and ok
+                except Exception as e:
+                    print(f"[SMS] {self.name} EXCEPTION: {type(e).__name__}: {e}")
+                    logger.warning("%s failed: %s", self.name, e)
+                    ok = False
+        return ok
+
+    def close(self):
+        if self._client is not None:
+            self._client.close()
+            self._client = None
+
+
+# ===============================================================
+# FAST2SMS (Quick SMS route, no DLT)
+# ===============================================================
+class Fast2SmsProvider(SmsProvider):
+    name = "fast2sms"
+    default_base_url = "https://www.fast2sms.com"
+
+    def _api_key(self):
+        return os.environ.get("FAST2SMS_API_KEY") or os.environ.get("SMS_API_KEY")
+
+    def is_configured(self):
+        key = self._api_key()
+        return bool(key) and not key.startswith("REPLACE_")
+
+    def _send_batch(self, numbers, message):
+        print(f"[SMS] Fast2SMS POST: route=q, recipients={len(numbers)}, message_len={len(message)}")
+        resp = self.client.post(
+            "/dev/bulkV2",
+            json={"route": "q", "message": message, "numbers": ",".join(numbers)},
+            headers={"Authorization": self._api_key()},
+        )
+        if resp.status_code >= 400:
+            print(f"[SMS] Fast2SMS HTTP ERROR {resp.status_code}: {resp.text[:500]}")
+            logger.warning("Fast2SMS HTTP %s: %s", resp.status_code, resp.text[:200])
+            return False
+        result = resp.json() if resp.text.strip() else {}
+        if result.get("return") is not True:
+            print(f"[SMS] Fast2SMS response not OK: {result}")
+            logger.warning("Fast2SMS response not OK: %s", result)
+            return False
+        print(f"[SMS] Fast2SMS SUCCESS: {result.get('message', 'OK')}")
+        return True
+
+
+# ===============================================================
+# MSG91 (requires DLT + 6-char sender)
+# ===============================================================
+class Msg91Provider(SmsProvider):
+    name = "msg91"
+    default_base_url = "https://api.msg91.com"
+
+    def _auth_key(self):
+        return os.environ.get("MSG91_AUTH_KEY") or os.environ.get("SMS_API_KEY")
+
+    def is_configured(self):
+        return bool(self._auth_key())
+
+    def _send_batch(self, numbers, message):
+        resp = self.client.get("/api/sendhttp.php", params={
+            "mobiles": ",".join(numbers),
+            "authkey": self._auth_key(),
+            "sender": os.environ.get("MSG91_SENDER_ID", "FACES"),
+            "message": message,
+            "route": "4",
+        })
+        if resp.status_code != 200:
+            logger.warning("MSG91 HTTP %s: %s", resp.status_code, resp.text[:200])
+            return False
+        return True
+
+
+_PROVIDER_CLASSES = {
+    "msg91": Msg91Provider,
+    "fast2sms": Fast2SmsProvider,
+}
+
+_providers = {}
+_providers_lock = threading.Lock()
+
+
+def get_provider(name):
+    """Process-wide provider instance (shares its HTTP pool and limits)."""
+    if name not in _PROVIDER_CLASSES:
+        return None
+    if name not in _providers:
+        with _providers_lock:
+            if name not in _providers:
+                prefix = f"SMS_{name.upper()}_"
+                _providers[name] = _PROVIDER_CLASSES[name](
+                    base_url=os.getenv(prefix + "BASE_URL"),
+                    max_concurrency=int(os.getenv(prefix + "MAX_CONCURRENCY", "4")),
+                    rate_per_sec=float(os.getenv(prefix + "RATE_PER_SEC", "5")),
+                    burst=int(os.getenv(prefix + "BURST", "10")),
+                    max_batch=int(os.getenv(prefix + "MAX_BATCH", "50")),
+                )
+    return _providers[name]
+
+
+def provider_names():
+    return list(_PROVIDER_CLASSES)
+
+
+def close_providers():
+    with _providers_lock:
+        for provider in _providers.values():
+            provider.close()
+        _providers.clear()
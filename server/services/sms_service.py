@@ -11,6 +11,8 @@ import os
 import re
 import logging
 
+from services.sms_providers import get_provider, provider_names
+
 logger = logging.getLogger(__name__)
 
 
@@ -27,97 +29,50 @@ def _normalize_phone(phone: str) -> str:
 
 
 def _send_msg91(phone: str, message: str) -> bool:
-    auth_key = os.environ.get("MSG91_AUTH_KEY") or os.environ.get("SMS_API_KEY")
-    if not auth_key:
-        return False
-    try:
-        import urllib.request
-        import urllib.parse
-        url = "https://api.msg91.com/api/sendhttp.php"
-        params = urllib.parse.urlencode({
-            "mobiles": phone.lstrip("91") if phone.startswith("91") else phone,
-            "authkey": auth_key,
-            "sender": os.environ.get("MSG91_SENDER_ID", "FACES"),
-            "message": message[:1600],
-            "route": "4",
-        })
-        full_url = f"{url}?{params}"
-        # Removed undefined _validate_outbound_url
-        req = urllib.request.Request(full_url)
-        with urllib.request.urlopen(req, timeout=10) as resp:  # nosec B310
-            return resp.status == 200
-    except Exception as e:
-        logger.warning("MSG91 SMS failed: %s", e)
-        return False
+    return get_provider("msg91").send([phone], message)
 
 
 def _send_fast2sms(phone: str, message: str) -> bool:
     """Quick SMS route (q): no DLT registration or 6-char sender ID needed."""
-    api_key = os.environ.get("FAST2SMS_API_KEY") or os.environ.get("SMS_API_KEY")
-    if not api_key or api_key.startswith("REPLACE_"):
-        print(f"[SMS] Fast2SMS: API key missing or placeholder (key starts with: {api_key[:10] if api_key else 'None'}...)")
-        logger.warning("Fast2SMS: API key missing or placeholder")
-        return False
-    
-    # Remove country code "91" prefix only (not all leading 9s and 1s)
-    if phone.startswith("91") and len(phone) >= 12:
-        num = phone[2:]  # Remove first 2 chars ("91")
-    else:
-        num = phone
-    print(f"[SMS] Fast2SMS: Sending to {num[:3]}**** (len={len(num)}), message length: {len(message)}")
-    
-    try:
-        import urllib.request
-        import urllib.error
-        import urllib.parse
-        import json
-        
-        # Try POST method first (more reliable for Fast2SMS)
-        url = "https://www.fast2sms.com/dev/bulkV2"
-        payload = {
-            "route": "q",
-            "message": message[:1600],
-            "numbers": num,
-        }
-        data = json.dumps(payload).encode('utf-8')
-        
-        print(f"[SMS] Fast2SMS POST: route=q, numbers={num}, message_len={len(message)}")
-        
-        # Removed undefined _validate_outbound_url
-        req = urllib.request.Request(url, data=data, method="POST")
-        req.add_header("Authorization", api_key)
-        req.add_header("Content-Type", "application/json")
-        
-        with urllib.request.urlopen(req, timeout=15) as resp:
-            body = resp.read().decode()
-            print(f"[SMS] Fast2SMS response body: {body[:500]}")
-            result = json.loads(body) if body.strip() else {}
-            ok = result.get("return") is True
-            if not ok:
-                print(f"[SMS] Fast2SMS response not OK: {result}")
-                logger.warning("Fast2SMS response not OK: %s", result)
-            else:
-                print(f"[SMS] Fast2SMS SUCCESS: {result.get('message', 'OK')}")
-            return ok
-    except urllib.error.HTTPError as e:
-        try:
-            err_body = e.fp.read().decode() if e.fp else ""
-        except Exception:
-            err_body = str(e)
-        print(f"[SMS] Fast2SMS HTTP ERROR {e.code}: {err_body[:500]}")
-        logger.warning("Fast2SMS HTTP %s: %s", e.code, err_body[:200])
-        return False
-    except Exception as e:
-        print(f"[SMS] Fast2SMS EXCEPTION: {type(e).__name__}: {str(e)}")
-        logger.warning("Fast2SMS failed: %s", e)
-        import traceback
-        traceback.print_exc()
-        return False
+    return get_provider("fast2sms").send([phone], message)
 
 
     # Twilio support removed
 
 
+def _sms_enabled() -> bool:
+    return os.environ.get("SMS_ENABLED", "").lower() in ("true", "1", "yes")
+
+
+def provider_order() -> list:
+    """Configured SMS_PROVIDER first, then the remaining providers as failover."""
+    primary = os.environ.get("SMS_PROVIDER", "msg91").lower()
+    names = provider_names()
+    order = [primary] if primary in names else []
+    return order + [p for p in names if p != primary]
+
+
+def send_sms_with_failover(phones, message: str):
+    """
+    Send one message to one or more phones, batched into a single provider
+    call, trying each provider in `provider_order()` until one accepts it.
+    Returns (ok, provider_used). Used by the notification outbox worker.
+    """
+    if isinstance(phones, str):
+        phones = [phones]
+    normalized = [n for n in (_normalize_phone(p) for p in phones) if len(n) >= 10]
+    if not normalized or not message:
+        return False, None
+    if not _sms_enabled():
+        print(f"[SMS disabled] Would send to {len(normalized)} recipient(s): {message[:80]}...")
+        return True, "disabled"
+    for name in provider_order():
+        if get_provider(name).send(normalized, message):
+            return True, name
+        print(f"[SMS] {name} failed for {len(normalized)} recipient(s), trying next provider")
+    return False, None
+
+
 def send_sms(phone: str, message: str) -> bool:
     """Send SMS to the given phone number. Returns True if sent successfully."""
     print(f"[SMS] send_sms called with phone: {phone[:3] + '****' if phone else 'None'}")
@@ -135,7 +90,7 @@ def send_sms(phone: str, message: str) -> bool:
         logger.warning("[SMS] Invalid phone: %s", phone)
         return False
 
-    sms_enabled = os.environ.get("SMS_ENABLED", "").lower() in ("true", "1", "yes")
+    sms_enabled = _sms_enabled()
     provider = os.environ.get("SMS_PROVIDER", "msg91").lower()
     
     print(f"[SMS] Config: SMS_ENABLED={sms_enabled}, SMS_PROVIDER={provider}")
@@ -145,10 +100,8 @@ def send_sms(phone: str, message: str) -> bool:
         logger.info("[SMS disabled] Would send to %s: %s", normalized[:6] + "****", message[:80] + "...")
         return True  # Don't fail the caller
 
-    if provider == "msg91":
-        return _send_msg91(normalized, message)
-    if provider == "fast2sms":
-        return _send_fast2sms(normalized, message)
+    if provider in provider_names():
+        return get_provider(provider).send([normalized], message)
     # Twilio support removed
     
     print(f"[SMS] Unknown SMS_PROVIDER: {provider}")
@@ -156,6 +109,16 @@ def send_sms(phone: str, message: str) -> bool:
     return False
 
 
+def build_left_campus_message(student_roll, student_name, reason, hod_name, hod_phone) -> str:
+    reason_text = reason.strip() if reason else "not specified"
+    hod_parts = [p for p in [hod_name, hod_phone] if p]
+    hod_contact = "contact HOD - " + " ".join(hod_parts) if hod_parts else "contact HOD"
+    return (
+        f"Your ward with roll no {student_roll}, name {student_name} has left clg with reason: {reason_text}. "
+        f"If not given permission {hod_contact}."
+    )
+
+
 def send_left_campus_notification(
     student_roll: str,
     student_name: str,
@@ -170,30 +133,14 @@ def send_left_campus_notification(
     print(f"[SMS] Father mobile: {father_mobile[:3] + '****' if father_mobile else 'MISSING'}")
     print(f"[SMS] Mother mobile: {mother_mobile[:3] + '****' if mother_mobile else 'MISSING'}")
     
-    reason_text = reason.strip() if reason else "not specified"
-    hod_parts = [p for p in [hod_name, hod_phone] if p]
-    hod_contact = "contact HOD - " + " ".join(hod_parts) if hod_parts else "contact HOD"
-    message = (
-        f"Your ward with roll no {student_roll}, name {student_name} has left clg with reason: {reason_text}. "
-        f"If not given permission {hod_contact}."
-    )
-    
-    father_sent = False
-    mother_sent = False
-    
-    if father_mobile:
-        print(f"[SMS] Attempting to send to father: {father_mobile[:3]}****")
-        father_sent = send_sms(father_mobile, message)
-        print(f"[SMS] Father SMS result: {'SUCCESS' if father_sent else 'FAILED'}")
-    else:
-        print("[SMS] Father mobile missing - skipping")
-        
-    if mother_mobile:
-        print(f"[SMS] Attempting to send to mother: {mother_mobile[:3]}****")
-        mother_sent = send_sms(mother_mobile, message)
-        print(f"[SMS] Mother SMS result: {'SUCCESS' if mother_sent else 'FAILED'}")
-    else:
-        print("[SMS] Mother mobile missing - skipping")
+    message = build_left_campus_message(student_roll, student_name, reason, hod_name, hod_phone)
     
-    if not father_sent and not mother_sent:
+    # Both parents get the same text, so they go out in one batched provider call
+    phones = [p for p in (father_mobile, mother_mobile) if p]
+    if not phones:
+        print("[SMS] WARNING: No parent mobile numbers - nothing sent")
+        return
+    sent, provider = send_sms_with_failover(phones, message)
+    print(f"[SMS] Parent SMS result ({len(phones)} recipient(s)): {'SUCCESS via ' + provider if sent else 'FAILED'}")
+    if not sent:
         print("[SMS] WARNING: No SMS sent to either parent!")
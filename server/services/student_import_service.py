@@ -0,0 +1,317 @@
+"""
+Bulk student import (CSV / XLSX).
+
+Rows are parsed incrementally from the uploaded file and processed in chunks
+of STUDENT_IMPORT_CHUNK_SIZE:
+- every row is validated with the same StudentCreateRequest schema as
+  /student/create; duplicates inside the file and against the database are
+  rejected per row
+- passwords of the valid rows are hashed in parallel
+- HOD / mentor scope comes from the scope map (data/scope_map_repo.py),
+  a dictionary lookup per row
+- students, user_roles, student_hod and student_mentor_mapping are written
+  with one insert_many / bulk_write each, in one transaction per chunk
+
+The result is a summary plus a per-row error report; rows are numbered as in
+the file (header = row 1).
+"""
+import codecs
+import csv
+import os
+from concurrent.futures import ThreadPoolExecutor
+from datetime import datetime
+
+from fastapi import HTTPException, status
+from pydantic import ValidationError
+from pymongo import UpdateOne
+from pymongo.errors import PyMongoError
+
+from config import Config
+from core.global_response import success
+from data.roles_repo import get_role_by_name
+from data.scope_map_repo import get_hod_ids_for_scope, get_mentor_ids_for_scope
+from data.faculty_read_model_repo import add_students
+from extensions.mongo import client, db
+from schemas.api_request_models import StudentCreateRequest
+from security.passwords import hash_password
+from services.validators import ALLOWED_COLLEGES
+
+_FIELDS = ("id", "name", "phone", "father_mobile", "mother_mobile", "year", "course", "section", "college", "password")
+
+# Accepted header spellings -> StudentCreateRequest field
+_HEADER_ALIASES = {
+    "student_id": "id",
+    "roll_no": "id",
+    "roll_number": "id",
+    "mobile": "phone",
+    "father_phone": "father_mobile",
+    "mother_phone": "mother_mobile"
+}
+
+_hash_pool = ThreadPoolExecutor(
+    max_workers=Config.STUDENT_IMPORT_HASH_WORKERS,
+    thread_name_prefix="student-import-hash"
+)
+
+
+# ==========================================================
+# PARSING
+# ==========================================================
+def _normalize_header(name):
+    key = str(name or "").strip().lower().replace(" ", "_").replace("-", "_")
+    return _HEADER_ALIASES.get(key, key)
+
+
+def _clean(value):
+    if value is None:
+        return None
+    if isinstance(value, float) and value.is_integer():
+        # Excel stores phone numbers / years as floats
+        value = int(value)
+    value = str(value).strip()
+    return value or None
+
+
+def _check_header(header):
+    missing = [f for f in _FIELDS if f not in header and f not in ("father_mobile", "mother_mobile")]
+    if missing:
+        raise HTTPException(
+            status_code=status.HTTP_400_BAD_REQUEST,
+            detail=f"Missing columns: {', '.join(missing)}"
+        )
+
+
+def _iter_csv(fileobj):
+    # Decode line by line: UploadFile's SpooledTemporaryFile is not an
+    # io.IOBase on Python < 3.11, so it cannot be wrapped in a TextIOWrapper
+    reader = csv.reader(codecs.iterdecode(fileobj, "utf-8-sig"))
+    header = next(reader, None)
+    if header is None:
+        return
+    header = [_normalize_header(h) for h in header]
+    _check_header(header)
+    for row_no, values in enumerate(reader, start=2):
+        if not any(v.strip() for v in values):
+            continue
+        yield row_no, {h: _clean(v) for h, v in zip(header, values) if h in _FIELDS}
+
+
+def _iter_xlsx(fileobj):
+    try:
+        from openpyxl import load_workbook
+    except ImportError:
+        raise HTTPException(
+            status_code=status.HTTP_400_BAD_REQUEST,
+            detail="XLSX import is not available on this server; upload a CSV file"
+        )
+    workbook = load_workbook(fileobj, read_only=True, data_only=True)
+    try:
+        rows = workbook.active.iter_rows(values_only=True)
+        header = next(rows, None)
+        if header is None:
+            return
+        header = [_normalize_header(h) for h in header]
+        _check_header(header)
+        for row_no, values in enumerate(rows, start=2):
+            if not any(v is not None and str(v).strip() for v in values):
+                continue
+            yield row_no, {h: _clean(v) for h, v in zip(header, values) if h in _FIELDS}
+    finally:
+        workbook.close()
+
+
+def iter_import_rows(fileobj, filename):
+    """Yield (row_number, raw_row_dict) from a CSV or XLSX upload."""
+    ext = os.path.splitext(filename or "")[1].lower()
+    if ext == ".xlsx":
+        return _iter_xlsx(fileobj)
+    if ext in (".csv", ""):
+        return _iter_csv(fileobj)
+    raise HTTPException(
+        status_code=status.HTTP_400_BAD_REQUEST,
+        detail="Unsupported file type; upload .csv or .xlsx"
+    )
+
+
+def _chunks(rows, size):
+    chunk = []
+    for item in rows:
+        chunk.append(item)
+        if len(chunk) >= size:
+            yield chunk
+            chunk = []
+    if chunk:
+        yield chunk
+
+
+# ==========================================================
+# VALIDATION
+# ==========================================================
+def _validation_messages(exc):
+    messages = []
+    for err in exc.errors():
+        loc = ".".join(str(p) for p in err.get("loc", ()))
+        messages.append(f"{loc}: {err['msg']}" if loc else err["msg"])
+    return messages
+
+
+def _validate_chunk(chunk, created_by, seen_ids, seen_phones, report):
+    """Schema + in-file checks. Returns [(row_no, payload)] of candidate rows."""
+    valid = []
+    for row_no, raw in chunk:
+        try:
+            payload = StudentCreateRequest.model_validate({**raw, "created_by": created_by})
+        except ValidationError as e:
+            report.append({"row": row_no, "student_id": raw.get("id"), "errors": _validation_messages(e)})
+            continue
+
+        errors = []
+        if payload.college not in ALLOWED_COLLEGES:
+            errors.append(f"Invalid college: {payload.college}")
+        if payload.id in seen_ids:
+            errors.append(f"Duplicate student id in file (first seen on row {seen_ids[payload.id]})")
+        if payload.phone in seen_phones:
+            errors.append(f"Duplicate phone in file (first seen on row {seen_phones[payload.phone]})")
+        if errors:
+            report.append({"row": row_no, "student_id": payload.id, "errors": errors})
+            continue
+
+        seen_ids[payload.id] = row_no
+        seen_phones[payload.phone] = row_no
+        valid.append((row_no, payload))
+    return valid
+
+
+def _reject_existing(valid, report):
+    """Drop rows whose id or phone already belongs to a student (2 queries per chunk)."""
+    if not valid:
+        return valid
+    ids = [p.id for _, p in valid]
+    phones = [p.phone for _, p in valid]
+    existing_ids = {d["_id"] for d in db["students"].find({"_id": {"$in": ids}}, {"_id": 1})}
+    existing_phones = {d["phone"] for d in db["students"].find({"phone": {"$in": phones}}, {"phone": 1})}
+
+    kept = []
+    for row_no, payload in valid:
+        errors = []
+        if payload.id in existing_ids:
+            errors.append("Student already exists")
+        if payload.phone in existing_phones:
+            errors.append("Phone already registered")
+        if errors:
+            report.append({"row": row_no, "student_id": payload.id, "errors": errors})
+        else:
+            kept.append((row_no, payload))
+    return kept
+
+
+# ==========================================================
+# WRITE
+# ==========================================================
+def _write_chunk(valid, hashes, role_id, created_by):
+    now = datetime.utcnow()
+    students, roles, hod_ops, mentor_docs = [], [], [], []
+    hod_members, mentor_members = {}, {}
+    for (_, p), password_hash in zip(valid, hashes):
+        students.append({
+            "_id": p.id,
+            "name": p.name,
+            "phone": p.phone,
+            "father_mobile": p.father_mobile,
+            "mother_mobile": p.mother_mobile,
+            "year": p.year,
+            "course": p.course,
+            "section": p.section,
+            "college": p.college,
+            "created_by": created_by,
+            "password_hash": password_hash,
+            "face_id": None
+        })
+        roles.append({"user_id": p.id, "role_id": role_id, "assigned_at": now})
+        for hod_id in get_hod_ids_for_scope(p.college, p.year, p.course):
+            hod_members.setdefault(hod_id, []).append(p.id)
+            hod_ops.append(UpdateOne(
+                {"student_id": p.id, "hod_id": hod_id},
+                {"$set": {
+                    "student_id": p.id,
+                    "hod_id": hod_id,
+                    "year": p.year,
+                    "course": p.course,
+                    "college": p.college
+                }},
+                upsert=True
+            ))
+        for mentor_id in get_mentor_ids_for_scope(p.college, p.year, p.course, p.section):
+            mentor_members.setdefault(mentor_id, []).append(p.id)
+            mentor_docs.append({
+                "student_id": p.id,
+                "mentor_id": mentor_id,
+                "college": p.college,
+                "year": p.year,
+                "course": p.course,
+                "section": p.section,
+                "created_at": now
+            })
+
+    with client.start_session() as s:
+        with s.start_transaction():
+            db["students"].insert_many(students, ordered=False, session=s)
+            db["user_roles"].insert_many(roles, ordered=False, session=s)
+            if hod_ops:
+                db["student_hod"].bulk_write(hod_ops, ordered=False, session=s)
+            if mentor_docs:
+                db["student_mentor_mapping"].insert_many(mentor_docs, ordered=False, session=s)
+            for hod_id, ids in hod_members.items():
+                add_students([hod_id], "hod", ids, session=s)
+            for mentor_id, ids in mentor_members.items():
+                add_students([mentor_id], "mentor", ids, session=s)
+
+
+# ==========================================================
+# IMPORT
+# ==========================================================
+def import_students_service(fileobj, filename, created_by, dry_run=False):
+    role = get_role_by_name("STUDENT")
+    if not role:
+        raise HTTPException(status_code=500, detail="STUDENT role missing")
+
+    report = []
+    seen_ids, seen_phones = {}, {}
+    total = created = valid_rows = 0
+
+    for chunk in _chunks(iter_import_rows(fileobj, filename), Config.STUDENT_IMPORT_CHUNK_SIZE):
+        total += len(chunk)
+        if total > Config.STUDENT_IMPORT_MAX_ROWS:
+            raise HTTPException(
+                status_code=status.HTTP_413_REQUEST_ENTITY_TOO_LARGE,
+                detail=f"Import limited to {Config.STUDENT_IMPORT_MAX_ROWS} rows per file"
+            )
+
+        valid = _validate_chunk(chunk, created_by, seen_ids, seen_phones, report)
+        valid = _reject_existing(valid, report)
+        valid_rows += len(valid)
+        if dry_run or not valid:
+            continue
+
+        hashes = list(_hash_pool.map(hash_password, [p.password for _, p in valid]))
+        try:
+            _write_chunk(valid, hashes, role["_id"], created_by)
+        except PyMongoError as e:
+            print(f"[STUDENT IMPORT] chunk of {len(valid)} rows failed: {e}")
+            for row_no, p in valid:
+                report.append({"row": row_no, "student_id": p.id, "errors": ["Database write failed"]})
+            continue
+        created += len(valid)
+
+    report.sort(key=lambda r: r["row"])
+    failed = len(report)
+    message = "Import validated" if dry_run else "Import completed"
+    return success(message, {
+        "total": total,
+        "valid": valid_rows,
+        "created": created,
+        "failed": failed,
+        "dry_run": dry_run,
+        "errors": report[:Config.STUDENT_IMPORT_MAX_ERRORS],
+        "errors_truncated": failed > Config.STUDENT_IMPORT_MAX_ERRORS
+    })
@@ -1,4 +1,3 @@
-import cv2
 from datetime import datetime
 from pymongo.errors import PyMongoError
 from fastapi import HTTPException, status
@@ -11,21 +10,34 @@ from data.student_repo import (
     get_student_by_id as repo_get_student_by_id, 
     update_student as repo_update_student,
     delete_student as repo_delete_student,
-    filter_students as filter_students_repo,
-    promote_students_year_repo,
-    get_students_by_year_and_college
+    list_students as list_students_repo,
+    LIST_HIDDEN_FIELDS as STUDENT_HIDDEN_FIELDS,
+    get_students_by_year_and_college,
+    iter_student_batches,
+    promote_students_by_ids
 )
 
 from data.roles_repo import get_role_by_name
-from data.faces_repo import get_face_by_user, delete_face, create_face_doc
+from data.faces_repo import get_face_by_user, get_face_meta_by_user, delete_face, create_face_doc
 from data.face_vectors_repo import create_vector, delete_vector, search_similar_faces
-from data.student_mentor_repo import map_student_to_mentor, get_existing_mentor_ids_for_students, get_mentors_for_scope
-from data.student_hod_repo import map_student_to_hod, delete_student_mappings
-from data.faculty_repo import get_all_hods
+from data.student_mentor_repo import (
+    map_student_to_mentor,
+    get_existing_mentor_ids_for_students,
+    delete_student_mentor_mappings_by_students,
+    insert_student_mentor_mappings
+)
+from data.student_hod_repo import map_student_to_hod, delete_student_mappings, bulk_set_student_hods
+from data.requests_repo import set_active_requests_year
+from data.background_jobs_repo import JobLockConflict, release_job_locks
+from data.scope_map_repo import get_hod_ids_for_scope, get_mentor_ids_for_scope
+from data.faculty_read_model_repo import add_students, remove_students, rebuild_faculty_read_model
 from extensions.mongo import client, db
 from services.validators import validate_college
-from services.face_service import decode_image, extract_embedding_and_landmarks, DUPLICATE_HIGH
+from services.face_service import load_image, extract_face, normalize_face_image, resolve_face_token, DUPLICATE_HIGH
 from core.global_response import success
+from utils.cache import invalidate_user_cache
+from config import Config
+from services.background_jobs import job_handler, job_runner, reserve_job_locks
 
 # ==========================================================
 # CREATE STUDENT
@@ -63,24 +75,19 @@ def register_student(student_id, name, phone, year, course, section, college, pa
             }, session=s)
 
             # CREATE STUDENT-HOD MAPPINGS
-            hods = get_all_hods()
-            for h in hods:
-                if (
-                    h["college"] == college
-                    and year in h["years"]
-                    and course in h["courses"]
-                ):
-                    map_student_to_hod(
-                        student_id,
-                        h["_id"],
-                        year,
-                        course,
-                        college,
-                        session=s
-                    )
+            hod_ids = get_hod_ids_for_scope(college, year, course)
+            for hod_id in hod_ids:
+                map_student_to_hod(
+                    student_id,
+                    hod_id,
+                    year,
+                    course,
+                    college,
+                    session=s
+                )
 
             # CREATE STUDENT-MENTOR MAPPINGS
-            mentor_ids = get_mentors_for_scope(college, year, course, section)
+            mentor_ids = get_mentor_ids_for_scope(college, year, course, section)
             for mentor_id in mentor_ids:
                 map_student_to_mentor(
                     student_id,
@@ -92,6 +99,10 @@ def register_student(student_id, name, phone, year, course, section, college, pa
                     session=s
                 )
 
+            # FACULTY READ MODEL
+            add_students(hod_ids, "hod", [student_id], session=s)
+            add_students(mentor_ids, "mentor", [student_id], session=s)
+
     except PyMongoError:
         raise HTTPException(status_code=500, detail="Student creation failed")
     return success("Student created successfully", {"student_id": student_id})
@@ -99,28 +110,33 @@ def register_student(student_id, name, phone, year, course, section, college, pa
 # ==========================================================
 # REGISTER FACE
 # ==========================================================
-def register_student_face_service(student_id: str, image_b64: str):
+def register_student_face_service(student_id: str, image_b64: str = None, face_token: str = None, image_bytes: bytes = None):
     student = repo_get_student_by_id(student_id)
     if not student:
         raise HTTPException(status_code=404, detail="Student not found")
     if student.get("face_id"):
         raise HTTPException(status_code=409, detail="Face already registered")
 
-    img, _ = decode_image(image_b64)
-    emb, _ = extract_embedding_and_landmarks(img)
-    emb_list = emb.tolist()
-    matches = search_similar_faces(emb_list)
-    for m in matches:
-        if m["score"] >= DUPLICATE_HIGH:
-            raise HTTPException(status_code=409, detail=f"Duplicate face detected")
+    if face_token:
+        # Pre-validated via /face/validate: reuse its embedding + JPEG
+        emb, _, image_bytes, aligned = resolve_face_token(face_token, user_id=student_id)
+        emb_list = emb.tolist()
+    else:
+        img, _ = load_image(image_b64, image_bytes)
+        face, emb, _ = extract_face(img)
+        emb_list = emb.tolist()
+        matches = search_similar_faces(emb_list)
+        for m in matches:
+            if m["score"] >= DUPLICATE_HIGH:
+                raise HTTPException(status_code=409, detail=f"Duplicate face detected")
+        image_bytes, aligned = normalize_face_image(img, face)
 
     vector_id = f"vec_{student_id}"
     try:
         with client.start_session() as s:
             with s.start_transaction():
                 create_vector(vector_id, student_id, emb_list, session=s)
-                ok, buf = cv2.imencode(".jpg", img)
-                face_id = create_face_doc(student_id, "STUDENT", buf.tobytes(), vector_id, session=s)
+                face_id = create_face_doc(student_id, "STUDENT", image_bytes, vector_id, session=s, aligned_bytes=aligned)
                 db["students"].update_one({"_id": student_id}, {"$set": {"face_id": face_id}}, session=s)
     except PyMongoError:
         raise HTTPException(status_code=500, detail="Face registration failed")
@@ -136,6 +152,8 @@ def update_student_service(student_id, updates):
 
     sensitive_fields = {"year", "course", "college"}
     needs_remap = any(f in updates for f in sensitive_fields)
+    # Mentor scopes are per section as well
+    needs_mentor_remap = needs_remap or "section" in updates
 
     if "password" in updates:
         updates["password_hash"] = hash_password(updates.pop("password"))
@@ -145,26 +163,44 @@ def update_student_service(student_id, updates):
             with s.start_transaction():
                 repo_update_student(student_id, updates, session=s)
 
+                # New scope from the pre-read doc plus the patch: a read here
+                # without the session would not see the uncommitted update
+                scope = {**student, **updates}
+
                 if needs_remap:
                     delete_student_mappings(student_id, session=s)
+                    remove_students([student_id], "hod", session=s)
+
+                    hod_ids = get_hod_ids_for_scope(scope["college"], scope["year"], scope["course"])
+                    add_students(hod_ids, "hod", [student_id], session=s)
+                    for hod_id in hod_ids:
+                        map_student_to_hod(
+                            student_id,
+                            hod_id,
+                            scope["year"],
+                            scope["course"],
+                            scope["college"],
+                            session=s
+                        )
+
+                if needs_mentor_remap:
+                    delete_student_mentor_mappings_by_students([student_id], session=s)
+                    remove_students([student_id], "mentor", session=s)
 
-                    updated = repo_get_student_by_id(student_id)
-
-                    hods = get_all_hods()
-                    for h in hods:
-                        if (
-                            h["college"] == updated["college"]
-                            and updated["year"] in h["years"]
-                            and updated["course"] in h["courses"]
-                        ):
-                            map_student_to_hod(
-                                student_id,
-                                h["_id"],
-                                updated["year"],
-                                updated["course"],
-                                updated["college"],
-                                session=s
-                            )
+                    mentor_ids = get_mentor_ids_for_scope(
+                        scope["college"], scope["year"], scope["course"], scope.get("section")
+                    )
+                    add_students(mentor_ids, "mentor", [student_id], session=s)
+                    for mentor_id in mentor_ids:
+                        map_student_to_mentor(
+                            student_id,
+                            mentor_id,
+                            scope["college"],
+                            scope["year"],
+                            scope["course"],
+                            scope.get("section"),
+                            session=s
+                        )
 
     except PyMongoError:
         raise HTTPException(status_code=500, detail="Student update failed")
@@ -178,7 +214,7 @@ def update_student_service(student_id, updates):
 # DELETE STUDENT
 # ==========================================================
 def delete_student_service(student_id):
-    face = get_face_by_user(student_id)
+    face = get_face_meta_by_user(student_id)
     try:
         with client.start_session() as s:
           with s.start_transaction():
@@ -189,11 +225,14 @@ def delete_student_service(student_id):
 
             repo_delete_student(student_id, session=s)
             delete_student_mappings(student_id, session=s)
+            delete_student_mentor_mappings_by_students([student_id], session=s)
+            remove_students([student_id], session=s)
             db["user_roles"].delete_many({"user_id": student_id}, session=s)
 
     except PyMongoError:
         raise HTTPException(status_code=500, detail="Delete failed")
     delete_student_mappings(student_id)
+    invalidate_user_cache(student_id)
     return success("Student deleted successfully")
 
 # ==========================================================
@@ -219,9 +258,124 @@ def get_student_service(student_id: str):
 # ==========================================================
 # OTHERS
 # ==========================================================
-def filter_students_service(filters: dict):
-    return success("Filtered students", filter_students_repo(filters))
+def filter_students_service(filters: dict, params):
+    cursor = list_students_repo(
+        filters,
+        projection=params.projection(STUDENT_HIDDEN_FIELDS),
+        after=params.after,
+        limit=params.fetch_limit
+    )
+    return params.respond("Filtered students", cursor)
+
+
+
+# ==========================================================
+# PROMOTION (background job, chunked)
+# ==========================================================
+def promote_students_service(year: int, college: str, new_year: int, created_by=None):
+    """
+    Promote a (college, year) cohort to `new_year` as a "promote_students"
+    background job; progress via GET /jobs/{job_id}.
+    """
+    validate_college(college)
+    if year == new_year:
+        raise HTTPException(status_code=400, detail="new_year must differ from year")
+
+    # A job reads `year` and writes `new_year`; any shared year between two
+    # jobs of a college would move the same students twice (e.g. 3->4 then 2->3).
+    # Each job locks both its years, so taking them is the conflict check.
+    try:
+        job_id = reserve_job_locks([f"promote_students:{college}:{y}" for y in (year, new_year)])
+    except JobLockConflict as e:
+        raise HTTPException(
+            status_code=status.HTTP_409_CONFLICT,
+            detail=f"A promotion touching {college} year {e.key.rsplit(':', 1)[1]} is already running (job {e.job_id})"
+        )
+
+    try:
+        job_runner.submit(
+            "promote_students",
+            {"college": college, "year": year, "new_year": new_year},
+            created_by=created_by,
+            job_id=job_id
+        )
+    except Exception:
+        release_job_locks(job_id)
+        raise
+    return success("Student promotion started", {"job_id": job_id})
+
+
+def _promote_chunk(batch, college, year, new_year):
+    """
+    Move one chunk to `new_year` and remap it, all-or-nothing. Returns the
+    faculty ids whose mappings changed (for the read-model rebuild).
+    """
+    student_ids = [d["_id"] for d in batch]
+    affected = set(get_existing_mentor_ids_for_students(student_ids))
+    affected.update(db["student_hod"].distinct("hod_id", {"student_id": {"$in": student_ids}}))
+
+    hod_assignments = []
+    mentor_docs = []
+    now = datetime.utcnow()
+    for d in batch:
+        course, section = d.get("course"), d.get("section")
+        hod_ids = get_hod_ids_for_scope(college, new_year, course)
+        affected.update(hod_ids[:1])
+        hod_assignments.append({
+            "student_id": d["_id"],
+            # student_hod.student_id is unique: one HOD per student
+            "hod_id": hod_ids[0] if hod_ids else None,
+            "college": college,
+            "year": new_year,
+            "course": course
+        })
+        for mentor_id in get_mentor_ids_for_scope(college, new_year, course, section):
+            affected.add(mentor_id)
+            mentor_docs.append({
+                "student_id": d["_id"],
+                "mentor_id": mentor_id,
+                "college": college,
+                "year": new_year,
+                "course": course,
+                "section": section,
+                "created_at": now
+            })
+
+    with client.start_session() as s:
+        with s.start_transaction():
+            promote_students_by_ids(student_ids, year, new_year, session=s)
+            bulk_set_student_hods(hod_assignments, session=s)
+            delete_student_mentor_mappings_by_students(student_ids, session=s)
+            if mentor_docs:
+                insert_student_mentor_mappings(mentor_docs, session=s)
+            set_active_requests_year(student_ids, new_year, session=s)
+    return affected
+
+
+@job_handler("promote_students")
+def run_promote_students_job(ctx):
+    college = ctx.params["college"]
+    year = ctx.params["year"]
+    new_year = ctx.params["new_year"]
+    query = {"college": college, "year": year}
+
+    checkpoint = ctx.checkpoint or {"last_id": None, "faculty_ids": []}
+    affected = set(checkpoint.get("faculty_ids") or [])
+    done = ctx.done
+    if ctx.total is None:
+        ctx.progress(done, db["students"].count_documents(query), checkpoint=checkpoint)
+
+    # Promoted students drop out of `query`; the _id checkpoint keeps the
+    # scan moving forward and makes a resumed run skip committed chunks
+    for batch in iter_student_batches(
+        query,
+        Config.PROMOTION_BATCH_SIZE,
+        after_id=checkpoint["last_id"],
+        projection={"_id": 1, "course": 1, "section": 1}
+    ):
+        affected |= _promote_chunk(batch, college, year, new_year)
+        done += len(batch)
+        ctx.progress(done, checkpoint={"last_id": batch[-1]["_id"], "faculty_ids": sorted(affected)})
 
-def promote_students_service(year: str, college: str, new_year: str):
-    promote_students_year_repo(year, college, new_year)
-    return success("Students promoted successfully")
\ No newline at end of file
+    rebuild_faculty_read_model(sorted(affected))
+    return {"students_promoted": done, "faculty_updated": len(affected)}
\ No newline at end of file
@@ -0,0 +1,115 @@
+"""
+Test setup: the data layer runs against an in-memory mongomock database.
+
+Repositories bind their collections at import time, so the database is wired
+here (via benchmarks/env.py) before any `data.*` / `services.*` import.
+mongomock has no sessions / transactions and its bulk_write predates the
+pymongo 4 operation classes; `_NoSession` and `_bulk_write` below cover the
+subset the app uses. Transaction semantics are therefore not under test.
+"""
+import contextlib
+import os
+import sys
+import time
+from types import SimpleNamespace
+
+import pytest
+
+SERVER_DIR = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+if SERVER_DIR not in sys.path:
+    sys.path.insert(0, SERVER_DIR)
+
+os.environ.setdefault("ENV", "test")
+
+from benchmarks.env import configure  # noqa: E402
+
+import mongomock.collection  # noqa: E402
+from pymongo import DeleteMany, DeleteOne, InsertOne, ReplaceOne, UpdateMany, UpdateOne  # noqa: E402
+
+TEST_DB = configure("mongomock", db_name="faceAuthDB_test")
+
+
+class _NoSession:
+    # Falsy so mongomock's `session=` checks treat it as "no session"
+    def __bool__(self):
+        return False
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *exc):
+        return False
+
+    def start_transaction(self, *args, **kwargs):
+        return contextlib.nullcontext()
+
+
+def _bulk_write(self, requests, ordered=True, session=None, **kwargs):
+    requests = list(requests)
+    for op in requests:
+        if isinstance(op, InsertOne):
+            self.insert_one(op._doc)
+        elif isinstance(op, UpdateOne):
+            self.update_one(op._filter, op._doc, upsert=op._upsert)
+        elif isinstance(op, UpdateMany):
+            self.update_many(op._filter, op._doc, upsert=op._upsert)
+        elif isinstance(op, ReplaceOne):
+            self.replace_one(op._filter, op._doc, upsert=op._upsert)
+        elif isinstance(op, DeleteOne):
+            self.delete_one(op._filter)
+        elif isinstance(op, DeleteMany):
+            self.delete_many(op._filter)
+    return SimpleNamespace(matched_count=len(requests))
+
+
+import extensions.mongo as mongo  # noqa: E402
+
+mongo.client.start_session = lambda *args, **kwargs: _NoSession()
+mongomock.collection.Collection.bulk_write = _bulk_write
+
+
+@pytest.fixture(autouse=True)
+def clean_db():
+    for name in TEST_DB.list_collection_names():
+        TEST_DB[name].delete_many({})
+    # Drop the per-process scope map snapshot along with the data
+    import data.scope_map_repo as scope_map_repo
+    scope_map_repo._snapshot.version = None
+    scope_map_repo.invalidate_scope_map()
+    yield
+
+
+@pytest.fixture
+def db():
+    return TEST_DB
+
+
+@pytest.fixture
+def wait_for_job():
+    """Block until a background job leaves QUEUED / RUNNING; return its doc."""
+    from data.background_jobs_repo import get_job, COMPLETED, FAILED
+
+    def wait(job_id, timeout=10.0):
+        deadline = time.monotonic() + timeout
+        while time.monotonic() < deadline:
+            job = get_job(job_id)
+            if job and job["status"] in (COMPLETED, FAILED):
+                return job
+            time.sleep(0.02)
+        raise AssertionError(f"job {job_id} did not finish: {get_job(job_id)}")
+
+    return wait
+
+
+@pytest.fixture
+def job_runner(monkeypatch):
+    """A private BackgroundJobRunner swapped in for services' `job_runner`."""
+    import services.background_jobs as background_jobs
+    import services.hod_service as hod_service
+    import services.student_service as student_service
+
+    runner = background_jobs.BackgroundJobRunner(workers=1)
+    for module in (background_jobs, hod_service, student_service):
+        monkeypatch.setattr(module, "job_runner", runner)
+    yield runner
+    runner.stop(wait=True)
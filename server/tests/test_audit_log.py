@@ -0,0 +1,117 @@
+import datetime
+import json
+import time
+
+import pytest
+
+from utils.audit_log import AuditLogger
+
+
+@pytest.fixture
+def make_logger(tmp_path):
+    loggers = []
+
+    def make(**kwargs):
+        kwargs.setdefault("log_file", str(tmp_path / "audit.log"))
+        kwargs.setdefault("sinks", ["file"])
+        kwargs.setdefault("flush_interval", 0.05)
+        audit = AuditLogger(**kwargs)
+        loggers.append(audit)
+        return audit
+
+    yield make
+    for audit in loggers:
+        audit.close()
+
+
+def _lines(path):
+    with open(path) as f:
+        return [json.loads(line) for line in f]
+
+
+def test_queued_events_are_written_in_batches(make_logger, monkeypatch):
+    audit = make_logger(batch_size=10)
+    batches = []
+    write = audit._write
+    monkeypatch.setattr(audit, "_write", lambda batch: (batches.append(len(batch)), write(batch)))
+
+    # Queue everything before the writer starts so the batch split is deterministic
+    for i in range(25):
+        audit._enqueue({"timestamp": datetime.datetime.utcnow(), "user_id": f"user{i}",
+                        "action": "LOGIN", "details": None, "ip": None})
+    audit._ensure_started()
+    audit.close()
+
+    assert batches == [10, 10, 5]
+    assert [e["user_id"] for e in _lines(audit.log_file)] == [f"user{i}" for i in range(25)]
+
+
+def test_close_flushes_pending_events(make_logger):
+    audit = make_logger(batch_size=100)
+    for i in range(5):
+        audit.log(f"user{i}", "LOGOUT", details={"n": i}, ip="127.0.0.1")
+    audit.close()
+
+    entries = _lines(audit.log_file)
+    assert [e["details"]["n"] for e in entries] == list(range(5))
+    assert entries[0]["ip"] == "127.0.0.1"
+    assert audit.get_stats()["queued"] == 0
+
+
+def test_close_wakes_an_idle_writer(make_logger):
+    # With the queue empty the writer sits in a 30s get(); close() must not wait it out
+    audit = make_logger(flush_interval=30)
+    audit.log("user0", "LOGOUT")
+    deadline = time.monotonic() + 5
+    while audit.get_stats()["written_file"] < 1 and time.monotonic() < deadline:
+        time.sleep(0.01)
+    time.sleep(0.05)
+
+    started = time.monotonic()
+    audit.close()
+    assert time.monotonic() - started < 2
+    assert audit._thread is None
+
+
+def test_per_sink_counters(make_logger, db):
+    audit = make_logger(sinks=["file", "mongo"])
+    for i in range(3):
+        audit.log(f"user{i}", "FACE_VERIFY")
+    audit.close()
+
+    stats = audit.get_stats()
+    assert stats["enqueued"] == 3
+    assert stats["written_file"] == 3
+    assert stats["written_mongo"] == 3
+    assert stats["failed_file"] == stats["failed_mongo"] == 0
+    assert db["audit_logs"].count_documents({"event_type": "FACE_VERIFY"}) == 3
+
+
+def test_failing_sink_does_not_block_the_other(make_logger, monkeypatch, db):
+    audit = make_logger(sinks=["file", "mongo"])
+
+    def broken(batch):
+        raise RuntimeError("mongo down")
+
+    monkeypatch.setattr(audit, "_write_mongo", broken)
+    for i in range(4):
+        audit.log(f"user{i}", "LOGIN")
+    audit.close()
+
+    stats = audit.get_stats()
+    assert stats["written_file"] == 4
+    assert stats["failed_mongo"] == 4
+    assert stats["written_mongo"] == 0
+    assert len(_lines(audit.log_file)) == 4
+
+
+def test_overflow_counts_dropped_events(make_logger, monkeypatch):
+    audit = make_logger(queue_size=2, overflow_policy="drop_newest")
+    monkeypatch.setattr(audit, "_ensure_started", lambda: None)
+    for i in range(5):
+        audit.log(f"user{i}", "LOGIN")
+
+    stats = audit.get_stats()
+    assert stats["enqueued"] == 2
+    assert stats["dropped"] == 3
+    assert stats["queued"] == 2
@@ -0,0 +1,139 @@
+from datetime import datetime, timedelta
+
+import pytest
+
+from data.background_jobs_repo import (
+    COMPLETED,
+    FAILED,
+    RUNNING,
+    JobLockConflict,
+    acquire_job_locks,
+    create_job,
+    fail_job,
+    get_job
+)
+from services.background_jobs import BackgroundJobRunner, job_handler
+
+calls = []
+
+
+@job_handler("test_count")
+def run_test_count(ctx):
+    start = (ctx.checkpoint or {}).get("next", 0)
+    calls.append(("start", start))
+    for i in range(start, ctx.params["n"]):
+        ctx.progress(i + 1, ctx.params["n"], checkpoint={"next": i + 1})
+    return {"counted": ctx.params["n"] - start}
+
+
+@job_handler("test_fail")
+def run_test_fail(ctx):
+    raise RuntimeError("boom")
+
+
+@pytest.fixture
+def runner():
+    calls.clear()
+    r = BackgroundJobRunner(workers=1)
+    yield r
+    r.stop(wait=True)
+
+
+def test_job_runs_to_completion(runner, wait_for_job):
+    job_id = runner.submit("test_count", {"n": 3}, created_by="A1")
+    job = wait_for_job(job_id)
+
+    assert job["status"] == COMPLETED
+    assert job["progress"] == {"done": 3, "total": 3}
+    assert job["checkpoint"] == {"next": 3}
+    assert job["result"] == {"counted": 3}
+    assert job["created_by"] == "A1"
+
+
+def test_failed_job_records_error(runner, wait_for_job):
+    job = wait_for_job(runner.submit("test_fail", {}))
+    assert job["status"] == FAILED
+    assert job["error"] == "boom"
+
+
+def test_unknown_job_type_rejected(runner):
+    with pytest.raises(ValueError):
+        runner.submit("no_such_job", {})
+
+
+def test_resume_stale_continues_from_checkpoint(runner, wait_for_job, db):
+    # A runner died mid-job: RUNNING, expired lease, checkpoint at 2 of 5
+    create_job("J1", "test_count", {"n": 5})
+    db["background_jobs"].update_one({"_id": "J1"}, {"$set": {
+        "status": RUNNING,
+        "checkpoint": {"next": 2},
+        "progress": {"done": 2, "total": 5},
+        "lease_until": datetime.utcnow() - timedelta(seconds=1)
+    }})
+
+    assert runner.resume_stale() == 1
+    job = wait_for_job("J1")
+
+    assert calls == [("start", 2)]
+    assert job["status"] == COMPLETED
+    assert job["result"] == {"counted": 3}
+    assert job["attempts"] == 1
+
+
+def test_resume_skips_jobs_with_live_lease(runner, db):
+    create_job("J2", "test_count", {"n": 1})
+    db["background_jobs"].update_one({"_id": "J2"}, {"$set": {
+        "status": RUNNING,
+        "lease_until": datetime.utcnow() + timedelta(minutes=5)
+    }})
+
+    assert runner.resume_stale() == 0
+    assert get_job("J2")["status"] == RUNNING
+
+
+def test_runner_keeps_sweeping_for_abandoned_jobs(wait_for_job, db):
+    calls.clear()
+    runner = BackgroundJobRunner(workers=1, resume_interval=0.05)
+    runner.start()
+    try:
+        # Abandoned after the startup sweep, e.g. by another worker that died
+        create_job("J3", "test_count", {"n": 2})
+        db["background_jobs"].update_one({"_id": "J3"}, {"$set": {
+            "status": RUNNING,
+            "lease_until": datetime.utcnow() - timedelta(seconds=1)
+        }})
+        assert wait_for_job("J3")["status"] == COMPLETED
+    finally:
+        runner.stop(wait=True)
+
+
+def _stale_before(minutes=5):
+    return datetime.utcnow() - timedelta(minutes=minutes)
+
+
+def test_job_locks_are_all_or_nothing(db):
+    create_job("J1", "test_count", {"n": 1})
+    acquire_job_locks("J1", ["k:b"], _stale_before())
+
+    with pytest.raises(JobLockConflict) as exc:
+        acquire_job_locks("J2", ["k:a", "k:b", "k:c"], _stale_before())
+    assert exc.value.job_id == "J1"
+    assert [d["_id"] for d in db["background_job_locks"].find()] == ["k:b"]
+
+    fail_job("J1", "boom")
+    assert acquire_job_locks("J2", ["k:a", "k:b"], _stale_before()) == ["k:a", "k:b"]
+
+
+def test_locks_of_finished_or_missing_jobs_are_reclaimed(db):
+    # Left behind by a job that ended without releasing (e.g. killed mid-finish)
+    create_job("J1", "test_count", {"n": 1})
+    db["background_jobs"].update_one({"_id": "J1"}, {"$set": {"status": COMPLETED}})
+    db["background_job_locks"].insert_one({"_id": "k:a", "job_id": "J1", "created_at": datetime.utcnow()})
+    assert acquire_job_locks("J2", ["k:a"], _stale_before()) == ["k:a"]
+
+    # Reserved for a job that is about to be submitted: still held...
+    acquire_job_locks("J3", ["k:b"], _stale_before())
+    with pytest.raises(JobLockConflict):
+        acquire_job_locks("J4", ["k:b"], _stale_before())
+    # ...until a lease period passes without the job appearing
+    assert acquire_job_locks("J4", ["k:b"], _stale_before(minutes=-1)) == ["k:b"]
@@ -0,0 +1,63 @@
+import asyncio
+
+import pytest
+
+from utils.cache import InMemoryCache, cache_result, invalidate_user_cache, set_cache_backend
+
+
+@pytest.fixture(autouse=True)
+def memory_cache():
+    cache = InMemoryCache(max_bytes=1024 * 1024)
+    set_cache_backend(cache)
+    yield cache
+    set_cache_backend(None)
+
+
+def test_sync_results_are_cached_until_invalidated():
+    calls = []
+
+    @cache_result(ttl=60)
+    def role_of(user_id):
+        calls.append(user_id)
+        return {"user_id": user_id, "role": "HOD"}
+
+    assert role_of("U1") == {"user_id": "U1", "role": "HOD"}
+    assert role_of("U1") == {"user_id": "U1", "role": "HOD"}
+    assert calls == ["U1"]
+
+    invalidate_user_cache("U1")
+    role_of("U1")
+    assert calls == ["U1", "U1"]
+
+
+def test_async_functions_and_none_results():
+    calls = []
+
+    @cache_result(ttl=60)
+    async def role_name(user_id):
+        calls.append(user_id)
+        return None if user_id == "ghost" else "MENTOR"
+
+    async def run():
+        return [await role_name("U2"), await role_name("U2"), await role_name("ghost"), await role_name("ghost")]
+
+    assert asyncio.run(run()) == ["MENTOR", "MENTOR", None, None]
+    # A miss is not cached: a user registered later is seen immediately
+    assert calls == ["U2", "ghost", "ghost"]
+
+
+def test_broken_backend_falls_through():
+    class Broken(InMemoryCache):
+        def get(self, key):
+            raise ConnectionError("down")
+
+        def set(self, key, value, ttl):
+            raise ConnectionError("down")
+
+    set_cache_backend(Broken())
+
+    @cache_result(ttl=60)
+    def answer():
+        return 42
+
+    assert answer() == 42
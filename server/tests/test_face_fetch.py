@@ -0,0 +1,106 @@
+import asyncio
+from types import SimpleNamespace
+
+import numpy as np
+import pytest
+from fastapi import HTTPException
+
+import data.aio.faces_repo as faces_repo_async
+import services.face_service as face_service
+import services.request_service as request_service
+from data.faces_repo import create_face_doc
+from utils.encryption import encrypt_image_bytes
+
+
+# ==========================================================
+# ASYNC GUARD VIEW
+# ==========================================================
+class _FakeAsyncFaces:
+    """Just enough of an async collection for data/aio/faces_repo."""
+
+    def __init__(self, docs):
+        self.docs = docs
+        self.queries = []
+
+    def find(self, query):
+        self.queries.append(query)
+        ids = query["user_id"]["$in"]
+        docs = [dict(d) for d in self.docs if d["user_id"] in ids]
+
+        async def to_list(length=None):
+            return docs
+
+        return SimpleNamespace(to_list=to_list)
+
+
+def test_async_guard_view_fetches_faces_in_one_query(monkeypatch):
+    fake = _FakeAsyncFaces([
+        {"user_id": "S1", "is_encrypted": True, "image_data_encrypted": encrypt_image_bytes(b"jpeg-1")},
+        {"user_id": "S2", "is_encrypted": True, "image_data_encrypted": encrypt_image_bytes(b"jpeg-2")},
+    ])
+    monkeypatch.setattr(faces_repo_async, "faces", fake)
+
+    async def no_op():
+        return None
+
+    async def approved(college):
+        return [{"_id": i, "student_id": sid} for i, sid in enumerate(["S1", "S2", "S1", "S3"])]
+
+    monkeypatch.setattr(request_service.requests_repo_async, "auto_mark_unchecked", no_op)
+    monkeypatch.setattr(request_service.requests_repo_async, "get_approved_requests_for_guard_college", approved)
+
+    reqs = asyncio.run(request_service.service_get_guard_approved_requests_async("KMIT"))["data"]
+
+    assert fake.queries == [{"user_id": {"$in": ["S1", "S2", "S3"]}}]
+    assert [r["student_face"] for r in reqs] == ["anBlZy0x", "anBlZy0y", "anBlZy0x", None]
+
+
+# ==========================================================
+# RE-ENROLLMENT: STORED IMAGE ONLY FOR THE TWIN CHECK
+# ==========================================================
+def _reenroll(monkeypatch, new_emb, persisted=None):
+    create_face_doc("S1", "student", b"stored-jpeg", "vec-1")
+    image_reads = []
+    persisted = {} if persisted is None else persisted
+
+    def get_face_by_id(face_id):
+        image_reads.append(face_id)
+        return face_service.get_face_by_user("S1")
+
+    def persist_face(user_id, user_type, emb_list, image_bytes, old=None, aligned_bytes=None):
+        persisted["old"] = old
+
+    lm = np.zeros((5, 2), np.float32)
+    monkeypatch.setattr(face_service, "prepare_face", lambda b64, image_bytes: (new_emb, lm, b"new-jpeg", None))
+    monkeypatch.setattr(face_service, "get_vector", lambda ref: {"embedding": [1.0, 0.0]})
+    monkeypatch.setattr(face_service, "get_face_by_id", get_face_by_id)
+    monkeypatch.setattr(face_service, "ensure_not_duplicate", lambda emb, user_id=None: None)
+    monkeypatch.setattr(face_service, "persist_face", persist_face)
+    monkeypatch.setattr(face_service, "cv2", SimpleNamespace(imdecode=lambda buf, flag: "img", IMREAD_COLOR=1))
+    monkeypatch.setattr(face_service, "extract_embedding_and_landmarks", lambda img: (new_emb, lm))
+
+    face_service.verify_then_replace_face("S1", "student", image_bytes=b"upload")
+    return image_reads, persisted["old"]
+
+
+def test_confident_match_never_reads_the_stored_image(monkeypatch):
+    image_reads, old = _reenroll(monkeypatch, np.array([0.95, 0.05], np.float32))
+
+    assert image_reads == []
+    assert old["vector_ref"] == "vec-1"
+    assert "image_data_encrypted" not in old
+
+
+def test_borderline_match_reads_the_stored_image_once(monkeypatch):
+    # cosine ~0.6: between VERIFY_THRESHOLD and DUPLICATE_HIGH
+    image_reads, _ = _reenroll(monkeypatch, np.array([0.6, 0.8], np.float32))
+
+    assert len(image_reads) == 1
+
+
+def test_mismatched_face_is_not_replaced(monkeypatch):
+    persisted = {}
+    with pytest.raises(HTTPException) as exc:
+        _reenroll(monkeypatch, np.array([0.0, 1.0], np.float32), persisted)
+    assert exc.value.status_code == 403
+    assert persisted == {}
@@ -0,0 +1,52 @@
+from types import SimpleNamespace
+
+import numpy as np
+import pytest
+from fastapi import HTTPException
+
+import services.face_validation_service as validation
+from services.face_service import resolve_face_token
+
+
+@pytest.fixture
+def fake_face(monkeypatch):
+    """Validation without the model: one fixed face, search results settable."""
+    matches = []
+    emb = np.array([1.0, 0.0], np.float32)
+    lm = np.zeros((68, 3), np.float32)
+    monkeypatch.setattr(validation, "load_image", lambda b64, image_bytes: ("img", None))
+    monkeypatch.setattr(validation, "extract_face", lambda img: (SimpleNamespace(), emb, lm))
+    monkeypatch.setattr(validation, "normalize_face_image", lambda img, face: (b"jpeg", None))
+    monkeypatch.setattr(validation, "search_similar_faces", lambda emb_list, limit=5: matches)
+    return matches
+
+
+def test_re_enrolling_user_does_not_conflict_with_own_face(fake_face):
+    fake_face.append({"user_id": "S1", "score": 0.97})
+
+    ok, token = validation.validate_and_cache_face(image_bytes=b"x", user_id="S1", issued_by="S1")
+
+    assert ok
+    emb, _, jpeg, _ = resolve_face_token(token, user_id="S1")
+    assert jpeg == b"jpeg"
+
+
+def test_face_of_another_user_is_rejected(fake_face):
+    fake_face.append({"user_id": "S2", "score": 0.97})
+
+    with pytest.raises(HTTPException) as exc:
+        validation.validate_and_cache_face(image_bytes=b"x", user_id="S1", issued_by="S1")
+    assert exc.value.status_code == 409
+
+
+def test_token_cannot_be_redeemed_for_another_user(fake_face):
+    _, token = validation.validate_and_cache_face(image_bytes=b"x", user_id="S1", issued_by="S1")
+
+    with pytest.raises(HTTPException) as exc:
+        resolve_face_token(token, user_id="S2")
+    assert exc.value.status_code == 403
+
+    # Single use: the rejected attempt consumed it
+    with pytest.raises(HTTPException) as exc:
+        resolve_face_token(token, user_id="S1")
+    assert exc.value.status_code == 400
@@ -0,0 +1,71 @@
+from types import SimpleNamespace
+
+import numpy as np
+import pytest
+from fastapi import HTTPException
+
+import services.face_service as face_service
+
+
+def _face(landmarks, bbox):
+    return SimpleNamespace(
+        embedding=np.array([1.0, 0.0], np.float32),
+        landmark_3d_68=np.asarray(landmarks, np.float32),
+        bbox=np.asarray(bbox, np.float32)
+    )
+
+
+def _reframe(landmarks, bbox, scale, dx, dy):
+    """The same face photographed from further away / off-centre."""
+    moved = np.asarray(landmarks, np.float32) * scale
+    moved[:, 0] += dx
+    moved[:, 1] += dy
+    x1, y1, x2, y2 = bbox
+    return moved, (x1 * scale + dx, y1 * scale + dy, x2 * scale + dx, y2 * scale + dy)
+
+
+@pytest.fixture
+def base_face():
+    rng = np.random.default_rng(0)
+    bbox = (100.0, 120.0, 300.0, 320.0)
+    lm = np.column_stack([
+        rng.uniform(120, 280, 68),
+        rng.uniform(140, 300, 68),
+        rng.uniform(-20, 20, 68)
+    ])
+    return lm, bbox
+
+
+def _check(monkeypatch, live, stored):
+    """Borderline-score re-enrollment of `live` against a stored `stored`."""
+    faces = {"live": live, "stored": stored}
+    monkeypatch.setattr(face_service, "ensure_single_face", lambda img: faces[img])
+    monkeypatch.setattr(face_service, "cv2", SimpleNamespace(imdecode=lambda buf, flag: "stored", IMREAD_COLOR=1))
+    # cosine ~0.6: between VERIFY_THRESHOLD and DUPLICATE_HIGH, so the landmark check runs
+    monkeypatch.setattr(face_service, "get_vector", lambda ref: {"embedding": [0.6, 0.8]})
+
+    _, emb, lm = face_service.extract_face("live")
+    stored_face = {"_id": "F1", "vector_ref": "vec-1", "image_data": b"stored-jpeg"}
+    return face_service._match_against_stored("S1", stored_face, emb, lm)
+
+
+def test_reframed_photo_of_the_same_face_passes(monkeypatch, base_face):
+    lm, bbox = base_face
+    # Stored copy: the normalised crop (1.6x, shifted) of the same face
+    stored_lm, stored_bbox = _reframe(lm, bbox, 1.6, -90, 35)
+    assert face_service.landmark_distance(lm, stored_lm) > face_service.LANDMARK_TWIN_THRESHOLD
+
+    matched, _ = _check(monkeypatch, _face(lm, bbox), _face(stored_lm, stored_bbox))
+    assert matched
+
+
+def test_different_face_trips_the_twin_check(monkeypatch, base_face):
+    lm, bbox = base_face
+    # Same box, landmarks displaced by ~5% of the face width
+    other = lm + np.random.default_rng(1).normal(0, 10, lm.shape)
+
+    with pytest.raises(HTTPException) as exc:
+        _check(monkeypatch, _face(lm, bbox), _face(other, bbox))
+    assert exc.value.status_code == 403
+    assert "Identity ambiguous" in exc.value.detail
+
@@ -0,0 +1,83 @@
+from data.faculty_read_model_repo import (
+    add_students,
+    get_faculty_read_model,
+    rebuild_faculty_read_model,
+    remove_students
+)
+from data.student_hod_repo import get_student_ids_for_hod
+from data.scope_map_repo import set_mentor_scope
+from data.student_mentor_repo import get_students_for_mentor
+from services.student_service import update_student_service
+
+
+def _seed(db):
+    db["faculty"].insert_many([
+        {"_id": "H1", "name": "hod", "college": "KMIT"},
+        {"_id": "M1", "name": "mentor", "college": "KMIT"},
+    ])
+    db["student_hod"].insert_many([
+        {"student_id": "S1", "hod_id": "H1", "college": "KMIT", "year": 2, "course": "CSE"},
+        {"student_id": "S2", "hod_id": "H1", "college": "KMIT", "year": 2, "course": "CSE"},
+    ])
+    db["student_mentor_mapping"].insert_many([
+        {"student_id": "S1", "mentor_id": "M1", "college": "KMIT", "year": 2, "course": "CSE", "section": "A"},
+    ])
+
+
+def test_legacy_fallback_before_rebuild(db):
+    _seed(db)
+    assert get_faculty_read_model("H1") is None
+    assert sorted(get_student_ids_for_hod("H1")) == ["S1", "S2"]
+    assert get_students_for_mentor("M1") == ["S1"]
+
+
+def test_rebuild_from_mappings(db):
+    _seed(db)
+    assert rebuild_faculty_read_model(["H1", "M1"]) == 2
+
+    hod = get_faculty_read_model("H1")
+    assert hod["hod_student_ids"] == ["S1", "S2"]
+    assert hod["hod_scopes"] == [{"college": "KMIT", "year": 2, "course": "CSE"}]
+    assert hod["mentor_student_ids"] == []
+
+    mentor = get_faculty_read_model("M1")
+    assert mentor["mentor_student_ids"] == ["S1"]
+    assert mentor["mentor_scopes"] == [{"college": "KMIT", "year": 2, "course": "CSE", "section": "A"}]
+
+    # Readers now come from the read model, not the mapping collections
+    db["student_hod"].delete_many({})
+    assert get_student_ids_for_hod("H1") == ["S1", "S2"]
+
+
+def test_incremental_updates_only_touch_built_faculty(db):
+    _seed(db)
+    rebuild_faculty_read_model(["H1"])
+
+    add_students(["H1", "M1"], "hod", ["S3"])
+    assert get_faculty_read_model("H1")["hod_student_ids"] == ["S1", "S2", "S3"]
+    # M1 has no read model yet: a partial set must not be created
+    assert get_faculty_read_model("M1") is None
+
+    version = get_faculty_read_model("H1")["read_model_version"]
+    remove_students(["S1"])
+    hod = get_faculty_read_model("H1")
+    assert hod["hod_student_ids"] == ["S2", "S3"]
+    assert hod["read_model_version"] == version + 1
+
+
+def test_student_section_change_remaps_mentors(db):
+    _seed(db)
+    db["faculty"].insert_one({"_id": "M2", "name": "other mentor", "college": "KMIT"})
+    db["students"].insert_one({"_id": "S1", "college": "KMIT", "year": 2, "course": "CSE", "section": "A"})
+    set_mentor_scope("KMIT", 2, "CSE", "A", ["M1"])
+    set_mentor_scope("KMIT", 2, "CSE", "B", ["M2"])
+    rebuild_faculty_read_model(["M1", "M2"])
+
+    update_student_service("S1", {"section": "B"})
+
+    mappings = list(db["student_mentor_mapping"].find({"student_id": "S1"}))
+    assert [(m["mentor_id"], m["section"]) for m in mappings] == [("M2", "B")]
+    assert get_faculty_read_model("M1")["mentor_student_ids"] == []
+    assert get_faculty_read_model("M2")["mentor_student_ids"] == ["S1"]
+    # A section move keeps the HOD mapping as it was
+    assert db["student_hod"].count_documents({"student_id": "S1", "hod_id": "H1"}) == 1
@@ -0,0 +1,94 @@
+import asyncio
+import json
+import sys
+
+import pytest
+from fastapi import HTTPException
+
+import routes.health_routes as health_routes
+from config import Config
+from services.face_model import FaceModelManager, IDLE, LOADING, FAILED
+
+
+async def _ok():
+    return {"ok": True}
+
+
+def test_ready_starts_model_load_when_idle(monkeypatch):
+    started = []
+    monkeypatch.setattr(health_routes, "_check_mongo", _ok)
+    monkeypatch.setattr(health_routes.model_manager, "state", IDLE)
+    monkeypatch.setattr(health_routes.model_manager, "start_warmup", lambda: started.append(True))
+
+    response = asyncio.run(health_routes.ready())
+
+    assert started == [True]
+    assert response.status_code == 503
+    assert json.loads(response.body)["checks"]["model"]["ok"] is False
+
+
+def test_ready_does_not_restart_a_loading_model(monkeypatch):
+    started = []
+    monkeypatch.setattr(health_routes, "_check_mongo", _ok)
+    monkeypatch.setattr(health_routes.model_manager, "state", LOADING)
+    monkeypatch.setattr(health_routes.model_manager, "start_warmup", lambda: started.append(True))
+
+    asyncio.run(health_routes.ready())
+    assert started == []
+
+
+def _failed_manager(monkeypatch):
+    # insightface import fails -> the load thread marks the model FAILED
+    monkeypatch.setitem(sys.modules, "insightface.app", None)
+    manager = FaceModelManager()
+    manager.start_warmup()
+    manager._thread.join(5)
+    assert manager.state == FAILED
+    return manager
+
+
+def test_failed_load_is_retried_after_backoff(monkeypatch):
+    monkeypatch.setattr(Config, "FACE_MODEL_RETRY_BACKOFF_SECONDS", 30)
+    manager = _failed_manager(monkeypatch)
+    assert manager.failures == 1
+    assert 0 < manager.status()["retry_in_seconds"] <= 30
+
+    # Still backing off: no new load thread, the face request fails fast
+    first_thread = manager._thread
+    with pytest.raises(HTTPException) as exc:
+        manager.get_model(timeout=0)
+    assert exc.value.status_code == 503
+    assert manager._thread is first_thread
+
+    manager._retry_at = 0.0
+    manager.ensure_loading()
+    manager._thread.join(5)
+    assert manager._thread is not first_thread
+    assert manager.failures == 2
+
+
+def test_retry_backoff_doubles_up_to_the_cap(monkeypatch):
+    monkeypatch.setattr(Config, "FACE_MODEL_RETRY_BACKOFF_SECONDS", 30)
+    monkeypatch.setattr(Config, "FACE_MODEL_RETRY_BACKOFF_MAX_SECONDS", 100)
+    manager = FaceModelManager()
+    delays = []
+    for failures in range(1, 5):
+        manager.failures = failures
+        delays.append(manager._retry_delay())
+    assert delays == [30, 60, 100, 100]
+
+
+def test_ready_retries_a_failed_model(monkeypatch):
+    manager = _failed_manager(monkeypatch)
+    started = []
+    monkeypatch.setattr(health_routes, "_check_mongo", _ok)
+    monkeypatch.setattr(health_routes, "model_manager", manager)
+    monkeypatch.setattr(manager, "start_warmup", lambda: started.append(True))
+
+    asyncio.run(health_routes.ready())
+    assert started == []
+
+    manager._retry_at = 0.0
+    response = asyncio.run(health_routes.ready())
+    assert started == [True]
+    assert response.status_code == 503
@@ -0,0 +1,78 @@
+from datetime import datetime, timedelta
+from types import SimpleNamespace
+
+import pytest
+from fastapi import HTTPException
+
+from data.background_jobs_repo import acquire_job_locks, create_job
+from services import hod_service
+from services.hod_service import assign_hod_service
+
+
+def _seed(db):
+    db["roles"].insert_many([
+        {"_id": "role-hod", "name": "HOD"},
+        {"_id": "role-faculty", "name": "FACULTY"},
+    ])
+    db["faculty"].insert_many([
+        {"_id": "F1", "name": "one", "college": "KMIT"},
+        {"_id": "F2", "name": "two", "college": "KMIT"},
+    ])
+
+
+def _active_job(job_id, college, scopes):
+    # What assign_hod_service leaves behind: scope locks plus a queued job
+    keys = hod_service._scope_lock_keys(college, [tuple(sc) for sc in scopes])
+    acquire_job_locks(job_id, keys, stale_before=datetime.utcnow() - timedelta(minutes=5))
+    create_job(job_id, "assign_hod", {"hod_id": "F1", "old_hod_ids": [], "college": college, "scopes": scopes})
+
+
+def _assign(faculty_id, years, courses, college="KMIT"):
+    return assign_hod_service(
+        SimpleNamespace(faculty_id=faculty_id, college=college, years=years, courses=courses)
+    )
+
+
+def test_overlapping_assignment_is_rejected_while_a_job_is_active(db, job_runner):
+    _seed(db)
+    # Queued, not yet picked up by a worker
+    _active_job("J1", "KMIT", [[2, "CSE"], [3, "CSE"]])
+
+    with pytest.raises(HTTPException) as exc:
+        _assign("F2", [3], ["CSE", "ECE"])
+    assert exc.value.status_code == 409
+    assert "J1" in exc.value.detail
+    assert db["user_roles"].count_documents({}) == 0
+
+
+def test_disjoint_assignments_run_side_by_side(db, job_runner, wait_for_job):
+    _seed(db)
+    _active_job("J1", "KMIT", [[2, "CSE"]])
+
+    job_ids = [
+        _assign("F2", [2], ["ECE"])["data"]["job_id"],
+        _assign("F2", [2], ["CSE"], college="NGIT")["data"]["job_id"],
+    ]
+    assert all(wait_for_job(j)["status"] == "COMPLETED" for j in job_ids)
+
+
+def test_scope_locks_are_released_when_the_job_finishes(db, job_runner, wait_for_job):
+    _seed(db)
+    job_id = _assign("F1", [2], ["CSE"])["data"]["job_id"]
+    assert wait_for_job(job_id)["status"] == "COMPLETED"
+    assert db["background_job_locks"].count_documents({}) == 0
+
+    assert wait_for_job(_assign("F2", [2], ["CSE"])["data"]["job_id"])["status"] == "COMPLETED"
+
+
+def test_failed_assignment_releases_its_locks(db, job_runner, monkeypatch):
+    _seed(db)
+
+    def broken(*args):
+        raise RuntimeError("transaction aborted")
+
+    monkeypatch.setattr(hod_service, "_reassign_hod_roles", broken)
+    with pytest.raises(RuntimeError):
+        _assign("F1", [2], ["CSE"])
+    assert db["background_job_locks"].count_documents({}) == 0
+    assert db["background_jobs"].count_documents({}) == 0
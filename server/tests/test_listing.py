@@ -0,0 +1,43 @@
+import json
+
+from bson import ObjectId
+
+from core.listing import ListParams
+from services.admin_service import get_all_admins_service
+from services.faculty_service import service_get_faculty_by_college
+
+
+def _page(response):
+    return json.loads(response.body)["data"], response.headers.get("X-Next-Cursor")
+
+
+def test_faculty_pages_follow_the_cursor(db):
+    db["faculty"].insert_many([
+        {"_id": f"F{i}", "name": f"f{i}", "college": "KMIT", "active": True, "password_hash": "x"}
+        for i in range(5)
+    ])
+
+    seen, after = [], None
+    while True:
+        rows, after = _page(service_get_faculty_by_college("KMIT", ListParams(limit=2, after=after)))
+        seen += [r["_id"] for r in rows]
+        assert all("password_hash" not in r for r in rows)
+        if after is None:
+            break
+    assert seen == ["F0", "F1", "F2", "F3", "F4"]
+
+
+def test_admin_pages_cross_string_and_object_ids(db):
+    oids = sorted(ObjectId() for _ in range(2))
+    db["admins"].insert_many(
+        [{"_id": "a1", "name": "a"}, {"_id": "a2", "name": "b"}]
+        + [{"_id": oid, "name": "legacy"} for oid in oids]
+    )
+
+    seen, after = [], None
+    while True:
+        rows, after = _page(get_all_admins_service(ListParams(limit=1, after=after)))
+        seen += [r["id"] for r in rows]
+        if after is None:
+            break
+    assert seen == ["a1", "a2"] + [str(oid) for oid in oids]
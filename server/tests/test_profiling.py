@@ -0,0 +1,49 @@
+import asyncio
+
+import httpx
+from fastapi import FastAPI, Request
+
+import core.profiling as profiling
+from config import Config
+from data.request_profiles_repo import get_profile, list_profiles
+
+
+def _app():
+    app = FastAPI()
+
+    @app.get("/ping")
+    def ping():
+        return {"ok": True}
+
+    app.add_middleware(profiling.ProfilingMiddleware)
+
+    @app.middleware("http")
+    async def fixed_request_id(request: Request, call_next):
+        # Same id on every request, as a client replaying X-Request-ID would
+        request.state.request_id = "same-request-id"
+        return await call_next(request)
+
+    return app
+
+
+async def _profile_twice(app):
+    transport = httpx.ASGITransport(app=app)
+    async with httpx.AsyncClient(transport=transport, base_url="http://test") as client:
+        headers = {profiling.PROFILE_HEADER: "secret"}
+        first = await client.get("/ping", headers=headers)
+        second = await client.get("/ping", headers=headers)
+    return first, second
+
+
+def test_profiles_are_keyed_by_a_server_generated_id(monkeypatch):
+    monkeypatch.setattr(Config, "PROFILING_TOKEN", "secret")
+
+    first, second = asyncio.run(_profile_twice(_app()))
+
+    first_id = first.headers["X-Profile-Id"]
+    second_id = second.headers["X-Profile-Id"]
+    assert first_id != second_id
+    assert first_id != "same-request-id"
+    assert get_profile(first_id)["request_id"] == "same-request-id"
+    assert get_profile(second_id)["request_id"] == "same-request-id"
+    assert len(list_profiles(request_id="same-request-id")) == 2
@@ -0,0 +1,95 @@
+from types import SimpleNamespace
+
+from data.faculty_read_model_repo import get_faculty_read_model, rebuild_faculty_read_model
+from data.scope_map_repo import get_hod_ids_for_scope, get_mentor_ids_for_scope, set_hod_scopes, set_mentor_scope
+from services.faculty_service import delete_faculty_service, update_faculty_service
+from services.hod_service import assign_hod_service
+from services.student_service import update_student_service
+
+
+def _seed(db):
+    db["roles"].insert_many([
+        {"_id": "role-hod", "name": "HOD"},
+        {"_id": "role-faculty", "name": "FACULTY"},
+        {"_id": "role-mentor", "name": "MENTOR"},
+    ])
+    db["faculty"].insert_many([
+        {"_id": "H1", "name": "hod", "college": "KMIT", "years": [2], "courses": ["CSE"]},
+        {"_id": "H2", "name": "other hod", "college": "KMIT", "years": [3], "courses": ["ECE"]},
+        {"_id": "M1", "name": "mentor", "college": "KMIT"},
+    ])
+    db["user_roles"].insert_many([
+        {"user_id": "H1", "role_id": "role-hod"},
+        {"user_id": "H2", "role_id": "role-hod"},
+        {"user_id": "M1", "role_id": "role-mentor"},
+    ])
+    set_hod_scopes("KMIT", [2], ["CSE"], ["H1"])
+    set_hod_scopes("KMIT", [3], ["ECE"], ["H2"])
+    set_mentor_scope("KMIT", 2, "CSE", "A", ["M1"])
+
+
+def test_hod_update_moves_its_scopes(db):
+    _seed(db)
+    rebuild_faculty_read_model(["H1"])
+    assert get_hod_ids_for_scope("KMIT", 2, "CSE") == ["H1"]
+
+    update_faculty_service("H1", {"years": [3], "courses": ["CSE"]})
+
+    assert get_hod_ids_for_scope("KMIT", 2, "CSE") == []
+    assert get_hod_ids_for_scope("KMIT", 3, "CSE") == ["H1"]
+    assert get_faculty_read_model("H1")["hod_scopes"] == [{"college": "KMIT", "year": 3, "course": "CSE"}]
+
+    update_faculty_service("H1", {"college": "NGIT"})
+    assert get_hod_ids_for_scope("KMIT", 3, "CSE") == []
+    assert get_hod_ids_for_scope("NGIT", 3, "CSE") == ["H1"]
+
+
+def test_profile_update_leaves_scopes_alone(db):
+    _seed(db)
+    update_faculty_service("M1", {"years": [4], "courses": ["CSE"]})
+    update_faculty_service("H1", {"phone": "9000000009"})
+
+    assert get_hod_ids_for_scope("KMIT", 4, "CSE") == []
+    assert get_hod_ids_for_scope("KMIT", 2, "CSE") == ["H1"]
+
+
+def test_deleted_faculty_leave_the_map(db):
+    _seed(db)
+    delete_faculty_service("H1")
+    delete_faculty_service("M1")
+
+    assert get_hod_ids_for_scope("KMIT", 2, "CSE") == []
+    assert get_mentor_ids_for_scope("KMIT", 2, "CSE", "A") == []
+    assert get_hod_ids_for_scope("KMIT", 3, "ECE") == ["H2"]
+
+
+def test_demoted_hod_leaves_its_other_scopes(db, job_runner, wait_for_job):
+    _seed(db)
+    # H1 also covers 2/ECE; taking over 2/CSE demotes it to FACULTY
+    set_hod_scopes("KMIT", [2], ["ECE"], ["H1"])
+    db["student_hod"].insert_one(
+        {"student_id": "S1", "hod_id": "H1", "college": "KMIT", "year": 2, "course": "CSE"}
+    )
+
+    result = assign_hod_service(
+        SimpleNamespace(faculty_id="H2", college="KMIT", years=[2], courses=["CSE"])
+    )
+    wait_for_job(result["data"]["job_id"])
+
+    assert get_hod_ids_for_scope("KMIT", 2, "CSE") == ["H2"]
+    assert get_hod_ids_for_scope("KMIT", 2, "ECE") == []
+    assert get_faculty_read_model("H1")["hod_scopes"] == []
+
+
+def test_student_update_remaps_to_the_new_scope_hod(db):
+    _seed(db)
+    rebuild_faculty_read_model(["H1", "H2"])
+    db["students"].insert_one({"_id": "S1", "college": "KMIT", "year": 2, "course": "CSE", "section": "A"})
+    db["student_hod"].insert_one({"student_id": "S1", "hod_id": "H1", "college": "KMIT", "year": 2, "course": "CSE"})
+
+    update_student_service("S1", {"year": 3, "course": "ECE"})
+
+    mapping = db["student_hod"].find_one({"student_id": "S1"})
+    assert (mapping["hod_id"], mapping["year"], mapping["course"]) == ("H2", 3, "ECE")
+    assert "S1" not in get_faculty_read_model("H1")["hod_student_ids"]
+    assert get_faculty_read_model("H2")["hod_student_ids"] == ["S1"]
@@ -0,0 +1,60 @@
+import pytest
+
+from services.sms_providers import Fast2SmsProvider, Msg91Provider
+from utils.fake_sms_server import FakeSmsServer
+
+
+@pytest.fixture
+def gateway():
+    server = FakeSmsServer().start()
+    yield server
+    server.stop()
+
+
+@pytest.fixture
+def keys(monkeypatch):
+    monkeypatch.setenv("FAST2SMS_API_KEY", "test-key")
+    monkeypatch.setenv("MSG91_AUTH_KEY", "test-key")
+
+
+def test_fast2sms_batches_recipients(gateway, keys):
+    provider = Fast2SmsProvider(base_url=gateway.base_url, max_batch=2)
+    try:
+        assert provider.send(["919000000001", "919000000002", "919000000003"], "hello")
+    finally:
+        provider.close()
+
+    assert [r["provider"] for r in gateway.received] == ["fast2sms", "fast2sms"]
+    # Country code stripped, split into batches of max_batch
+    assert [r["numbers"] for r in gateway.received] == [["9000000001", "9000000002"], ["9000000003"]]
+    assert gateway.received[0]["message"] == "hello"
+
+
+def test_msg91_send(gateway, keys):
+    provider = Msg91Provider(base_url=gateway.base_url)
+    try:
+        assert provider.send(["919000000001"], "left campus")
+    finally:
+        provider.close()
+
+    assert gateway.received == [
+        {**gateway.received[0], "provider": "msg91", "numbers": ["9000000001"], "message": "left campus"}
+    ]
+
+
+def test_gateway_failure_reported(gateway, keys):
+    gateway.fail_rate = 1.0
+    provider = Fast2SmsProvider(base_url=gateway.base_url)
+    try:
+        assert provider.send(["919000000001"], "hello") is False
+    finally:
+        provider.close()
+    assert gateway.received == []
+
+
+def test_missing_key_sends_nothing(gateway, monkeypatch):
+    monkeypatch.delenv("FAST2SMS_API_KEY", raising=False)
+    monkeypatch.delenv("SMS_API_KEY", raising=False)
+    provider = Fast2SmsProvider(base_url=gateway.base_url)
+    assert provider.send(["919000000001"], "hello") is False
+    assert gateway.received == []
@@ -0,0 +1,37 @@
+from tempfile import SpooledTemporaryFile
+
+from starlette.datastructures import UploadFile
+
+from services.student_import_service import import_students_service
+
+HEADER = "Student ID,Name,Mobile,Year,Course,Section,College,Password\r\n"
+
+
+def _upload(text):
+    # The object FastAPI hands the route: UploadFile over a SpooledTemporaryFile
+    spool = SpooledTemporaryFile(max_size=1024 * 1024)
+    spool.write(text.encode("utf-8-sig"))
+    spool.seek(0)
+    return UploadFile(file=spool, filename="students.csv")
+
+
+def test_csv_upload_with_bom_reports_bad_and_duplicate_rows(db):
+    db["roles"].insert_one({"_id": "role-student", "name": "STUDENT"})
+    upload = _upload(
+        HEADER
+        + "S1,Asha,9000000001,2,CSE,A,KMIT,pw1\r\n"
+        + "S2,Ravi,9000000002,two,CSE,A,KMIT,pw2\r\n"
+        + "S1,Asha Again,9000000003,2,CSE,A,KMIT,pw3\r\n"
+        + "S3,Meena,9000000004,2,CSE,B,KMIT,pw4\r\n"
+    )
+
+    result = import_students_service(upload.file, upload.filename, "A1")
+
+    data = result["data"]
+    assert (data["total"], data["created"], data["failed"]) == (4, 2, 2)
+    assert [e["row"] for e in data["errors"]] == [3, 4]
+    assert "first seen on row 2" in data["errors"][1]["errors"][0]
+    assert {d["_id"] for d in db["students"].find()} == {"S1", "S3"}
+    assert db["user_roles"].count_documents({"role_id": "role-student"}) == 2
+    # The upload is still usable by the caller
+    assert not upload.file.closed
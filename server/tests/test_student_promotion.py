@@ -0,0 +1,43 @@
+from datetime import datetime, timedelta
+
+import pytest
+from fastapi import HTTPException
+
+from data.background_jobs_repo import acquire_job_locks, create_job
+from services.student_service import promote_students_service
+
+
+def _queue_promotion(job_id, year, new_year, college="KMIT"):
+    # What promote_students_service leaves behind: year locks plus a queued job
+    keys = [f"promote_students:{college}:{y}" for y in (year, new_year)]
+    acquire_job_locks(job_id, keys, stale_before=datetime.utcnow() - timedelta(minutes=5))
+    create_job(job_id, "promote_students", {"college": college, "year": year, "new_year": new_year})
+
+
+@pytest.mark.parametrize("year, new_year", [(2, 3), (3, 4), (4, 5), (1, 4)])
+def test_promotion_sharing_a_year_with_an_active_job_is_rejected(db, job_runner, year, new_year):
+    _queue_promotion("J1", 3, 4)
+
+    with pytest.raises(HTTPException) as exc:
+        promote_students_service(year, "KMIT", new_year)
+    assert exc.value.status_code == 409
+    assert "J1" in exc.value.detail
+
+
+def test_unrelated_promotions_are_accepted(db, job_runner, wait_for_job):
+    _queue_promotion("J1", 3, 4)
+
+    job_ids = [
+        promote_students_service(1, "KMIT", 2)["data"]["job_id"],
+        promote_students_service(2, "NGIT", 3)["data"]["job_id"],
+    ]
+    assert all(wait_for_job(j)["status"] == "COMPLETED" for j in job_ids)
+
+
+def test_finished_promotion_frees_its_years(db, job_runner, wait_for_job):
+    first = promote_students_service(2, "KMIT", 3)["data"]["job_id"]
+    assert wait_for_job(first)["status"] == "COMPLETED"
+    assert db["background_job_locks"].count_documents({}) == 0
+
+    second = promote_students_service(3, "KMIT", 4)["data"]["job_id"]
+    assert wait_for_job(second)["status"] == "COMPLETED"
@@ -0,0 +1,74 @@
+import asyncio
+
+import httpx
+import pytest
+from fastapi import FastAPI, Request
+
+from config import Config
+from core.uploads import read_image_upload
+
+
+def _app():
+    app = FastAPI()
+
+    @app.post("/upload")
+    async def upload(request: Request):
+        data = await read_image_upload(request)
+        return {"size": len(data), "head": bytes(data[:4]).decode()}
+
+    return app
+
+
+def _post(**kwargs):
+    async def run():
+        transport = httpx.ASGITransport(app=_app())
+        async with httpx.AsyncClient(transport=transport, base_url="http://test") as client:
+            return await client.post("/upload", **kwargs)
+    return asyncio.run(run())
+
+
+@pytest.fixture(autouse=True)
+def small_limit(monkeypatch):
+    monkeypatch.setattr(Config, "FACE_UPLOAD_MAX_BYTES", 1024)
+
+
+def test_multipart_upload():
+    res = _post(files={"image": ("face.jpg", b"JPEG" + b"x" * 100, "image/jpeg")})
+    assert res.status_code == 200
+    assert res.json() == {"size": 104, "head": "JPEG"}
+
+
+def test_multipart_without_the_image_field():
+    res = _post(files={"photo": ("face.jpg", b"JPEG", "image/jpeg")})
+    assert res.status_code == 400
+
+
+def test_raw_body_upload():
+    res = _post(content=b"JPEG" + b"x" * 200, headers={"content-type": "image/jpeg"})
+    assert res.status_code == 200
+    assert res.json() == {"size": 204, "head": "JPEG"}
+
+
+def test_empty_raw_body():
+    res = _post(content=b"", headers={"content-type": "application/octet-stream"})
+    assert res.status_code == 400
+
+
+def test_declared_length_over_the_cap():
+    res = _post(content=b"x" * 2048, headers={"content-type": "image/jpeg"})
+    assert res.status_code == 413
+
+
+def test_streamed_body_over_the_cap_without_content_length():
+    async def chunks():
+        for _ in range(4):
+            yield b"x" * 512
+
+    res = _post(content=chunks(), headers={"content-type": "image/jpeg"})
+    assert "content-length" not in res.request.headers
+    assert res.status_code == 413
+
+
+def test_multipart_file_over_the_cap():
+    res = _post(files={"image": ("face.jpg", b"x" * 1100, "image/jpeg")})
+    assert res.status_code == 413
@@ -1,20 +1,203 @@
+import atexit
 import datetime
 import json
+import os
+import queue
+import threading
+from config import Config
+
+# Put on the queue by close() to wake a writer blocked on an empty queue
+_WAKE = object()
+
 
 class AuditLogger:
-    def __init__(self, log_file='audit.log'):
+    """
+    Non-blocking audit trail.
+
+    `log()` only builds a dict and puts it on a bounded in-memory queue.
+    A daemon thread drains the queue in batches and writes them to a
+    size-rotated JSON-lines file and/or `insert_many` into `audit_logs`.
+
+    Overflow policy when the queue is full:
+    - "drop_newest": discard the incoming event (default, never blocks)
+    - "drop_oldest": discard the oldest queued event to make room
+    - "block": wait up to AUDIT_BLOCK_TIMEOUT_SECONDS, then drop
+    """
+
+    def __init__(
+        self,
+        log_file=Config.AUDIT_LOG_FILE,
+        sinks=Config.AUDIT_LOG_SINKS,
+        queue_size=Config.AUDIT_QUEUE_SIZE,
+        batch_size=Config.AUDIT_BATCH_SIZE,
+        flush_interval=Config.AUDIT_FLUSH_INTERVAL_SECONDS,
+        overflow_policy=Config.AUDIT_OVERFLOW_POLICY,
+        max_file_bytes=Config.AUDIT_LOG_MAX_BYTES,
+        backup_count=Config.AUDIT_LOG_BACKUP_COUNT
+    ):
         self.log_file = log_file
+        self.sinks = set(sinks)
+        self.batch_size = batch_size
+        self.flush_interval = flush_interval
+        self.overflow_policy = overflow_policy
+        self.max_file_bytes = max_file_bytes
+        self.backup_count = backup_count
 
+        self._queue = queue.Queue(maxsize=queue_size)
+        self._thread = None
+        self._start_lock = threading.Lock()
+        self._stop = threading.Event()
+        self._stats_lock = threading.Lock()
+        # written_* / failed_* count events per sink
+        self.stats = {
+            "enqueued": 0,
+            "dropped": 0,
+            "written_file": 0,
+            "written_mongo": 0,
+            "failed_file": 0,
+            "failed_mongo": 0
+        }
+
+    # ------------------------------------------------------------------
+    # PRODUCER SIDE (request thread)
+    # ------------------------------------------------------------------
     def log(self, user_id, action, details=None, ip=None):
         entry = {
-            'timestamp': datetime.datetime.utcnow().isoformat(),
+            'timestamp': datetime.datetime.utcnow(),
             'user_id': user_id,
             'action': action,
             'details': details,
             'ip': ip
         }
+        self._ensure_started()
+        if self._enqueue(entry):
+            self._count("enqueued")
+        else:
+            self._count("dropped")
+
+    def _enqueue(self, entry):
+        try:
+            if self.overflow_policy == "block":
+                self._queue.put(entry, timeout=Config.AUDIT_BLOCK_TIMEOUT_SECONDS)
+            else:
+                self._queue.put_nowait(entry)
+            return True
+        except queue.Full:
+            pass
+
+        if self.overflow_policy == "drop_oldest":
+            try:
+                self._queue.get_nowait()
+                self._count("dropped")
+                self._queue.put_nowait(entry)
+                return True
+            except (queue.Empty, queue.Full):
+                pass
+        return False
+
+    def _count(self, key, n=1):
+        with self._stats_lock:
+            self.stats[key] += n
+
+    def get_stats(self):
+        with self._stats_lock:
+            stats = dict(self.stats)
+        stats["queued"] = self._queue.qsize()
+        return stats
+
+    # ------------------------------------------------------------------
+    # CONSUMER SIDE (background writer)
+    # ------------------------------------------------------------------
+    def _ensure_started(self):
+        if self._thread is not None:
+            return
+        with self._start_lock:
+            if self._thread is None:
+                self._stop.clear()
+                self._thread = threading.Thread(
+                    target=self._run, name="audit-log-writer", daemon=True
+                )
+                self._thread.start()
+
+    def _run(self):
+        while not self._stop.is_set():
+            batch = self._drain(block=True)
+            if batch:
+                self._write(batch)
+        # Final drain on shutdown
+        while True:
+            batch = self._drain(block=False)
+            if not batch:
+                break
+            self._write(batch)
+
+    def _drain(self, block):
+        batch = []
+        try:
+            if block:
+                batch.append(self._queue.get(timeout=self.flush_interval))
+            while len(batch) < self.batch_size:
+                batch.append(self._queue.get_nowait())
+        except queue.Empty:
+            pass
+        return [e for e in batch if e is not _WAKE]
+
+    def _write(self, batch):
+        # Sinks fail independently; a broken one must not stall the other
+        for sink, write in (("file", self._write_file), ("mongo", self._write_mongo)):
+            if sink not in self.sinks:
+                continue
+            try:
+                write(batch)
+                self._count(f"written_{sink}", len(batch))
+            except Exception as e:
+                print(f"[AUDIT] {sink} sink failed: {e}")
+                self._count(f"failed_{sink}", len(batch))
+
+    def _write_file(self, batch):
+        lines = "".join(
+            json.dumps({**e, "timestamp": e["timestamp"].isoformat()}, default=str) + "\n"
+            for e in batch
+        )
+        self._rotate_if_needed(len(lines))
         with open(self.log_file, 'a') as f:
-            f.write(json.dumps(entry) + '\n')
+            f.write(lines)
+
+    def _rotate_if_needed(self, incoming):
+        try:
+            size = os.path.getsize(self.log_file)
+        except OSError:
+            return
+        if size + incoming <= self.max_file_bytes:
+            return
+        for i in range(self.backup_count - 1, 0, -1):
+            src = f"{self.log_file}.{i}"
+            if os.path.exists(src):
+                os.replace(src, f"{self.log_file}.{i + 1}")
+        if self.backup_count > 0:
+            os.replace(self.log_file, f"{self.log_file}.1")
+        else:
+            os.remove(self.log_file)
+
+    def _write_mongo(self, batch):
+        from extensions.mongo import db
+        # `event_type` matches the audit_logs index in create_indexes.py
+        docs = [{**e, "event_type": e["action"]} for e in batch]
+        db["audit_logs"].insert_many(docs, ordered=False)
+
+    def close(self, timeout=5.0):
+        """Flush everything queued and stop the writer (called on shutdown)."""
+        thread = self._thread
+        if thread is None:
+            return
+        self._stop.set()
+        try:
+            self._queue.put_nowait(_WAKE)
+        except queue.Full:
+            pass  # a full queue means the writer is not blocked waiting
+        thread.join(timeout)
+        self._thread = None
 
 # Global logger instance for easy import
 logger = AuditLogger()
+atexit.register(logger.close)
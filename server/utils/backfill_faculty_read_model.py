@@ -0,0 +1,17 @@
+from extensions.mongo import db
+from data.faculty_read_model_repo import rebuild_faculty_read_model
+
+BATCH_SIZE = 200
+
+
+def backfill_faculty_read_model():
+    """Build hod/mentor scopes + student id sets on every faculty document."""
+    ids = db["faculty"].distinct("_id")
+    count = 0
+    for i in range(0, len(ids), BATCH_SIZE):
+        count += rebuild_faculty_read_model(ids[i:i + BATCH_SIZE])
+    print(f"Rebuilt read model for {count} faculty.")
+
+
+if __name__ == "__main__":
+    backfill_faculty_read_model()
@@ -1,37 +1,214 @@
-import redis
+import asyncio
 import json
+import threading
+import time
+from collections import OrderedDict
+from fnmatch import fnmatchcase
 from functools import wraps
 from config import Config
 
-# Redis connection pool
-redis_client = redis.Redis(
-    host=Config.REDIS_HOST or 'localhost',
-    port=Config.REDIS_PORT or 6379,
-    db=0,
-    decode_responses=True,
-    max_connections=50
-)
+
+# ===============================================================
+# BACKEND INTERFACE
+# ===============================================================
+class CacheBackend:
+    """Minimal key/value contract used by `cache_result` and invalidation helpers.
+    Values are already-serialized JSON strings."""
+
+    def get(self, key):
+        raise NotImplementedError
+
+    def set(self, key, value, ttl):
+        raise NotImplementedError
+
+    def delete(self, key):
+        raise NotImplementedError
+
+    def delete_matching(self, pattern):
+        """Delete every key matching a glob pattern. Returns count removed."""
+        raise NotImplementedError
+
+    def ping(self):
+        return True
+
+
+# ===============================================================
+# IN-PROCESS BACKEND (TTL + LRU, bounded in bytes)
+# ===============================================================
+class InMemoryCache(CacheBackend):
+    def __init__(self, max_bytes=Config.CACHE_MAX_BYTES):
+        self.max_bytes = max_bytes
+        self._entries = OrderedDict()  # key -> (expires_at, value, size)
+        self._size = 0
+        self._lock = threading.Lock()
+
+    @staticmethod
+    def _entry_size(key, value):
+        # CACHE_MAX_BYTES is a byte budget: measure the UTF-8 encoding
+        if isinstance(value, str):
+            value = value.encode()
+        return len(key.encode()) + len(value)
+
+    def _drop(self, key):
+        _, _, size = self._entries.pop(key)
+        self._size -= size
+
+    def get(self, key):
+        with self._lock:
+            entry = self._entries.get(key)
+            if entry is None:
+                return None
+            if entry[0] <= time.monotonic():
+                self._drop(key)
+                return None
+            self._entries.move_to_end(key)
+            return entry[1]
+
+    def set(self, key, value, ttl):
+        size = self._entry_size(key, value)
+        if size > self.max_bytes:
+            return
+        with self._lock:
+            if key in self._entries:
+                self._drop(key)
+            self._entries[key] = (time.monotonic() + ttl, value, size)
+            self._size += size
+            # Evict least recently used until we are back under budget
+            while self._size > self.max_bytes:
+                self._drop(next(iter(self._entries)))
+
+    def delete(self, key):
+        with self._lock:
+            if key in self._entries:
+                self._drop(key)
+
+    def delete_matching(self, pattern):
+        with self._lock:
+            keys = [k for k in self._entries if fnmatchcase(k, pattern)]
+            for k in keys:
+                self._drop(k)
+        return len(keys)
+
+    def stats(self):
+        with self._lock:
+            return {"entries": len(self._entries), "bytes": self._size, "max_bytes": self.max_bytes}
+
+
+# ===============================================================
+# REDIS BACKEND (opt-in: CACHE_BACKEND=redis)
+# ===============================================================
+class RedisCache(CacheBackend):
+    def __init__(self, client=None):
+        if client is None:
+            from extensions.redis_client import get_redis_client
+            client = get_redis_client()
+        self.client = client
+
+    def get(self, key):
+        return self.client.get(key)
+
+    def set(self, key, value, ttl):
+        self.client.setex(key, ttl, value)
+
+    def delete(self, key):
+        self.client.delete(key)
+
+    def delete_matching(self, pattern):
+        count = 0
+        for key in self.client.scan_iter(match=pattern):
+            count += self.client.delete(key)
+        return count
+
+    def ping(self):
+        return bool(self.client.ping())
+
+
+_backend = None
+_backend_lock = threading.Lock()
+
+
+def get_cache():
+    """Return the process-wide cache backend selected by `Config.CACHE_BACKEND`."""
+    global _backend
+    if _backend is None:
+        with _backend_lock:
+            if _backend is None:
+                if Config.CACHE_BACKEND == "redis":
+                    _backend = RedisCache()
+                else:
+                    _backend = InMemoryCache()
+    return _backend
+
+
+def set_cache_backend(backend):
+    """Swap the active backend (benchmarks / local experiments)."""
+    global _backend
+    _backend = backend
+
+
+# ===============================================================
+# DECORATOR + INVALIDATION
+# ===============================================================
+_MISS = object()
+
+
+def _cache_get(key):
+    # A broken cache must never break the request path
+    try:
+        cached = get_cache().get(key)
+    except Exception:
+        return _MISS
+    return json.loads(cached) if cached is not None else _MISS
+
+
+def _cache_set(key, result, ttl):
+    if result is None:
+        return
+    try:
+        get_cache().set(key, json.dumps(result, default=str), ttl)
+    except Exception:
+        pass
+
 
 def cache_result(ttl=300):
-    """Cache decorator for expensive database queries"""
+    """Cache decorator for expensive database queries (sync or async).
+    Results must be JSON-serialisable; None is never cached."""
     def decorator(func):
+        def cache_key(args, kwargs):
+            # Generate cache key from function name and arguments
+            return f"{func.__name__}:{str(args)}:{str(kwargs)}"
+
+        if asyncio.iscoroutinefunction(func):
+            @wraps(func)
+            async def async_wrapper(*args, **kwargs):
+                key = cache_key(args, kwargs)
+                cached = _cache_get(key)
+                if cached is not _MISS:
+                    return cached
+                result = await func(*args, **kwargs)
+                _cache_set(key, result, ttl)
+                return result
+            return async_wrapper
+
         @wraps(func)
         def wrapper(*args, **kwargs):
-            # Generate cache key from function name and arguments
-            cache_key = f"{func.__name__}:{str(args)}:{str(kwargs)}"
-            # Try to get from cache
-            cached = redis_client.get(cache_key)
-            if cached:
-                return json.loads(cached)
-            # Execute function and cache result
+            key = cache_key(args, kwargs)
+            cached = _cache_get(key)
+            if cached is not _MISS:
+                return cached
             result = func(*args, **kwargs)
-            redis_client.setex(cache_key, ttl, json.dumps(result))
+            _cache_set(key, result, ttl)
             return result
         return wrapper
     return decorator
 
+def invalidate_pattern(pattern):
+    try:
+        return get_cache().delete_matching(pattern)
+    except Exception:
+        return 0
+
+
 def invalidate_user_cache(user_id):
     """Clear all cached data for a user"""
-    pattern = f"*{user_id}*"
-    for key in redis_client.scan_iter(match=pattern):
-        redis_client.delete(key)
+    return invalidate_pattern(f"*{user_id}*")
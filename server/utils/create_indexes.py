@@ -15,6 +15,9 @@ def create_all_indexes():
     db.faculty.create_index("_id")
     db.faculty.create_index("phone", unique=True)
     db.faculty.create_index("department")
+    # Faculty read model (data/faculty_read_model_repo.py): $pull on student delete
+    db.faculty.create_index("hod_student_ids")
+    db.faculty.create_index("mentor_student_ids")
 
     # Face collections - critical for performance
     db.faces.create_index("user_id", unique=True)
@@ -23,6 +26,7 @@ def create_all_indexes():
 
     # Face vectors - already has vector search index, but add this
     db.face_vectors.create_index("user_id", unique=True)
+    db.face_vectors.create_index("created_at")
 
     # Refresh tokens - for quick validation
     db.refresh_tokens.create_index("jti", unique=True)
@@ -39,10 +43,19 @@ def create_all_indexes():
     db.audit_logs.create_index("event_type")
     db.audit_logs.create_index("timestamp", expireAfterSeconds=7776000)  # 90 days retention
 
+    # Request profiles (core/profiling.py) - 7 days retention
+    db.request_profiles.create_index("created_at", expireAfterSeconds=604800)
+    db.request_profiles.create_index([("path", 1), ("created_at", -1)])
+    db.request_profiles.create_index("request_id")
+
     # Requests (gate pass, etc.)
     db.requests.create_index([("student_id", 1), ("created_at", -1)])
     db.requests.create_index([("status", 1), ("created_at", -1)])
     db.requests.create_index("created_at")
+    db.requests.create_index(
+        [("sms_notification.status", 1), ("sms_notification.next_attempt_at", 1)],
+        sparse=True
+    )
 
     # Mentor mappings
     db.student_mentor.create_index("student_id", unique=True)
@@ -51,6 +64,14 @@ def create_all_indexes():
     # HOD mappings
     db.student_hod.create_index("student_id", unique=True)
     db.student_hod.create_index("hod_id")
+    db.student_hod.create_index([("college", 1), ("year", 1), ("course", 1)])
+
+    # Background jobs (services/background_jobs.py)
+    db.background_jobs.create_index([("status", 1), ("lease_until", 1)])
+    db.background_jobs.create_index([("type", 1), ("created_at", -1)])
+    db.background_jobs.create_index("created_at")
+    # Job locks are keyed by _id (unique); released per job
+    db.background_job_locks.create_index("job_id")
 
     print("✅ All indexes created successfully")
 
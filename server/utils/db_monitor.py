@@ -0,0 +1,78 @@
+"""
+Per-request MongoDB command accounting via PyMongo command monitoring.
+
+`command_tracker` is registered on both Mongo clients (extensions/mongo.py).
+When a request has called `start_request_stats()` (ProfilingMiddleware does
+it for every request), each command run on that request's behalf - on the
+event loop or in a threadpool worker, since contextvars follow both - is
+counted with its duration and "<collection>.<command>" key. Commands from
+background threads (audit writer, SMS outbox) have no stats and are ignored.
+"""
+import threading
+from collections import Counter
+from contextvars import ContextVar
+
+from pymongo import monitoring
+
+
+class RequestDbStats:
+    __slots__ = ("count", "total_ms", "commands", "_lock")
+
+    def __init__(self):
+        self.count = 0
+        self.total_ms = 0.0
+        self.commands = Counter()
+        self._lock = threading.Lock()
+
+    def to_dict(self):
+        with self._lock:
+            return {
+                "count": self.count,
+                "total_ms": round(self.total_ms, 3),
+                "commands": dict(self.commands.most_common())
+            }
+
+
+_current = ContextVar("request_db_stats", default=None)
+
+
+def start_request_stats():
+    """Begin counting for the current context. Returns (stats, reset_token)."""
+    stats = RequestDbStats()
+    return stats, _current.set(stats)
+
+
+def stop_request_stats(token):
+    _current.reset(token)
+
+
+def current_request_stats():
+    return _current.get()
+
+
+class CommandTracker(monitoring.CommandListener):
+    def started(self, event):
+        stats = _current.get()
+        if stats is None:
+            return
+        target = event.command.get(event.command_name)
+        key = f"{target}.{event.command_name}" if isinstance(target, str) else event.command_name
+        with stats._lock:
+            stats.count += 1
+            stats.commands[key] += 1
+
+    def _finished(self, event):
+        stats = _current.get()
+        if stats is None:
+            return
+        with stats._lock:
+            stats.total_ms += event.duration_micros / 1000.0
+
+    def succeeded(self, event):
+        self._finished(event)
+
+    def failed(self, event):
+        self._finished(event)
+
+
+command_tracker = CommandTracker()
@@ -2,6 +2,7 @@ from cryptography.fernet import Fernet
 from config import Config
 import base64
 import json
+from utils.metrics import timed_stage
 
 cipher = Fernet(Config.FACE_ENCRYPTION_KEY.encode())
 
@@ -10,6 +11,7 @@ def encrypt_embedding(embedding_list):
     encrypted = cipher.encrypt(data)
     return base64.b64encode(encrypted).decode()
 
+@timed_stage("embedding_decrypt")
 def decrypt_embedding(encrypted_str):
     encrypted = base64.b64decode(encrypted_str.encode())
     decrypted = cipher.decrypt(encrypted)
@@ -18,5 +20,6 @@ def decrypt_embedding(encrypted_str):
 def encrypt_image_bytes(image_bytes):
     return cipher.encrypt(image_bytes)
 
+@timed_stage("image_decrypt")
 def decrypt_image_bytes(encrypted_bytes):
     return cipher.decrypt(encrypted_bytes)
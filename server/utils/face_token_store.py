@@ -0,0 +1,189 @@
+"""
+Short-lived store for pre-validated faces.
+
+`/face/validate` runs decode + inference + duplicate search once and parks
+the result here under a random single-use token. Registration can then
+consume the token instead of repeating the work.
+
+Backends:
+- "memory" (default): per-process, bounded by entry count and bytes,
+  expiry-ordered heap so eviction is O(log n).
+- "redis": shared by every uvicorn worker; Redis handles expiry.
+"""
+import base64
+import heapq
+import json
+import secrets
+import threading
+import time
+from datetime import datetime
+
+import numpy as np
+
+from config import Config
+
+
+def new_face_token():
+    return "ft_" + secrets.token_urlsafe(24)
+
+
+def _entry_size(entry):
+    size = len(entry.get("image_jpeg") or b"") + len(entry.get("aligned_jpeg") or b"")
+    for key in ("embedding", "landmarks"):
+        arr = entry.get(key)
+        if arr is not None:
+            size += arr.nbytes
+    return size
+
+
+# ===============================================================
+# IN-PROCESS BACKEND
+# ===============================================================
+class InMemoryFaceTokenStore:
+    def __init__(
+        self,
+        ttl_seconds=Config.FACE_TOKEN_TTL_SECONDS,
+        max_entries=Config.FACE_TOKEN_MAX_ENTRIES,
+        max_bytes=Config.FACE_TOKEN_MAX_BYTES
+    ):
+        self.ttl_seconds = ttl_seconds
+        self.max_entries = max_entries
+        self.max_bytes = max_bytes
+        self._entries = {}   # token -> (expires_at, entry, size)
+        self._heap = []      # (expires_at, token); may hold stale tokens
+        self._bytes = 0
+        self._lock = threading.Lock()
+
+    def _remove(self, token):
+        _, entry, size = self._entries.pop(token)
+        self._bytes -= size
+        return entry
+
+    def _evict(self, now):
+        # Expired first, then oldest while over the memory/count caps
+        while self._heap:
+            expires_at, token = self._heap[0]
+            current = self._entries.get(token)
+            if current is None or current[0] != expires_at:
+                heapq.heappop(self._heap)
+                continue
+            over_cap = len(self._entries) > self.max_entries or self._bytes > self.max_bytes
+            if expires_at > now and not over_cap:
+                break
+            heapq.heappop(self._heap)
+            self._remove(token)
+
+    def put(self, entry):
+        token = new_face_token()
+        size = _entry_size(entry)
+        now = time.monotonic()
+        expires_at = now + self.ttl_seconds
+        with self._lock:
+            self._entries[token] = (expires_at, entry, size)
+            self._bytes += size
+            heapq.heappush(self._heap, (expires_at, token))
+            self._evict(now)
+        return token
+
+    def get(self, token):
+        with self._lock:
+            current = self._entries.get(token)
+            if current is None:
+                return None
+            if current[0] <= time.monotonic():
+                self._remove(token)
+                return None
+            return current[1]
+
+    def pop(self, token):
+        with self._lock:
+            current = self._entries.get(token)
+            if current is None:
+                return None
+            entry = self._remove(token)
+            # Stale heap slot is skipped lazily in _evict
+            return entry if current[0] > time.monotonic() else None
+
+    def stats(self):
+        with self._lock:
+            return {"entries": len(self._entries), "bytes": self._bytes}
+
+
+# ===============================================================
+# REDIS BACKEND (shared across workers)
+# ===============================================================
+def _encode_array(arr):
+    return {
+        "data": base64.b64encode(arr.astype(np.float32).tobytes()).decode(),
+        "shape": list(arr.shape)
+    }
+
+
+def _decode_array(obj):
+    return np.frombuffer(base64.b64decode(obj["data"]), np.float32).reshape(obj["shape"])
+
+
+class RedisFaceTokenStore:
+    KEY_PREFIX = "face_token:"
+
+    def __init__(self, client=None, ttl_seconds=Config.FACE_TOKEN_TTL_SECONDS):
+        if client is None:
+            from extensions.redis_client import get_redis_client
+            client = get_redis_client()
+        self.client = client
+        self.ttl_seconds = ttl_seconds
+
+    @staticmethod
+    def _serialize(entry):
+        return json.dumps({
+            "embedding": _encode_array(entry["embedding"]),
+            "landmarks": _encode_array(entry["landmarks"]),
+            "image_jpeg": base64.b64encode(entry["image_jpeg"]).decode(),
+            "aligned_jpeg": base64.b64encode(entry["aligned_jpeg"]).decode() if entry.get("aligned_jpeg") else None,
+            "issued_at": entry["issued_at"].isoformat(),
+            "user_id": entry.get("user_id"),
+            "issued_by": entry.get("issued_by")
+        })
+
+    @staticmethod
+    def _deserialize(raw):
+        if raw is None:
+            return None
+        data = json.loads(raw)
+        return {
+            "embedding": _decode_array(data["embedding"]),
+            "landmarks": _decode_array(data["landmarks"]),
+            "image_jpeg": base64.b64decode(data["image_jpeg"]),
+            "aligned_jpeg": base64.b64decode(data["aligned_jpeg"]) if data.get("aligned_jpeg") else None,
+            "issued_at": datetime.fromisoformat(data["issued_at"]),
+            "user_id": data.get("user_id"),
+            "issued_by": data.get("issued_by")
+        }
+
+    def put(self, entry):
+        token = new_face_token()
+        self.client.setex(self.KEY_PREFIX + token, self.ttl_seconds, self._serialize(entry))
+        return token
+
+    def get(self, token):
+        return self._deserialize(self.client.get(self.KEY_PREFIX + token))
+
+    def pop(self, token):
+        # GETDEL is atomic, so a token can only be consumed by one worker
+        return self._deserialize(self.client.getdel(self.KEY_PREFIX + token))
+
+
+_store = None
+_store_lock = threading.Lock()
+
+
+def get_face_token_store():
+    global _store
+    if _store is None:
+        with _store_lock:
+            if _store is None:
+                if Config.FACE_TOKEN_BACKEND == "redis":
+                    _store = RedisFaceTokenStore()
+                else:
+                    _store = InMemoryFaceTokenStore()
+    return _store
@@ -0,0 +1,120 @@
+"""
+Local stand-in for the Fast2SMS and MSG91 HTTP APIs.
+
+Point the provider clients at it and exercise the SMS path without a real
+gateway or credits:
+
+    python -m utils.fake_sms_server --port 8765
+    SMS_ENABLED=true FAST2SMS_API_KEY=test \
+    SMS_FAST2SMS_BASE_URL=http://127.0.0.1:8765 \
+    SMS_MSG91_BASE_URL=http://127.0.0.1:8765 uvicorn app:app
+
+Every accepted message is kept in `FakeSmsServer.received`. `fail_rate` and
+`latency` simulate a flaky or slow gateway (e.g. to watch outbox retries and
+provider failover).
+"""
+import argparse
+import json
+import random
+import threading
+import time
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from urllib.parse import parse_qs, urlparse
+
+
+class _Handler(BaseHTTPRequestHandler):
+    protocol_version = "HTTP/1.1"  # keep-alive, like the real gateways
+
+    def log_message(self, fmt, *args):
+        if self.server.verbose:
+            super().log_message(fmt, *args)
+
+    def _reply(self, status, body):
+        data = json.dumps(body).encode()
+        self.send_response(status)
+        self.send_header("Content-Type", "application/json")
+        self.send_header("Content-Length", str(len(data)))
+        self.end_headers()
+        self.wfile.write(data)
+
+    def _simulate(self):
+        if self.server.latency:
+            time.sleep(self.server.latency)
+        return random.random() >= self.server.fail_rate
+
+    def _record(self, provider, numbers, message):
+        with self.server.lock:
+            self.server.received.append({
+                "provider": provider,
+                "numbers": [n for n in numbers.split(",") if n],
+                "message": message,
+                "at": time.time()
+            })
+
+    def do_POST(self):
+        if urlparse(self.path).path != "/dev/bulkV2":
+            return self._reply(404, {"return": False, "message": "not found"})
+        length = int(self.headers.get("Content-Length") or 0)
+        payload = json.loads(self.rfile.read(length) or b"{}")
+        if not self.headers.get("Authorization"):
+            return self._reply(401, {"return": False, "message": "missing authorization"})
+        if not self._simulate():
+            return self._reply(500, {"return": False, "message": "simulated failure"})
+        self._record("fast2sms", payload.get("numbers", ""), payload.get("message", ""))
+        return self._reply(200, {"return": True, "request_id": str(len(self.server.received)), "message": ["SMS sent successfully."]})
+
+    def do_GET(self):
+        url = urlparse(self.path)
+        if url.path != "/api/sendhttp.php":
+            return self._reply(404, {"type": "error", "message": "not found"})
+        params = {k: v[0] for k, v in parse_qs(url.query).items()}
+        if not params.get("authkey"):
+            return self._reply(401, {"type": "error", "message": "missing authkey"})
+        if not self._simulate():
+            return self._reply(500, {"type": "error", "message": "simulated failure"})
+        self._record("msg91", params.get("mobiles", ""), params.get("message", ""))
+        return self._reply(200, {"type": "success"})
+
+
+class FakeSmsServer(ThreadingHTTPServer):
+    daemon_threads = True
+
+    def __init__(self, host="127.0.0.1", port=0, fail_rate=0.0, latency=0.0, verbose=False):
+        super().__init__((host, port), _Handler)
+        self.fail_rate = fail_rate
+        self.latency = latency
+        self.verbose = verbose
+        self.received = []
+        self.lock = threading.Lock()
+        self._thread = None
+
+    @property
+    def base_url(self):
+        host, port = self.server_address[:2]
+        return f"http://{host}:{port}"
+
+    def start(self):
+        """Serve from a daemon thread (for scripts / benchmarks)."""
+        self._thread = threading.Thread(target=self.serve_forever, daemon=True)
+        self._thread.start()
+        return self
+
+    def stop(self):
+        self.shutdown()
+        self.server_close()
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="Fake Fast2SMS / MSG91 gateway")
+    parser.add_argument("--host", default="127.0.0.1")
+    parser.add_argument("--port", type=int, default=8765)
+    parser.add_argument("--fail-rate", type=float, default=0.0)
+    parser.add_argument("--latency", type=float, default=0.0)
+    args = parser.parse_args()
+
+    server = FakeSmsServer(args.host, args.port, args.fail_rate, args.latency, verbose=True)
+    print(f"Fake SMS gateway listening on {server.base_url}")
+    try:
+        server.serve_forever()
+    except KeyboardInterrupt:
+        pass
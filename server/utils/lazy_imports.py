@@ -0,0 +1,30 @@
+import importlib
+
+
+class LazyModule:
+    """
+    Stand-in for a heavy module that is only imported on first attribute
+    access. Lets modules on the API import path (routes -> services) reference
+    cv2 & co. without paying their import cost at worker boot.
+    """
+
+    def __init__(self, name):
+        self._name = name
+        self._module = None
+
+    def _load(self):
+        if self._module is None:
+            # importlib holds the import lock, so concurrent first use is safe
+            self._module = importlib.import_module(self._name)
+        return self._module
+
+    def __getattr__(self, attr):
+        return getattr(self._load(), attr)
+
+    def __repr__(self):
+        state = "loaded" if self._module is not None else "not loaded"
+        return f"<lazy module '{self._name}' ({state})>"
+
+
+def lazy_module(name):
+    return LazyModule(name)
@@ -0,0 +1,88 @@
+"""
+Face pipeline metrics, exported on the existing /metrics endpoint (the
+Instrumentator exposes prometheus_client's default registry).
+
+Overhead per observation is a perf_counter pair plus a locked bucket
+increment, so these stay on in production.
+"""
+import time
+from contextlib import contextmanager
+from functools import wraps
+
+from prometheus_client import Counter, Histogram
+
+_LATENCY_BUCKETS = (
+    0.001, 0.0025, 0.005, 0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1.0, 2.5, 5.0, 10.0
+)
+
+FACE_STAGE_SECONDS = Histogram(
+    "face_stage_seconds",
+    "Time spent in each stage of the face pipeline",
+    ["stage"],
+    buckets=_LATENCY_BUCKETS
+)
+
+FACE_REJECTIONS = Counter(
+    "face_rejections_total",
+    "Face requests turned away before inference (503/504)",
+    ["reason"]
+)
+
+# 0.05-wide buckets, finer around VERIFY_THRESHOLD / DUPLICATE_HIGH
+FACE_VERIFY_SCORE = Histogram(
+    "face_verify_score",
+    "Cosine similarity between the probe and the enrolled embedding",
+    buckets=(0.1, 0.2, 0.3, 0.4, 0.45, 0.5, 0.525, 0.55, 0.575, 0.6, 0.625, 0.65, 0.7, 0.8, 0.9, 1.0)
+)
+
+FACE_VERIFY_RESULTS = Counter(
+    "face_verify_results_total",
+    "Verification outcomes",
+    ["result"]
+)
+
+_stage_children = {}
+
+
+def _stage(stage):
+    # Resolve the labelled child once; labels() takes a lock on every call
+    child = _stage_children.get(stage)
+    if child is None:
+        child = _stage_children[stage] = FACE_STAGE_SECONDS.labels(stage)
+    return child
+
+
+def observe_stage(stage, seconds):
+    _stage(stage).observe(seconds)
+
+
+@contextmanager
+def timed(stage):
+    start = time.perf_counter()
+    try:
+        yield
+    finally:
+        _stage(stage).observe(time.perf_counter() - start)
+
+
+def timed_stage(stage):
+    """Decorator form of `timed`."""
+    def decorator(func):
+        @wraps(func)
+        def wrapper(*args, **kwargs):
+            start = time.perf_counter()
+            try:
+                return func(*args, **kwargs)
+            finally:
+                _stage(stage).observe(time.perf_counter() - start)
+        return wrapper
+    return decorator
+
+
+def record_rejection(reason):
+    FACE_REJECTIONS.labels(reason).inc()
+
+
+def record_verify(score, result):
+    FACE_VERIFY_SCORE.observe(score)
+    FACE_VERIFY_RESULTS.labels(result).inc()
@@ -0,0 +1,92 @@
+"""
+Re-encode faces enrolled before enrollment normalisation.
+
+Each stored JPEG is decrypted, the face re-detected and the image replaced by
+the normalised crop (services/face_service.normalize_face_image), plus the
+aligned crop when FACE_STORE_ALIGNED is on. Embeddings / vectors are left
+untouched. Processed documents get `normalized: True`; faces that cannot be
+re-detected get `normalized: False` and a `normalize_error`, and keep their
+original image. Safe to re-run: only documents without `normalized` are read.
+
+    python -m utils.normalize_stored_faces [--dry-run]
+"""
+import sys
+
+import numpy as np
+from fastapi import HTTPException
+
+from extensions.mongo import db
+from services.face_model import model_manager
+from services.face_service import ensure_single_face, normalize_face_image
+from utils.encryption import decrypt_image_bytes, encrypt_image_bytes
+from utils.lazy_imports import lazy_module
+
+cv2 = lazy_module("cv2")
+
+BATCH_SIZE = 100
+
+
+def _normalize_doc(doc):
+    image_bytes = decrypt_image_bytes(doc["image_data_encrypted"])
+    img = cv2.imdecode(np.frombuffer(image_bytes, np.uint8), cv2.IMREAD_COLOR)
+    if img is None:
+        raise ValueError("stored image could not be decoded")
+    face = ensure_single_face(img)
+    jpeg, aligned = normalize_face_image(img, face)
+    return len(image_bytes), jpeg, aligned
+
+
+def normalize_stored_faces(dry_run=False):
+    # Block until the model is loaded instead of failing the first batch with 503
+    model_manager.get_model(timeout=600)
+
+    faces = db["faces"]
+    query = {"normalized": {"$exists": False}, "is_encrypted": True}
+    done = failed = before = after = 0
+    last_id = None
+    while True:
+        batch_query = dict(query)
+        if last_id is not None:
+            batch_query["_id"] = {"$gt": last_id}
+        batch = list(faces.find(batch_query).sort("_id", 1).limit(BATCH_SIZE))
+        if not batch:
+            break
+        last_id = batch[-1]["_id"]
+
+        for doc in batch:
+            try:
+                old_size, jpeg, aligned = _normalize_doc(doc)
+            except (HTTPException, ValueError) as e:
+                reason = e.detail if isinstance(e, HTTPException) else str(e)
+                print(f"[FACES] {doc.get('user_id')}: {reason}")
+                failed += 1
+                if not dry_run:
+                    faces.update_one(
+                        {"_id": doc["_id"]},
+                        {"$set": {"normalized": False, "normalize_error": reason}}
+                    )
+                continue
+
+            before += old_size
+            after += len(jpeg)
+            done += 1
+            if dry_run:
+                continue
+            updates = {
+                "image_data_encrypted": encrypt_image_bytes(jpeg),
+                "image_size": len(jpeg),
+                "normalized": True
+            }
+            if aligned:
+                updates["aligned_data_encrypted"] = encrypt_image_bytes(aligned)
+            faces.update_one({"_id": doc["_id"]}, {"$set": updates})
+
+        print(f"[FACES] normalized {done}, failed {failed}")
+
+    mb = 1024 * 1024
+    print(f"Normalized {done} faces ({failed} failed): {before / mb:.1f} MB -> {after / mb:.1f} MB"
+          + (" (dry run, nothing written)" if dry_run else ""))
+
+
+if __name__ == "__main__":
+    normalize_stored_faces(dry_run="--dry-run" in sys.argv)